@@ -0,0 +1,120 @@
+"""
+batch.py
+- Çok sayıda sektör / il / (il, sektör) sorgusunu tek çağrıda yanıtlar
+- İsimler bir kez çözülür, skorlar matristen tek seferde (fancy indexing) toplanır
+- Hatalı öğeler satır içinde raporlanır; tek bir kötü isim tüm isteği düşürmez
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .schemas import (
+    BatchCityResult,
+    BatchPairResult,
+    BatchRequest,
+    BatchResponse,
+    BatchSectorResult,
+    Contribution,
+)
+from .scoring import contribution_list, contribution_matrix
+from .snapshot import DataSnapshot
+
+# ---------------------------------------------------------------------------
+
+def _resolve_all(queries: Sequence[str], find: Callable[[str], Optional[int]]) -> List[Optional[int]]:
+    """
+    Her benzersiz sorguyu bir kez çözer (rapor üreticileri aynı isimleri tekrar tekrar gönderir).
+    """
+    memo: Dict[str, Optional[int]] = {}
+    out: List[Optional[int]] = []
+    for q in queries:
+        if q not in memo:
+            memo[q] = find(q)
+        out.append(memo[q])
+    return out
+
+
+def _round_row(names: Sequence[str], values: np.ndarray) -> Dict[str, float]:
+    return dict(zip(names, np.round(values, 1).tolist()))
+
+
+def run_batch(snapshot: DataSnapshot, req: BatchRequest) -> BatchResponse:
+    engine = snapshot.engine
+    scores = engine.scores
+
+    # ---- sektör → tüm iller
+    sector_hits = _resolve_all(req.sectors, engine.find_sector)
+    ok = [j for j in sector_hits if j is not None]
+    block = scores[:, ok].T if ok else np.empty((0, engine.n_cities))
+    sector_results: List[BatchSectorResult] = []
+    k = 0
+    for q, j in zip(req.sectors, sector_hits):
+        if j is None:
+            sector_results.append(BatchSectorResult(query=q, error=f"'{q}' sektörü bulunamadı"))
+            continue
+        sector_results.append(BatchSectorResult(
+            query=q,
+            sector=engine.sector_names[j],
+            scoresByCity=_round_row(engine.city_names, block[k]),
+        ))
+        k += 1
+
+    # ---- il → tüm sektörler
+    city_hits = _resolve_all(req.cities, engine.find_city)
+    ok = [i for i in city_hits if i is not None]
+    block = scores[ok, :] if ok else np.empty((0, engine.n_sectors))
+    city_results: List[BatchCityResult] = []
+    k = 0
+    for q, i in zip(req.cities, city_hits):
+        if i is None:
+            city_results.append(BatchCityResult(query=q, error=f"'{q}' şehri bulunamadı"))
+            continue
+        city_results.append(BatchCityResult(
+            query=q,
+            city=engine.city_names[i],
+            scoresBySector=_round_row(engine.sector_names, block[k]),
+        ))
+        k += 1
+
+    # ---- (il, sektör) çiftleri
+    pair_city = _resolve_all([p.city for p in req.pairs], engine.find_city)
+    pair_sector = _resolve_all([p.sector for p in req.pairs], engine.find_sector)
+    valid = [n for n, (i, j) in enumerate(zip(pair_city, pair_sector)) if i is not None and j is not None]
+    ci = np.fromiter((pair_city[n] for n in valid), dtype=np.intp, count=len(valid))
+    si = np.fromiter((pair_sector[n] for n in valid), dtype=np.intp, count=len(valid))
+    pair_scores = np.round(scores[ci, si], 1).tolist()
+    contribs = contribution_matrix(snapshot.tables, ci, si) if req.includeContributions else None
+
+    pair_results: List[BatchPairResult] = []
+    k = 0
+    for p, i, j in zip(req.pairs, pair_city, pair_sector):
+        if i is None or j is None:
+            missing = f"'{p.city}' şehri" if i is None else f"'{p.sector}' sektörü"
+            pair_results.append(BatchPairResult(query=p, error=f"{missing} bulunamadı"))
+            continue
+        contributions = None
+        if contribs is not None:
+            contributions = [
+                Contribution(**c) for c in contribution_list(snapshot.tables, i, j, contribs[k])
+            ]
+        pair_results.append(BatchPairResult(
+            query=p,
+            city=engine.city_names[i],
+            sector=engine.sector_names[j],
+            score=pair_scores[k],
+            contributions=contributions,
+        ))
+        k += 1
+
+    return BatchResponse(
+        version=snapshot.version,
+        sectors=sector_results,
+        cities=city_results,
+        pairs=pair_results,
+    )
+
+
+__all__ = ["run_batch"]
@@ -0,0 +1,159 @@
+"""
+cache.py
+- Thread-safe, sınırlı boyutlu LRU cache
+- Her cache isimle kayıt olur; isabet/ıska sayaçları dışarıdan okunabilir
+- LRUCache dışındaki önbellekler (functools.lru_cache, snapshot.derived, memo sözlükleri)
+  CacheCounter / register_lru_function ile aynı kayda katılır (/metrics hepsini okur)
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+_REGISTRY: List[Any] = []
+_REGISTRY_LOCK = threading.Lock()
+
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class CacheStats:
+    """size / maxsize: bilinmiyorsa ya da sınırsızsa None."""
+    name: str
+    hits: int
+    misses: int
+    size: Optional[int] = None
+    maxsize: Optional[int] = None
+
+
+def _register(cache: Any) -> None:
+    with _REGISTRY_LOCK:
+        _REGISTRY.append(cache)
+
+
+class LRUCache(Generic[V]):
+    """
+    En son kullanılan `maxsize` kaydı tutar. Değer hesaplaması kilit dışında yapılır;
+    aynı anahtar için iki istek aynı anda ıskalarsa ikisi de hesaplar, biri yazılır.
+    """
+
+    def __init__(self, name: str, maxsize: int = 256) -> None:
+        self.name = name
+        self.maxsize = max(0, int(maxsize))
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._lock = threading.Lock()
+        _register(self)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], V]) -> Tuple[V, bool]:
+        """
+        (değer, cache'ten mi geldi) döndürür.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        value = compute()
+        self.put(key, value)
+        return value, False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.name, self.hits, self.misses, len(self._data), self.maxsize)
+
+
+class CacheCounter:
+    """
+    Kendi deposunu yöneten önbellekler için yalnızca isabet/ıska sayacı.
+    size: o anki kayıt sayısını veren isteğe bağlı fonksiyon.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        size: Optional[Callable[[], int]] = None,
+        maxsize: Optional[int] = None,
+    ) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._size = size
+        self._lock = threading.Lock()
+        _register(self)
+
+    def hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def stats(self) -> CacheStats:
+        size = self._size() if self._size is not None else None
+        return CacheStats(self.name, self.hits, self.misses, size, self.maxsize)
+
+
+class _LruFunction:
+    def __init__(self, name: str, fn: Any) -> None:
+        self.name = name
+        self._fn = fn
+
+    def stats(self) -> CacheStats:
+        info = self._fn.cache_info()
+        return CacheStats(self.name, info.hits, info.misses, info.currsize, info.maxsize)
+
+
+def register_lru_function(name: str, fn: Any) -> Any:
+    """
+    functools.lru_cache ile sarılmış fonksiyonun cache_info() sayaçlarını kayda ekler.
+    Fonksiyonu değiştirmeden döndürür (dekoratör olarak da kullanılabilir).
+    """
+    _register(_LruFunction(name, fn))
+    return fn
+
+
+def all_caches() -> List[Any]:
+    """Kayıtlı tüm önbellekler; her birinin stats() -> CacheStats metodu vardır."""
+    with _REGISTRY_LOCK:
+        return list(_REGISTRY)
+
+
+__all__ = [
+    "CacheStats",
+    "LRUCache",
+    "CacheCounter",
+    "register_lru_function",
+    "all_caches",
+]
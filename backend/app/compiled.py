@@ -0,0 +1,161 @@
+"""
+compiled.py
+- Doğrulanmış Excel verisini tek bir sıkıştırılmamış .npz dosyasına derler (build adımı)
+- Çalışma anında openpyxl/Excel doğrulaması olmadan diziler doğrudan okunur
+- Dosya, üretildiği Excel içeriğinin hash'ini taşır; loader hash tutmazsa Excel'e döner
+
+Kullanım (backend/ içinden):
+    python -m app.compiled            # COMPILED_DATA_FILE'ı üretir
+    python -m app.compiled --check    # dosya güncel mi? (değilse çıkış kodu 1)
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .config import COMPILED_DATA_FILE
+
+# ---------------------------------------------------------------------------
+
+# Dizi düzeni değişirse artırılır; eski dosyalar okunmaz (Excel'e düşülür)
+FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class CompiledData:
+    """
+    - features[i, f]: city_names[i] ilinin feature_cols[f] değeri (0–1, doğrulanmış)
+    - weights[j, f] / low_mask[j, f]: sector_names[j] için ağırlık (yüzde) ve DUSUK yönü
+    - crit_*: kriter satırları Excel sırasıyla (sektör/feature indeksi, ağırlık, DUSUK mu)
+    """
+    content_hash: str
+    source_names: Tuple[str, ...]
+    source_sha256: Tuple[str, ...]
+    city_names: Tuple[str, ...]
+    city_original: Tuple[str, ...]
+    feature_cols: Tuple[str, ...]
+    features: np.ndarray
+    sector_names: Tuple[str, ...]
+    weights: np.ndarray
+    low_mask: np.ndarray
+    crit_sector: np.ndarray
+    crit_feature: np.ndarray
+    crit_weight: np.ndarray
+    crit_low: np.ndarray
+
+
+def _strings(values) -> np.ndarray:
+    return np.asarray([str(v) for v in values], dtype=str)
+
+
+def write_compiled(data: CompiledData, path: Path = COMPILED_DATA_FILE) -> Path:
+    """
+    Geçici dosyaya yazıp yeniden adlandırır; okuyucular yarım dosya görmez.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                format_version=np.int64(FORMAT_VERSION),
+                content_hash=np.str_(data.content_hash),
+                source_names=_strings(data.source_names),
+                source_sha256=_strings(data.source_sha256),
+                city_names=_strings(data.city_names),
+                city_original=_strings(data.city_original),
+                feature_cols=_strings(data.feature_cols),
+                features=np.ascontiguousarray(data.features, dtype=np.float64),
+                sector_names=_strings(data.sector_names),
+                weights=np.ascontiguousarray(data.weights, dtype=np.float64),
+                low_mask=np.ascontiguousarray(data.low_mask, dtype=bool),
+                crit_sector=np.asarray(data.crit_sector, dtype=np.int32),
+                crit_feature=np.asarray(data.crit_feature, dtype=np.int32),
+                crit_weight=np.asarray(data.crit_weight),
+                crit_low=np.asarray(data.crit_low, dtype=bool),
+            )
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+
+def read_compiled(path: Path = COMPILED_DATA_FILE) -> Optional[CompiledData]:
+    """
+    Derlenmiş dosyayı okur. Dosya yoksa, bozuksa ya da format sürümü farklıysa None.
+    """
+    try:
+        with np.load(path, allow_pickle=False) as z:
+            if int(z["format_version"]) != FORMAT_VERSION:
+                return None
+            return CompiledData(
+                content_hash=str(z["content_hash"]),
+                source_names=tuple(z["source_names"].tolist()),
+                source_sha256=tuple(z["source_sha256"].tolist()),
+                city_names=tuple(z["city_names"].tolist()),
+                city_original=tuple(z["city_original"].tolist()),
+                feature_cols=tuple(z["feature_cols"].tolist()),
+                features=z["features"],
+                sector_names=tuple(z["sector_names"].tolist()),
+                weights=z["weights"],
+                low_mask=z["low_mask"],
+                crit_sector=z["crit_sector"],
+                crit_feature=z["crit_feature"],
+                crit_weight=z["crit_weight"],
+                crit_low=z["crit_low"],
+            )
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+__all__ = [
+    "FORMAT_VERSION",
+    "CompiledData",
+    "write_compiled",
+    "read_compiled",
+]
+
+
+# ---- Build adımı (CLI) -----------------------------------------------------
+
+def main(argv=None) -> int:
+    from .loader import read_sources, source_hash  # loader bu modülü içe aktarır
+
+    parser = argparse.ArgumentParser(description="Excel kaynaklarını .npz snapshot'a derler")
+    parser.add_argument("--out", type=Path, default=COMPILED_DATA_FILE, help="Çıktı dosyası")
+    parser.add_argument("--check", action="store_true", help="Yalnızca dosyanın güncel olup olmadığını kontrol et")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        compiled = read_compiled(args.out)
+        current = source_hash()
+        if compiled is None or compiled.content_hash != current:
+            print(f"{args.out}: güncel değil (kaynak hash {current[:12]})")
+            return 1
+        print(f"{args.out}: güncel ({current[:12]})")
+        return 0
+
+    t0 = time.perf_counter()
+    data = read_sources()
+    path = write_compiled(data.arrays, args.out)
+    print(
+        f"{path} yazıldı: {data.shapes.n_cities} il × {data.shapes.n_features} feature, "
+        f"{data.shapes.n_sectors} sektör, {path.stat().st_size} bayt, "
+        f"hash {data.content_hash[:12]} ({time.perf_counter() - t0:.2f} sn)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
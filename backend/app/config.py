@@ -24,14 +24,69 @@ DATA_DIR = Path(os.getenv("DATA_DIR", ROOT_DIR / "data")).resolve()
 ILLER_FILE = Path(os.getenv("ILLER_FILE", DATA_DIR / "Iller_Normalize.xlsx")).resolve()
 SEKTOR_FILE = Path(os.getenv("SEKTOR_FILE", DATA_DIR / "Sektor_Kriter_Agirlik.xlsx")).resolve()
 
+# Paketle gelen il → coğrafi bölge / NUTS-1 / NUTS-2 / nüfus eşlemesi (app/regions.py)
+REGIONS_FILE = Path(os.getenv("REGIONS_FILE", DATA_DIR / "Il_Bolge.csv")).resolve()
+
+# Build adımında Excel'den derlenen ikili snapshot (python -m app.compiled)
+COMPILED_DATA_FILE = Path(os.getenv("COMPILED_DATA_FILE", DATA_DIR / "compiled_snapshot.npz")).resolve()
+
 # Puan ölçeği
 SCORE_SCALE_MAX: float = 100.0
 
 # Opsiyonel: Dataframe'leri RAM'de tutmak istersen loader içinde kullan
 CACHE_DATAFRAMES: bool = True
 
+# Kaynak dosyaların değişim kontrolü (saniye): en fazla bu aralıkla os.stat yapılır.
+# 0 → her erişimde kontrol, negatif → otomatik kontrol kapalı (yalnızca /api/reload)
+SNAPSHOT_CHECK_INTERVAL: float = float(os.getenv("SNAPSHOT_CHECK_INTERVAL", "2.0"))
+
+# GET skor yanıtlarının Cache-Control max-age değeri (saniye); ETag ile yeniden doğrulanır
+HTTP_CACHE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+
+# What-if (özel ağırlık) sonuç cache'inin en fazla kayıt sayısı
+WHATIF_CACHE_SIZE: int = int(os.getenv("WHATIF_CACHE_SIZE", "256"))
+
+# CPU-yoğun işler (what-if, batch, Monte Carlo) için süreç havuzu (app/workers.py)
+# 0 → havuz yok, işler istek süreçinde thread'de çalışır. Varsayılan: tek CPU'da ve serverless
+# ortamda (Vercel, AWS Lambda: /dev/shm ve süreç başlatma güvenilir değil) 0, aksi halde CPU − 1 (en fazla 4)
+_SERVERLESS = bool(os.getenv("VERCEL") or os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
+CPU_POOL_WORKERS: int = int(os.getenv(
+    "CPU_POOL_WORKERS", "0" if _SERVERLESS else str(max(0, min(4, (os.cpu_count() or 1) - 1))),
+))
+# Kuyrukta + çalışan en fazla iş; aşılırsa 429 + Retry-After
+CPU_POOL_MAX_QUEUE: int = int(os.getenv("CPU_POOL_MAX_QUEUE", str(max(1, CPU_POOL_WORKERS) * 4)))
+# Tek işin en fazla bekleme süresi (sn); aşılırsa 503 + Retry-After
+CPU_POOL_TIMEOUT: float = float(os.getenv("CPU_POOL_TIMEOUT", "30"))
+
+# Ağırlık duyarlılığı (app/sensitivity.py): istek başına örnek sınırı, parça boyutu ve sonuç cache'i
+MC_MAX_SAMPLES: int = int(os.getenv("MC_MAX_SAMPLES", "20000"))
+MC_CHUNK_SIZE: int = int(os.getenv("MC_CHUNK_SIZE", "1024"))
+MC_CACHE_SIZE: int = int(os.getenv("MC_CACHE_SIZE", "64"))
+
+# Loglama (app/log.py): JSON satırları kuyruk üzerinden ayrı thread'de yazılır
+LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+# "json" (varsayılan) ya da geliştirme için okunur "text"
+LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json").lower()
+# Aynı log satırı (çağrı yeri) için saniyede en fazla kayıt; aşan kayıtlar sayılıp atlanır
+LOG_RATE_LIMIT: float = float(os.getenv("LOG_RATE_LIMIT", "20"))
+# Başarılı isteklerin erişim logu örnekleme oranı (0–1); hatalı ve yavaş istekler hep loglanır
+LOG_ACCESS_SAMPLE: float = float(os.getenv("LOG_ACCESS_SAMPLE", "0.05"))
+# Bu süreyi (ms) aşan istekler WARNING ile, örneklemesiz loglanır
+LOG_SLOW_REQUEST_MS: float = float(os.getenv("LOG_SLOW_REQUEST_MS", "250"))
+
+# İstek bazlı profil (app/profiling.py): yalnızca açıksa X-Profile başlıklı istekler profillenir
+PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "0").lower() in ("1", "true", "yes", "on")
+# Flamegraph (folded stacks) dosyalarının yazıldığı klasör ve tutulacak en fazla dosya sayısı
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", ROOT_DIR / "profiles")).resolve()
+PROFILE_MAX_FILES: int = int(os.getenv("PROFILE_MAX_FILES", "100"))
+
+# app.main'in soğuk import süre bütçesi (saniye); tests/test_import_budget.py kontrol eder
+IMPORT_TIME_BUDGET: float = float(os.getenv("IMPORT_TIME_BUDGET", "1.0"))
+
 # ---- Şehir adı normalize yardımcıları -------------------------------------
 
+_UNDECOMPOSABLE = str.maketrans({"ı": "i"})
+
 def strip_diacritics(text: str) -> str:
     """
     Türkçe karakterleri koruyarak 'anahtar' üretmek yerine,
@@ -40,7 +95,8 @@ def strip_diacritics(text: str) -> str:
     """
     nfkd = unicodedata.normalize("NFKD", text)
     without_marks = "".join(ch for ch in nfkd if not unicodedata.combining(ch))
-    return without_marks
+    # 'ı' (noktasız i) NFKD ile ayrışmaz; elle eşle
+    return without_marks.translate(_UNDECOMPOSABLE)
 
 def normalize_city_key(text: str) -> str:
     """
@@ -94,8 +150,28 @@ __all__ = [
     "DATA_DIR",
     "ILLER_FILE",
     "SEKTOR_FILE",
+    "REGIONS_FILE",
+    "COMPILED_DATA_FILE",
     "SCORE_SCALE_MAX",
     "CACHE_DATAFRAMES",
+    "SNAPSHOT_CHECK_INTERVAL",
+    "HTTP_CACHE_MAX_AGE",
+    "WHATIF_CACHE_SIZE",
+    "CPU_POOL_WORKERS",
+    "CPU_POOL_MAX_QUEUE",
+    "CPU_POOL_TIMEOUT",
+    "MC_MAX_SAMPLES",
+    "MC_CHUNK_SIZE",
+    "MC_CACHE_SIZE",
+    "LOG_LEVEL",
+    "LOG_FORMAT",
+    "LOG_RATE_LIMIT",
+    "LOG_ACCESS_SAMPLE",
+    "LOG_SLOW_REQUEST_MS",
+    "PROFILING_ENABLED",
+    "PROFILE_DIR",
+    "PROFILE_MAX_FILES",
+    "IMPORT_TIME_BUDGET",
     "strip_diacritics",
     "normalize_city_key",
     "canonicalize_city_name",
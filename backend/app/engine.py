@@ -0,0 +1,145 @@
+"""
+engine.py
+- Salt-okunur il × sektör skor matrisi (veri snapshot'ı başına bir tane)
+- İl/sektör adından satır/kolon indeksine O(1) erişim
+- API istek yolunda pandas kullanılmaz; matris snapshot kurulurken bir kez hesaplanır
+- Her sektörün il sıralaması da snapshot başına bir kez çıkarılır (tam sıralama bedava)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .config import SCORE_SCALE_MAX
+from .ranking import column_orders, descending_order, rank_positions, select_bottom, select_top
+from .resolver import NameResolver
+from .scoring import ScoreTables
+
+# (sıra, isim, puan); sıra 1 tabanlı ve tam sıralamadaki konumdur
+Ranked = Tuple[int, str, float]
+
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ScoreEngine:
+    """
+    scores[i, j] = city_names[i] ilinin sector_names[j] sektöründeki 0–100 puanı.
+    sector_orders[j] = j sektöründe azalan puana göre il indeksleri (eşitlikte il sırası)
+    sector_ranks[j, i] = i ilinin j sektöründeki sırası (1 tabanlı)
+    Diziler yazmaya kapalıdır; tüm istekler aynı örneği kilitsiz paylaşır.
+    """
+    city_names: Tuple[str, ...]
+    sector_names: Tuple[str, ...]
+    city_index: Mapping[str, int]
+    sector_index: Mapping[str, int]
+    city_resolver: NameResolver
+    sector_resolver: NameResolver
+    scores: np.ndarray
+    sector_orders: np.ndarray
+    sector_ranks: np.ndarray
+
+    @property
+    def n_cities(self) -> int:
+        return len(self.city_names)
+
+    @property
+    def n_sectors(self) -> int:
+        return len(self.sector_names)
+
+    def find_city(self, city: str) -> Optional[int]:
+        return self.city_resolver.resolve(city)
+
+    def find_sector(self, sector: str) -> Optional[int]:
+        return self.sector_resolver.resolve(sector)
+
+    def cities_for_sector(self, sector_idx: int) -> np.ndarray:
+        """Bir sektör için 81 ilin puanları (kolon görünümü, kopya yok)."""
+        return self.scores[:, sector_idx]
+
+    def sectors_for_city(self, city_idx: int) -> np.ndarray:
+        """Bir il için tüm sektörlerin puanları (satır görünümü, kopya yok)."""
+        return self.scores[city_idx, :]
+
+    # ---- Sektör → il sıralamaları (önceden hesaplı) -----------------------
+
+    def city_ranking(self, sector_idx: int) -> List[Ranked]:
+        return self._ranked_cities(sector_idx, self.sector_orders[sector_idx])
+
+    def top_cities(self, sector_idx: int, n: int = 5) -> List[Ranked]:
+        return self._ranked_cities(sector_idx, self.sector_orders[sector_idx, :n])
+
+    def bottom_cities(self, sector_idx: int, n: int = 5) -> List[Ranked]:
+        """En düşük n il, en kötüden başlayarak."""
+        order = self.sector_orders[sector_idx]
+        return self._ranked_cities(sector_idx, order[::-1][:n])
+
+    def _ranked_cities(self, sector_idx: int, idx: np.ndarray) -> List[Ranked]:
+        col = self.cities_for_sector(sector_idx)
+        ranks = self.sector_ranks[sector_idx]
+        return [(int(ranks[i]), self.city_names[i], float(col[i])) for i in idx.tolist()]
+
+    # ---- İl → sektör sıralamaları (kısmi seçim) ---------------------------
+
+    def sector_ranking(self, city_idx: int) -> List[Ranked]:
+        row = self.sectors_for_city(city_idx)
+        return [
+            (rank, self.sector_names[j], float(row[j]))
+            for rank, j in enumerate(descending_order(row).tolist(), 1)
+        ]
+
+    def top_sectors(self, city_idx: int, n: int = 5) -> List[Ranked]:
+        row = self.sectors_for_city(city_idx)
+        return [
+            (rank, self.sector_names[j], float(row[j]))
+            for rank, j in enumerate(select_top(row, n).tolist(), 1)
+        ]
+
+    def bottom_sectors(self, city_idx: int, n: int = 5) -> List[Ranked]:
+        """En düşük n sektör, en kötüden başlayarak."""
+        row = self.sectors_for_city(city_idx)
+        total = self.n_sectors
+        return [
+            (total - k, self.sector_names[j], float(row[j]))
+            for k, j in enumerate(select_bottom(row, n).tolist())
+        ]
+
+def build_engine(tables: ScoreTables) -> ScoreEngine:
+    """
+    Hesaplanmış skor tablolarından 0–100 ölçekli, indeksli motoru kurar.
+    """
+    city_list = tables.city_names
+    sector_list = tables.weights.sector_names
+
+    scores = tables.scores * SCORE_SCALE_MAX
+    scores.setflags(write=False)
+
+    sector_orders = column_orders(scores)
+    sector_ranks = rank_positions(sector_orders)
+    sector_orders.setflags(write=False)
+    sector_ranks.setflags(write=False)
+
+    city_resolver = tables.city_resolver
+    sector_resolver = tables.sector_resolver
+
+    return ScoreEngine(
+        city_names=tuple(city_list),
+        sector_names=tuple(sector_list),
+        city_index=MappingProxyType(dict(city_resolver.exact)),
+        sector_index=MappingProxyType(dict(sector_resolver.exact)),
+        city_resolver=city_resolver,
+        sector_resolver=sector_resolver,
+        scores=scores,
+        sector_orders=sector_orders,
+        sector_ranks=sector_ranks,
+    )
+
+
+__all__ = [
+    "Ranked",
+    "ScoreEngine",
+    "build_engine",
+]
@@ -2,12 +2,13 @@
 explain.py
 - Skor katkılarından (+) güçlü alanlar ve (⚠) risk/iyileştirme rozetlerini üretir.
 - Kriter anahtarlarını okunur kısa etiketlere dönüştürür.
+- Etiket tablosu veri snapshot'ı başına bir kez kurulur (label_table); istek yolunda regex çalışmaz.
 """
 
 from __future__ import annotations
 
 import re
-from typing import Dict, List
+from typing import Dict, Iterable, List, Mapping, Optional
 
 # ---- Kriter anahtarını okunur etikete çevirme ------------------------------
 
@@ -28,7 +29,7 @@ def _label_from_key(key: str) -> str:
     Heuristik eşleştirme: metrik key'ini kısa, anlaşılır etikete çevirir.
     Bilinen örnekler için daha güzel adlar; bilinmeyende makul bir başlık üretir.
     """
-    k = key.lower()
+    k = key.replace("İ", "i").lower()  # "İ".lower() → "i̇" (noktalı birleşik karakter)
 
     def has(*subs: str) -> bool:
         return all(sub in k for sub in subs)
@@ -54,16 +55,25 @@ def _label_from_key(key: str) -> str:
         return "İstihdam oranı"
     if "toplu" in k and ("tasima" in k or "taşıma" in k):
         return "Toplu taşıma"
+    if ("yakit" in k or "yakıt" in k) and ("dogalgaz" in k or "doğalgaz" in k):
+        return "Katı yakıt–Doğalgaz farkı"
 
     # Fallback: anahtarı yumuşak başlığa çevir
     return _soft_title(key)
 
+def label_table(keys: Iterable[str]) -> Dict[str, str]:
+    """
+    Kriter anahtarı → etiket sözlüğü (tüm feature kolonları için bir kez hesaplanır).
+    """
+    return {str(k): _label_from_key(str(k)) for k in keys}
+
 # ---- Gerekçe üretimi -------------------------------------------------------
 
 def build_reasons_from_contributions(
     contributions: List[Dict],
     top_k_pos: int = 2,
     include_risk: bool = True,
+    labels: Optional[Mapping[str, str]] = None,
 ) -> List[str]:
     """
     scoring.score_sector_for_city(..., return_contributions=True) çıktısını alır,
@@ -73,6 +83,7 @@ def build_reasons_from_contributions(
       'kriter': str, 'yon': 'YUKSEK'|'DUSUK', 'agirlik': float,
       'ham_deger': float (0..1), 'katki': float (0..1)
     }
+    labels: label_table çıktısı; verilirse etiketler tablodan okunur.
     """
     if not contributions:
         return []
@@ -80,22 +91,26 @@ def build_reasons_from_contributions(
     # Katkıya göre sırala (yüksek → düşük)
     contrib_sorted = sorted(contributions, key=lambda c: c.get("katki", 0.0), reverse=True)
 
+    def label(c: Dict) -> str:
+        key = str(c.get("kriter", ""))
+        if labels is not None and key in labels:
+            return labels[key]
+        return _label_from_key(key)
+
     reasons: List[str] = []
 
     # (+) En güçlüler
     for c in contrib_sorted[:max(0, top_k_pos)]:
-        label = _label_from_key(str(c.get("kriter", "")))
         # İsteğe bağlı olarak yön bilgisini paranteze ekleyebilirsin:
         # dir_note = "yüksek" if c.get("yon") == "YUKSEK" else "düşük"
         # reasons.append(f"+ {label} ({dir_note})")
-        reasons.append(f"+ {label}")
+        reasons.append(f"+ {label(c)}")
 
     # (⚠) En zayıf
     if include_risk and len(contrib_sorted) > 0:
         weakest = contrib_sorted[-1]
-        label_w = _label_from_key(str(weakest.get("kriter", "")))
-        reasons.append(f"⚠ {label_w}")
+        reasons.append(f"⚠ {label(weakest)}")
 
     return reasons
 
-__all__ = ["build_reasons_from_contributions"]
\ No newline at end of file
+__all__ = ["build_reasons_from_contributions", "label_table"]
\ No newline at end of file
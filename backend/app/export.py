@@ -0,0 +1,131 @@
+"""
+export.py
+- Tüm (il, sektör) skorlarının ve isteğe bağlı kriter katkılarının akışla dışa aktarımı (NDJSON / CSV)
+- Satırlar üreteçle parça parça üretilir: bellek satır sayısından bağımsız, indirme hemen başlar
+- Kaynak istek başındaki snapshot'tır; akış sürerken veri yenilense de çıktı tek sürümden gelir
+
+Satır düzeni (sektör sırasıyla, her sektörde il sırasıyla):
+    NDJSON: {"city", "sector", "score", "rank"[, "contributions": [{kriter, yon, agirlik, ham_deger, katki}, ...]]}
+    CSV:    Sehir,Sektor,Puan,Sira  |  katkılarla: Sehir,Sektor,Puan,Sira,Kriter,Yon,Agirlik,HamDeger,Katki
+            (katkılı CSV'de kriter başına bir satır)
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from .snapshot import DataSnapshot
+
+# ---------------------------------------------------------------------------
+
+MEDIA_TYPES: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Ağdaki yazma sayısı ile parça boyutu arasında denge; bir parça ~birkaç on KB
+ROWS_PER_CHUNK = 256
+
+# 0–1 bandındaki değerler (katkı, ham değer) için ondalık basamak
+_UNIT_DIGITS = 4
+
+CSV_HEADER = ("Sehir", "Sektor", "Puan", "Sira")
+CSV_CONTRIB_HEADER = CSV_HEADER + ("Kriter", "Yon", "Agirlik", "HamDeger", "Katki")
+
+
+def _rows(snap: DataSnapshot, sector_idx: Sequence[int], city_idx: Sequence[int], contributions: bool) -> Iterator[tuple]:
+    """
+    (il, sektör, puan, sıra, katkılar) — katkılar: [(kriter, yön, ağırlık, ham değer, katkı), ...] ya da None.
+    Numpy'dan Python'a dönüşüm sektör başına bir kez yapılır (hücre başına skaler erişim yok).
+    """
+    engine = snap.engine
+    wm = snap.tables.weights
+    for j in sector_idx:
+        scores = engine.scores[:, j].tolist()
+        ranks = engine.sector_ranks[j].tolist()
+        if contributions:
+            cols = list(wm.criteria[j])
+            meta = [
+                (wm.feature_cols[f], "DUSUK" if wm.low_mask[j, f] else "YUKSEK", float(wm.weights[j, f]))
+                for f in cols
+            ]
+            raw = snap.tables.features[:, cols].round(_UNIT_DIGITS).tolist()
+            contrib = snap.contributions[:, j, cols].round(_UNIT_DIGITS).tolist()
+        for i in city_idx:
+            rows = None
+            if contributions:
+                rows = [(*m, h, c) for m, h, c in zip(meta, raw[i], contrib[i])]
+            yield engine.city_names[i], engine.sector_names[j], scores[i], ranks[i], rows
+
+
+def _ndjson_lines(snap: DataSnapshot, sector_idx, city_idx, contributions: bool, precision: int) -> Iterator[str]:
+    for city, sector, score, rank, contrib in _rows(snap, sector_idx, city_idx, contributions):
+        row = {"city": city, "sector": sector, "score": round(score, precision), "rank": rank}
+        if contrib is not None:
+            row["contributions"] = [
+                {"kriter": k, "yon": y, "agirlik": a, "ham_deger": h, "katki": c}
+                for k, y, a, h, c in contrib
+            ]
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def _csv_lines(snap: DataSnapshot, sector_idx, city_idx, contributions: bool, precision: int) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    fmt = f"{{:.{precision}f}}"
+
+    def flush() -> str:
+        text = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        return text
+
+    writer.writerow(CSV_CONTRIB_HEADER if contributions else CSV_HEADER)
+    yield flush()
+    for city, sector, score, rank, contrib in _rows(snap, sector_idx, city_idx, contributions):
+        head = (city, sector, fmt.format(score), rank)
+        if contrib is not None:
+            writer.writerows(head + c for c in contrib)
+        else:
+            writer.writerow(head)
+        yield flush()
+
+
+def stream_rows(
+    snap: DataSnapshot,
+    fmt: str = "ndjson",
+    sector_idx: Optional[Sequence[int]] = None,
+    city_idx: Optional[Sequence[int]] = None,
+    contributions: bool = False,
+    precision: int = 1,
+    rows_per_chunk: int = ROWS_PER_CHUNK,
+) -> Iterator[bytes]:
+    """
+    StreamingResponse gövdesi: rows_per_chunk satırda bir UTF-8 parça üretir.
+    sector_idx / city_idx None ise tümü.
+    """
+    if fmt not in MEDIA_TYPES:
+        raise ValueError(f"Geçersiz format: {fmt}")
+    engine = snap.engine
+    sectors = range(engine.n_sectors) if sector_idx is None else sector_idx
+    cities = range(engine.n_cities) if city_idx is None else city_idx
+    lines = (_ndjson_lines if fmt == "ndjson" else _csv_lines)(snap, sectors, cities, contributions, precision)
+
+    chunk: List[str] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= rows_per_chunk:
+            yield "".join(chunk).encode("utf-8")
+            chunk.clear()
+    if chunk:
+        yield "".join(chunk).encode("utf-8")
+
+
+__all__ = [
+    "MEDIA_TYPES",
+    "ROWS_PER_CHUNK",
+    "stream_rows",
+]
@@ -0,0 +1,192 @@
+"""
+generate_scores.py
+- Dağıtılan skor CSV'lerini doğrulanmış veri snapshot'ından tek vektörel geçişte üretir:
+  Il_Sektor_Skorlari.csv, Sektor_Il_Skorlari.csv, Top5_Iller_Per_Sektor.csv, Top5_Sektorler_Per_Il.csv
+- Skorlar API'nin kullandığı matrisin aynısıdır (loader doğrulaması + derlenmiş ağırlıklar); CSV ile canlı
+  skorlar ayrışmaz
+- Dört dosya önce geçici dosyalara yazılır, hepsi hazır olunca yeniden adlandırılır; yarım çıktı kalmaz
+
+Kullanım (backend/ içinden):
+    python -m app.generate_scores [--out data/] [--topn 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .config import DATA_DIR
+from .snapshot import DataSnapshot
+
+# ---------------------------------------------------------------------------
+
+CITY_SECTOR_FILE = "Il_Sektor_Skorlari.csv"
+SECTOR_CITY_FILE = "Sektor_Il_Skorlari.csv"
+TOP_CITIES_FILE = "Top5_Iller_Per_Sektor.csv"
+TOP_SECTORS_FILE = "Top5_Sektorler_Per_Il.csv"
+
+# Excel'de Türkçe karakterler doğru açılsın (eski çıktılarla aynı)
+ENCODING = "utf-8-sig"
+
+Rows = Iterable[Sequence[object]]
+
+
+@dataclass(frozen=True)
+class GenerationReport:
+    paths: Tuple[Path, ...]
+    n_cities: int
+    n_sectors: int
+    version: int
+    content_hash: str
+    snapshot_seconds: float  # veri yükleme + skor matrisi
+    compute_seconds: float   # sıralamalar / tablo düzeni
+    write_seconds: float
+
+
+def _matrix_rows(label: str, rows: Sequence[str], cols: Sequence[str], values: np.ndarray) -> Rows:
+    yield (label, *cols)
+    for name, row in zip(rows, values.tolist()):
+        yield (name, *row)
+
+
+def _top_rows(
+    key_label: str,
+    name_label: str,
+    keys: Sequence[str],
+    names: Sequence[str],
+    orders: np.ndarray,
+    values: np.ndarray,
+) -> Rows:
+    """orders[k, r]: k anahtarı için r. sıradaki isim indeksi; values[k, r]: puanı."""
+    yield (key_label, "Sira", name_label, "Skor")
+    for key, idx, vals in zip(keys, orders.tolist(), values.tolist()):
+        for rank, (i, v) in enumerate(zip(idx, vals), 1):
+            yield (key, rank, names[i], v)
+
+
+def excel_sector_order(snap: DataSnapshot) -> np.ndarray:
+    """Sektör indeksleri, Sektor_Kriter_Agirlik'te ilk göründükleri sırayla (eski CSV düzeni)."""
+    crit_sector = np.asarray(snap.data.arrays.crit_sector)
+    _, first = np.unique(crit_sector, return_index=True)
+    return crit_sector[np.sort(first)]
+
+
+def build_tables(snap: DataSnapshot, topn: int = 5) -> Dict[str, Rows]:
+    """
+    Dosya adı → satırlar. Sektörler Excel sırasıyla, iller veri sırasıyla yazılır;
+    sıralamalar engine ile aynı kuralı izler (eşit puanda listede önce gelen üstte).
+    """
+    engine = snap.engine
+    cols = excel_sector_order(snap)
+    scores = engine.scores[:, cols]  # (il, sektör)
+    cities = engine.city_names
+    sectors = [engine.sector_names[j] for j in cols]
+
+    city_orders = engine.sector_orders[cols, :topn]  # sektör başına en iyi iller (önceden hesaplı)
+    city_values = np.take_along_axis(scores.T, city_orders, axis=1)
+    sector_orders = np.argsort(-scores, axis=1, kind="stable")[:, :topn]
+    sector_values = np.take_along_axis(scores, sector_orders, axis=1)
+
+    return {
+        CITY_SECTOR_FILE: _matrix_rows("Sehir", cities, sectors, scores),
+        SECTOR_CITY_FILE: _matrix_rows("Sektor", sectors, cities, scores.T),
+        TOP_CITIES_FILE: _top_rows("Sektor", "Sehir", sectors, cities, city_orders, city_values),
+        TOP_SECTORS_FILE: _top_rows("Sehir", "Sektor", cities, sectors, sector_orders, sector_values),
+    }
+
+
+def write_atomic(tables: Dict[str, Rows], out_dir: Path) -> List[Path]:
+    """
+    Her tabloyu aynı klasörde geçici dosyaya yazar; hepsi başarılıysa sırayla yeniden adlandırır.
+    Yazma sırasında hata olursa mevcut dosyalara dokunulmaz.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pending: List[Tuple[str, Path]] = []
+    try:
+        for name, rows in tables.items():
+            fd, tmp = tempfile.mkstemp(prefix=name, suffix=".tmp", dir=out_dir)
+            pending.append((tmp, out_dir / name))
+            with os.fdopen(fd, "w", encoding=ENCODING, newline="") as f:
+                csv.writer(f, lineterminator="\n").writerows(rows)
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        for tmp, _ in pending:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+        raise
+    for tmp, path in pending:
+        os.replace(tmp, path)
+    return [path for _, path in pending]
+
+
+def generate_score_files(out_dir: Path = DATA_DIR, topn: int = 5) -> GenerationReport:
+    from .loader import load_sources
+    from .snapshot import build_snapshot
+
+    t0 = time.perf_counter()
+    snap = build_snapshot(load_sources(), version=0)
+    t1 = time.perf_counter()
+    tables = build_tables(snap, topn)
+    t2 = time.perf_counter()
+    paths = write_atomic(tables, out_dir)
+    t3 = time.perf_counter()
+    return GenerationReport(
+        paths=tuple(paths),
+        n_cities=snap.engine.n_cities,
+        n_sectors=snap.engine.n_sectors,
+        version=snap.version,
+        content_hash=snap.content_hash,
+        snapshot_seconds=t1 - t0,
+        compute_seconds=t2 - t1,
+        write_seconds=t3 - t2,
+    )
+
+
+__all__ = [
+    "CITY_SECTOR_FILE",
+    "SECTOR_CITY_FILE",
+    "TOP_CITIES_FILE",
+    "TOP_SECTORS_FILE",
+    "GenerationReport",
+    "excel_sector_order",
+    "build_tables",
+    "write_atomic",
+    "generate_score_files",
+]
+
+
+# ---- CLI -------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Skor CSV'lerini (il × sektör, sektör × il, Top-N) üretir")
+    parser.add_argument("--out", type=Path, default=DATA_DIR, help="Çıktı klasörü")
+    parser.add_argument("--topn", type=int, default=5, help="Top listelerindeki kayıt sayısı")
+    args = parser.parse_args(argv)
+
+    report = generate_score_files(args.out, args.topn)
+    for path in report.paths:
+        print(f"{path} yazıldı ({path.stat().st_size} bayt)")
+    total = report.snapshot_seconds + report.compute_seconds + report.write_seconds
+    print(
+        f"{report.n_cities} il × {report.n_sectors} sektör, hash {report.content_hash[:12]}: "
+        f"yükleme + skorlama {report.snapshot_seconds * 1000:.1f} ms, sıralama {report.compute_seconds * 1000:.1f} ms, "
+        f"yazma {report.write_seconds * 1000:.1f} ms (toplam {total:.2f} sn)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
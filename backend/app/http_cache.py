@@ -0,0 +1,112 @@
+"""
+http_cache.py
+- Veri snapshot hash'i + istek parametrelerinden güçlü ETag üretir
+- If-None-Match eşleşirse skorlamaya hiç girmeden 304 döndürür
+- Cache-Control başlığını tek yerden belirler (CDN/tarayıcı önbelleği için)
+- Accept-Encoding pazarlığı (önceden sıkıştırılmış yanıtlar için; bkz. prerender.py)
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+
+from .cache import CacheCounter
+from .config import HTTP_CACHE_MAX_AGE
+from .snapshot import DataSnapshot
+
+# ---------------------------------------------------------------------------
+
+CACHE_CONTROL = f"public, max-age={HTTP_CACHE_MAX_AGE}, must-revalidate"
+
+# İsabet: istemcinin ETag'i tuttu (304); ıska: tam yanıt üretildi
+_ETAG_STATS = CacheCounter("http_etag")
+
+
+def make_etag(snap: DataSnapshot, request: Request, *extra: str) -> str:
+    """
+    Aynı veri sürümü + aynı yol + aynı parametreler (sırasından bağımsız) → aynı ETag.
+    extra: URL'de görünmeyen ama yanıtı değiştiren girdiler (ör. Accept ile seçilen format).
+    """
+    h = hashlib.sha256(snap.content_hash.encode("ascii"))
+    h.update(request.url.path.encode("utf-8"))
+    for key, value in sorted(request.query_params.multi_items()):
+        h.update(f"\x1f{key}\x1e{value}".encode("utf-8"))
+    for part in extra:
+        h.update(f"\x1d{part}".encode("utf-8"))
+    return f'"{h.hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    If-None-Match karşılaştırması (RFC 9110: GET için zayıf karşılaştırma; W/ öneki yok sayılır).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def negotiate_encoding(header: Optional[str], available: Sequence[str]) -> str:
+    """
+    Accept-Encoding'e göre available içinden en yüksek q değerli kodlama; yoksa "identity".
+    Eşit q'da available sırası geçerlidir. "*" listede adı geçmeyen kodlamaları kapsar.
+    """
+    if not header:
+        return "identity"
+    q: Dict[str, float] = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        q[name] = weight
+    best, best_q = "identity", 0.0
+    for encoding in available:
+        weight = q.get(encoding, q.get("*", 0.0))
+        if weight > best_q:
+            best, best_q = encoding, weight
+    return best
+
+
+def conditional_get(snap: DataSnapshot, request: Request, *extra: str) -> Tuple[str, Optional[Response]]:
+    """
+    (etag, 304 yanıtı | None). 304 dönerse handler başka iş yapmadan onu döndürmeli.
+    """
+    etag = make_etag(snap, request, *extra)
+    if etag_matches(request, etag):
+        _ETAG_STATS.hit()
+        return etag, Response(status_code=304, headers=cache_headers(etag))
+    _ETAG_STATS.miss()
+    return etag, None
+
+
+__all__ = [
+    "CACHE_CONTROL",
+    "make_etag",
+    "etag_matches",
+    "cache_headers",
+    "conditional_get",
+    "negotiate_encoding",
+]
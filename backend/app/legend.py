@@ -0,0 +1,163 @@
+"""
+legend.py
+- Choropleth lejant eşikleri: eşit aralık, quantile ve Jenks doğal kırılımlar
+- Sektör başına 81 il puanı (mod1) ve il başına sektör puanları (mod2) üzerinden
+- Tüm (yöntem, sınıf sayısı) kombinasyonları snapshot başına bir kez hesaplanır; istek yolu tablo okur
+  (Jenks O(n²k) dinamik programlamadır, istek başına asla çalıştırılmaz)
+
+Eşikler k sınıf için k+1 değerdir: [en düşük, 1. sınıf üst sınırı, ..., en yüksek]; puanlarla aynı
+biçimde 1 ondalığa yuvarlanır, böylece yanıttaki puan ≤ eşik karşılaştırması tutarlıdır.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Literal, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:  # scoring.py bu modülü içe aktarır; snapshot → scoring döngüsü olmasın
+    from .snapshot import DataSnapshot
+
+# ---------------------------------------------------------------------------
+
+Method = Literal["quantile", "equal", "jenks"]
+METHODS: Tuple[str, ...] = ("quantile", "equal", "jenks")
+MIN_CLASSES = 2
+MAX_CLASSES = 9
+
+DEFAULT_METHOD = "quantile"
+DEFAULT_CLASSES = 5
+
+# Yanıttaki puanlarla aynı yuvarlama
+_DIGITS = 1
+
+
+def equal_breaks(values: np.ndarray, k: int) -> np.ndarray:
+    """(m, n) satır başına [min, ..., max] eşit aralıklı k+1 eşik."""
+    lo = values.min(axis=1, keepdims=True)
+    hi = values.max(axis=1, keepdims=True)
+    return lo + (hi - lo) * np.linspace(0.0, 1.0, k + 1)
+
+
+def quantile_breaks(values: np.ndarray, k: int) -> np.ndarray:
+    """(m, n) satır başına k+1 quantile eşiği (0, 1/k, ..., 1)."""
+    return np.quantile(values, np.linspace(0.0, 1.0, k + 1), axis=1).T
+
+
+def jenks_breaks(values: np.ndarray, k: int) -> np.ndarray:
+    """Tek seri için Fisher–Jenks: sınıf içi kareler toplamını en aza indiren k sınıf."""
+    return jenks_all(values, k)[min(k, len(values))]
+
+
+def jenks_all(values: np.ndarray, max_k: int) -> Dict[int, np.ndarray]:
+    """
+    Tek DP geçişinden 1..max_k sınıfın tümü: geri izleme tablosu k'dan bağımsızdır, yalnızca geri yürüyüş
+    her k için ayrı yapılır. Her sınıf adımında tüm (başlangıç, bitiş) çiftleri tek (n, n) matrisle değerlendirilir.
+    """
+    x = np.sort(np.asarray(values, dtype=np.float64))
+    n = x.shape[0]
+    max_k = min(max_k, n)
+    s1 = np.concatenate(([0.0], np.cumsum(x)))
+    s2 = np.concatenate(([0.0], np.cumsum(x * x)))
+
+    start = np.arange(n)[:, None]
+    end = np.arange(n)[None, :]
+    count = end - start + 1
+    valid = count > 0
+    seg_sum = s1[end + 1] - s1[start]
+    # ssd[i, j]: x[i..j] parçasının ortalamadan sapma kareleri toplamı
+    ssd = np.where(valid, (s2[end + 1] - s2[start]) - seg_sum ** 2 / np.where(valid, count, 1), np.inf)
+
+    cost = ssd[0].copy()  # 1 sınıf: x[0..j]
+    back = np.zeros((max_k, n), dtype=np.intp)
+    cols = np.arange(n)
+    for c in range(1, max_k):
+        # Son sınıf x[i..j]; önceki c sınıf x[0..i-1]'i kaplar (i ≥ c)
+        prev = np.full(n, np.inf)
+        prev[c:] = cost[c - 1:-1]
+        total = prev[:, None] + ssd
+        back[c] = np.argmin(total, axis=0)
+        cost = total[back[c], cols]
+
+    out: Dict[int, np.ndarray] = {}
+    for k in range(1, max_k + 1):
+        breaks = [x[-1]]
+        j = n - 1
+        for c in range(k - 1, 0, -1):
+            i = back[c, j]
+            breaks.append(x[i - 1])
+            j = i - 1
+        breaks.append(x[0])
+        out[k] = np.array(breaks[::-1])
+    return out
+
+
+def breaks_for(values: np.ndarray, method: str = DEFAULT_METHOD, k: int = DEFAULT_CLASSES) -> List[float]:
+    """Tek seri için eşik listesi (snapshot dışı kullanım: ör. scoring.score_all_cities)."""
+    row = np.asarray(values, dtype=np.float64)[None, :]
+    if method == "equal":
+        out = equal_breaks(row, k)[0]
+    elif method == "quantile":
+        out = quantile_breaks(row, k)[0]
+    elif method == "jenks":
+        out = jenks_breaks(row[0], k)
+    else:
+        raise ValueError(f"Geçersiz lejant yöntemi: {method}")
+    return np.round(out, _DIGITS).tolist()
+
+
+def _axis_table(values: np.ndarray) -> Dict[Tuple[str, int], np.ndarray]:
+    """values: (gruplar, n) → (yöntem, k) → (gruplar, k+1) yuvarlanmış eşikler."""
+    table: Dict[Tuple[str, int], np.ndarray] = {}
+    jenks = [jenks_all(row, MAX_CLASSES) for row in values]
+    for k in range(MIN_CLASSES, MAX_CLASSES + 1):
+        table["equal", k] = equal_breaks(values, k)
+        table["quantile", k] = quantile_breaks(values, k)
+        table["jenks", k] = np.stack([by_k[k] for by_k in jenks])
+    for arr in table.values():
+        np.round(arr, _DIGITS, out=arr)
+        arr.setflags(write=False)
+    return table
+
+
+def legend_table(snap: DataSnapshot, axis: str) -> Dict[Tuple[str, int], np.ndarray]:
+    """
+    axis="sector": satır j = j sektöründeki 81 ilin eşikleri; axis="city": satır i = i ilinin sektör eşikleri.
+    """
+    if axis == "sector":
+        return snap.derived(("legends", "sector"), lambda s: _axis_table(s.engine.scores.T))
+    if axis == "city":
+        return snap.derived(("legends", "city"), lambda s: _axis_table(s.engine.scores))
+    raise ValueError(f"Geçersiz eksen: {axis}")
+
+
+def legend(snap: DataSnapshot, axis: str, idx: int, method: str, k: int) -> List[float]:
+    if method not in METHODS:
+        raise ValueError(f"Geçersiz lejant yöntemi: {method}")
+    if not MIN_CLASSES <= k <= MAX_CLASSES:
+        raise ValueError(f"Sınıf sayısı {MIN_CLASSES}–{MAX_CLASSES} aralığında olmalı")
+    return legend_table(snap, axis)[method, k][idx].tolist()
+
+
+def warm(snap: DataSnapshot) -> None:
+    """Snapshot dinleyicisi: iki eksenin tablolarını yayın anında hazırlar."""
+    legend_table(snap, "sector")
+    legend_table(snap, "city")
+
+
+__all__ = [
+    "METHODS",
+    "Method",
+    "MIN_CLASSES",
+    "MAX_CLASSES",
+    "DEFAULT_METHOD",
+    "DEFAULT_CLASSES",
+    "equal_breaks",
+    "quantile_breaks",
+    "jenks_breaks",
+    "jenks_all",
+    "breaks_for",
+    "legend_table",
+    "legend",
+    "warm",
+]
@@ -4,42 +4,67 @@ loader.py
 - Şema & kalite doğrulamaları yapar
 - Şehir isimlerini kanonikleştirir
 - Sektör kriterlerini ve şehir feature'larını kullanıma hazır verir
+- Güncel bir derlenmiş snapshot (compiled.py) varsa Excel yerine onu kullanır
+- pandas/openpyxl yalnızca Excel okunurken ya da DataFrame istendiğinde içe aktarılır
 """
 
 from __future__ import annotations
 
+import hashlib
+import io
 import logging
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+import math
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
-import pandas as pd
+
+if TYPE_CHECKING:  # pandas yalnızca Excel yolunda yüklenir
+    import pandas as pd
 
 from .config import (
+    COMPILED_DATA_FILE,
     ILLER_FILE,
     SEKTOR_FILE,
     CACHE_DATAFRAMES,
     canonicalize_city_name,
+    strip_diacritics,
 )
+from .cache import CacheCounter
+from .compiled import CompiledData, read_compiled
+from .log import get_logger
+from .metrics import DATA_LOAD_SECONDS
+from .resolver import resolver_for
 
 # ---------------------------------------------------------------------------
 
-logger = logging.getLogger(__name__)
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("[%(levelname)s] %(name)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
+# Handler/biçim kurulumu log.py'de ("app" logger'ı; JSON, kuyruklu, hız sınırlı)
+logger = get_logger(__name__)
 
 EPS = 1e-6
 
-# Module-level cache
-_CITIES_DF: pd.DataFrame | None = None
-_CRITERIA_DF: pd.DataFrame | None = None
-_FEATURE_COLS: List[str] | None = None
-_SECTOR_LIST: List[str] | None = None
-_CITY_LIST: List[str] | None = None
+# Excel'deki Türkçe başlıklar → loader'ın beklediği kanonik kolon adları
+CITY_COLUMN_ALIASES: Dict[str, str] = {
+    "İl": "Sehir",
+    "Şehir": "Sehir",
+}
+CRITERIA_COLUMN_ALIASES: Dict[str, str] = {
+    "Sektör": "Sektor",
+    "Tablo Adı": "KriterKey",
+    "Ağırlık (%)": "Agirlik",
+    "Ağırlık": "Agirlik",
+    "Yön": "Yon",
+}
+# Offline CSV üretimi 'Orta' yönünü 'Düşük' gibi puanlıyordu; canlı skorlar aynı sonucu versin
+DIRECTION_ALIASES: Dict[str, str] = {
+    "ORTA": "DUSUK",
+}
+
+# Module-level cache: tek bir değişmez nesne; okuma/temizleme tek atamadır
+_CACHE: "LoadedData | None" = None
+_CACHE_STATS = CacheCounter("loaded_data", size=lambda: int(_CACHE is not None), maxsize=1)
 
 # ---------------------------------------------------------------------------
 
@@ -51,9 +76,123 @@ class DataShapes:
     n_sectors: int
 
 
-def _read_excel_safe(path) -> pd.DataFrame:
+@dataclass(frozen=True)
+class SourceStamp:
+    """
+    Kaynak dosyanın değişim tespiti için izi.
+    mtime/size değişmediyse içerik hash'i yeniden hesaplanmaz.
+    """
+    path: str
+    mtime_ns: int
+    size: int
+    sha256: str
+
+
+@dataclass(frozen=True)
+class LoadedData:
+    """
+    Doğrulanmış Excel verisinin bir sürümü. Alanlar birlikte atanır/okunur;
+    yarım güncellenmiş durum gözlemlenemez.
+    - arrays: skorlamanın kullandığı diziler (derlenmiş snapshot ile aynı düzen)
+    - cities / criteria: DataFrame görünümleri; ilk erişimde kurulur (pandas gerekir)
+    """
+    arrays: CompiledData
+    feature_cols: Tuple[str, ...]
+    sector_list: Tuple[str, ...]
+    city_list: Tuple[str, ...]
+    shapes: DataShapes
+    sources: Tuple[SourceStamp, ...]
+    content_hash: str
+    _frames: Dict[str, "pd.DataFrame"] = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def cities(self) -> "pd.DataFrame":
+        """Sehir, Sehir_Original + feature kolonları."""
+        try:
+            return self._frames["cities"]
+        except KeyError:
+            return self._frames.setdefault("cities", _cities_frame(self.arrays))
+
+    @property
+    def criteria(self) -> "pd.DataFrame":
+        """Sektor, KriterKey, Agirlik, Yon (Excel satır sırasıyla)."""
+        try:
+            return self._frames["criteria"]
+        except KeyError:
+            return self._frames.setdefault("criteria", _criteria_frame(self.arrays))
+
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_paths() -> Tuple[Path, ...]:
+    return (ILLER_FILE, SEKTOR_FILE)
+
+
+def stat_sources(paths: Optional[Sequence[Path]] = None) -> Tuple[Tuple[str, int, int], ...]:
+    """
+    Yalnızca os.stat ile (yol, mtime_ns, boyut) üçlüleri; ucuz değişim kontrolü için.
+    Dosya yoksa mtime/boyut -1 döner.
+    """
+    out = []
+    for p in (paths or source_paths()):
+        try:
+            st = os.stat(p)
+            out.append((str(p), st.st_mtime_ns, st.st_size))
+        except OSError:
+            out.append((str(p), -1, -1))
+    return tuple(out)
+
+
+def stamp_sources(
+    paths: Optional[Sequence[Path]] = None,
+    previous: Sequence[SourceStamp] = (),
+) -> Tuple[SourceStamp, ...]:
+    """
+    Kaynak dosyaların izlerini üretir; mtime/boyut aynı kalan dosyalarda önceki hash'i kullanır.
+    """
+    prev = {s.path: s for s in previous}
+    stamps = []
+    for path, mtime_ns, size in stat_sources(paths):
+        old = prev.get(path)
+        if old is not None and old.mtime_ns == mtime_ns and old.size == size:
+            stamps.append(old)
+        else:
+            stamps.append(SourceStamp(path, mtime_ns, size, _file_sha256(Path(path))))
+    return tuple(stamps)
+
+
+def combined_hash(stamps: Sequence[SourceStamp]) -> str:
+    h = hashlib.sha256()
+    for s in stamps:
+        h.update(Path(s.path).name.encode("utf-8"))
+        h.update(s.sha256.encode("ascii"))
+    return h.hexdigest()
+
+
+def _read_source(path: Path) -> Tuple[bytes, SourceStamp]:
+    """
+    Dosyayı tek seferde okur; hash ve parse aynı baytlar üzerinden yapılır.
+    """
+    try:
+        st = os.stat(path)
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError as e:
+        raise RuntimeError(f"Excel okuma hatası ({path}): {e}") from e
+    return raw, SourceStamp(str(path), st.st_mtime_ns, st.st_size, hashlib.sha256(raw).hexdigest())
+
+
+def _read_excel_safe(path, raw: Optional[bytes] = None) -> "pd.DataFrame":
+    import pandas as pd  # openpyxl'i de pandas yükler; yalnızca Excel yolunda
+
     try:
-        df = pd.read_excel(path)
+        df = pd.read_excel(io.BytesIO(raw) if raw is not None else path)
         if df.empty:
             raise ValueError(f"Excel boş: {path}")
         return df
@@ -61,18 +200,30 @@ def _read_excel_safe(path) -> pd.DataFrame:
         raise RuntimeError(f"Excel okuma hatası ({path}): {e}") from e
 
 
-def _validate_and_prepare_cities(df_cities_raw: pd.DataFrame) -> Tuple[pd.DataFrame, List[str], List[str]]:
+def _rename_aliases(df: "pd.DataFrame", aliases: Dict[str, str]) -> "pd.DataFrame":
+    """
+    Kanonik kolon yoksa Türkçe başlık karşılığını kanonik ada çevirir.
+    """
+    renames = {
+        src: dst for src, dst in aliases.items()
+        if src in df.columns and dst not in df.columns
+    }
+    return df.rename(columns=renames) if renames else df
+
+
+def _validate_and_prepare_cities(df_cities_raw: "pd.DataFrame") -> Tuple["pd.DataFrame", List[str], List[str]]:
     """
-    Beklenen minimum kolon: 'Sehir' + (normalize edilmiş 0–1 metrik kolonları)
+    Beklenen minimum kolon: 'Sehir' (veya 'İl') + (normalize edilmiş 0–1 metrik kolonları)
     - Sehir'i kanonik hale getir
     - Tüm diğer kolonları sayısal yap
     - 0–1 bandı dışında varsa hata ver
     - Sehir tekrarları varsa hata ver
     """
-    if "Sehir" not in df_cities_raw.columns:
-        raise ValueError("Iller_Normalize.xlsx içinde 'Sehir' kolonu bulunamadı.")
+    import pandas as pd
 
-    df = df_cities_raw.copy()
+    df = _rename_aliases(df_cities_raw.copy(), CITY_COLUMN_ALIASES)
+    if "Sehir" not in df.columns:
+        raise ValueError("Iller_Normalize.xlsx içinde 'Sehir' kolonu bulunamadı.")
 
     # Orijinali sakla (debug için faydalı)
     df["Sehir_Original"] = df["Sehir"].astype(str)
@@ -112,145 +263,344 @@ def _validate_and_prepare_cities(df_cities_raw: pd.DataFrame) -> Tuple[pd.DataFr
     return df[["Sehir", "Sehir_Original"] + num_cols], num_cols, city_list
 
 
-def _validate_and_prepare_criteria(df_criteria_raw: pd.DataFrame, feature_cols: List[str]) -> Tuple[pd.DataFrame, List[str]]:
-    """
-    Beklenen kolonlar: Sektor, KriterKey, Agirlik, Yon
-    - Yon: {YUKSEK, DUSUK}
-    - Ağırlıklar sektör bazında %100 toplam vermeli
-    - KriterKey şehir feature'ları içinde olmalı
-    """
-    required = {"Sektor", "KriterKey", "Agirlik", "Yon"}
-    missing = required - set(df_criteria_raw.columns)
-    if missing:
-        raise ValueError(f"Sektor_Kriter_Agirlik.xlsx zorunlu kolonlar eksik: {missing}")
-
-    df = df_criteria_raw.copy()
+def _normalize_direction(value: Any) -> str:
+    d = strip_diacritics(str(value)).upper().strip()
+    return DIRECTION_ALIASES.get(d, d)
 
-    # Tip/normalize
-    df["Sektor"] = df["Sektor"].astype(str)
-    df["KriterKey"] = df["KriterKey"].astype(str)
 
-    # Yon normalize
-    df["Yon"] = df["Yon"].astype(str).str.upper().str.strip()
+def _check_criteria(
+    sectors: Sequence[str],
+    keys: Sequence[str],
+    weights: Sequence[float],
+    directions: Sequence[str],
+    feature_cols: Sequence[str],
+    source_name: str,
+) -> List[str]:
+    """
+    Kriter kuralları (tipleri normalize edilmiş sütunlar üzerinde); sıralı sektör listesini döndürür.
+    Excel (DataFrame) ve API (satır listesi) yolları aynı kuralları ve mesajları kullanır.
+    """
     valid_dirs = {"YUKSEK", "DUSUK"}
-    if not set(df["Yon"]).issubset(valid_dirs):
-        bad = sorted(set(df["Yon"]) - valid_dirs)
+    if not set(directions).issubset(valid_dirs):
+        bad = sorted(set(directions) - valid_dirs)
         raise ValueError(f"Geçersiz 'Yon' değerleri: {bad} (yalnızca {valid_dirs})")
 
-    # Agirlik sayısal
-    df["Agirlik"] = pd.to_numeric(df["Agirlik"], errors="coerce")
-    if df["Agirlik"].isna().any():
+    if any(math.isnan(w) for w in weights):
         raise ValueError("Agirlik sütununda sayısal olmayan değerler var.")
 
-    # KriterKey şehir kolonları içinde mi?
-    missing_keys = sorted(set(df["KriterKey"]) - set(feature_cols))
+    missing_keys = sorted(set(keys) - set(feature_cols))
     if missing_keys:
         raise ValueError(
-            "Sektor_Kriter_Agirlik.xlsx içindeki bazı KriterKey alanları Iller_Normalize.xlsx feature'larında bulunamadı: "
+            f"{source_name} içindeki bazı KriterKey alanları Iller_Normalize.xlsx feature'larında bulunamadı: "
             + ", ".join(missing_keys)
         )
 
-    # Ağırlık toplamı sektör bazında ~100
-    grp = df.groupby("Sektor")["Agirlik"].sum()
-    bad_weight = grp[(grp < 100 - EPS) | (grp > 100 + EPS)]
-    if not bad_weight.empty:
+    # Aynı sektörde tekrar eden KriterKey ağırlıkları toplanır; tek kriter hücresinin tek yönü olabilir
+    seen: Dict[Tuple[str, str], str] = {}
+    mixed = set()
+    for sector, key, direction in zip(sectors, keys, directions):
+        if seen.setdefault((sector, key), direction) != direction:
+            mixed.add((sector, key))
+    if mixed:
+        raise ValueError(
+            "Aynı sektörde hem YUKSEK hem DUSUK yönlü tekrar eden kriterler: "
+            + ", ".join(f"{s}/{k}" for s, k in sorted(mixed))
+        )
+
+    totals: Dict[str, float] = {}
+    for sector, w in zip(sectors, weights):
+        totals[sector] = totals.get(sector, 0.0) + float(w)
+    bad_weight = {k: v for k, v in sorted(totals.items()) if v < 100 - EPS or v > 100 + EPS}
+    if bad_weight:
         details = ", ".join(f"{k}={v:.2f}" for k, v in bad_weight.items())
         raise ValueError(f"Ağırlık toplamı 100 değil: {details}")
 
-    sector_list = sorted(df["Sektor"].unique().tolist())
-    return df[["Sektor", "KriterKey", "Agirlik", "Yon"]], sector_list
+    return sorted(totals)
 
 
-def load_dataframes(force_reload: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame, List[str], List[str], List[str], DataShapes]:
+def validate_criteria_rows(
+    rows: Iterable[Tuple[Any, Any, Any, Any]],
+    feature_cols: Sequence[str],
+    source_name: str = "Sektor_Kriter_Agirlik.xlsx",
+) -> Tuple[List[Tuple[str, str, float, str]], List[str]]:
     """
-    Ana yükleme noktası.
-    Döner:
-      - df_cities: Sehir + feature kolonları
-      - df_criteria: Sektor, KriterKey, Agirlik, Yon
-      - feature_cols: List[str]
-      - sector_list: List[str]
-      - city_list: List[str]
-      - shapes: DataShapes
+    _validate_and_prepare_criteria'nın pandas'sız karşılığı (ör. API'den gelen ağırlıklar için).
+    rows: (Sektor, KriterKey, Agirlik, Yon); döner: (normalize satırlar, sıralı sektör listesi)
     """
-    global _CITIES_DF, _CRITERIA_DF, _FEATURE_COLS, _SECTOR_LIST, _CITY_LIST
+    out: List[Tuple[str, str, float, str]] = []
+    for sector, key, weight, direction in rows:
+        try:
+            w = float(weight)
+        except (TypeError, ValueError):
+            w = math.nan
+        out.append((str(sector), str(key), w, _normalize_direction(direction)))
+    sector_list = _check_criteria(
+        [r[0] for r in out], [r[1] for r in out], [r[2] for r in out], [r[3] for r in out],
+        feature_cols, source_name,
+    )
+    return out, sector_list
 
-    if (not force_reload) and CACHE_DATAFRAMES and _CITIES_DF is not None and _CRITERIA_DF is not None:
-        shapes = DataShapes(
-            n_cities=len(_CITY_LIST or []),
-            n_features=len(_FEATURE_COLS or []),
-            n_criteria_rows=len(_CRITERIA_DF),
-            n_sectors=len(_SECTOR_LIST or []),
-        )
-        return _CITIES_DF.copy(), _CRITERIA_DF.copy(), list(_FEATURE_COLS or []), list(_SECTOR_LIST or []), list(_CITY_LIST or []), shapes
 
-    logger.info("Excel dosyaları yükleniyor...")
-    df_cities_raw = _read_excel_safe(ILLER_FILE)
-    df_cities, feature_cols, city_list = _validate_and_prepare_cities(df_cities_raw)
+def _validate_and_prepare_criteria(
+    df_criteria_raw: "pd.DataFrame",
+    feature_cols: Sequence[str],
+    source_name: str = "Sektor_Kriter_Agirlik.xlsx",
+) -> Tuple["pd.DataFrame", List[str]]:
+    """
+    Beklenen kolonlar: Sektor, KriterKey, Agirlik, Yon
+    (Excel başlıkları 'Sektör', 'Tablo Adı', 'Ağırlık (%)', 'Yön' de kabul edilir)
+    - Yon: {YUKSEK, DUSUK} ('Yüksek'/'Düşük' yazımları aksansız karşılığına çevrilir)
+    - Ağırlıklar sektör bazında %100 toplam vermeli
+    - KriterKey şehir feature'ları içinde olmalı
+    source_name yalnızca hata mesajlarında kullanılır (ör. API'den gelen ağırlıklar için).
+    """
+    import pandas as pd
 
-    df_criteria_raw = _read_excel_safe(SEKTOR_FILE)
-    df_criteria, sector_list = _validate_and_prepare_criteria(df_criteria_raw, feature_cols)
+    df = _rename_aliases(df_criteria_raw.copy(), CRITERIA_COLUMN_ALIASES)
+    required = {"Sektor", "KriterKey", "Agirlik", "Yon"}
+    missing = required - set(df.columns)
+    if missing:
+        raise ValueError(f"{source_name} zorunlu kolonlar eksik: {missing}")
 
-    shapes = DataShapes(
-        n_cities=len(city_list),
-        n_features=len(feature_cols),
-        n_criteria_rows=len(df_criteria),
-        n_sectors=len(sector_list),
+    # Tip/normalize
+    df["Sektor"] = df["Sektor"].astype(str)
+    df["KriterKey"] = df["KriterKey"].astype(str)
+    df["Yon"] = df["Yon"].map(_normalize_direction)
+    df["Agirlik"] = pd.to_numeric(df["Agirlik"], errors="coerce")
+
+    sector_list = _check_criteria(
+        df["Sektor"].tolist(),
+        df["KriterKey"].tolist(),
+        df["Agirlik"].astype(float).tolist(),
+        df["Yon"].tolist(),
+        feature_cols,
+        source_name,
+    )
+    return df[["Sektor", "KriterKey", "Agirlik", "Yon"]], sector_list
+
+
+# ---- DataFrame ↔ dizi dönüşümleri ------------------------------------------
+
+def _to_arrays(
+    df_cities: "pd.DataFrame",
+    df_criteria: "pd.DataFrame",
+    feature_cols: Sequence[str],
+    sector_list: Sequence[str],
+    stamps: Sequence[SourceStamp],
+    content_hash: str,
+) -> CompiledData:
+    feature_pos = {c: f for f, c in enumerate(feature_cols)}
+    sector_pos = {s: j for j, s in enumerate(sector_list)}
+    crit_sector = df_criteria["Sektor"].map(sector_pos).to_numpy(dtype=np.int32)
+    crit_feature = df_criteria["KriterKey"].map(feature_pos).to_numpy(dtype=np.int32)
+    crit_weight = df_criteria["Agirlik"].to_numpy()
+    crit_low = (df_criteria["Yon"] == "DUSUK").to_numpy()
+
+    weights = np.zeros((len(sector_list), len(feature_cols)))
+    np.add.at(weights, (crit_sector, crit_feature), crit_weight)
+    low_mask = np.zeros(weights.shape, dtype=bool)
+    low_mask[crit_sector, crit_feature] = crit_low
+
+    features = df_cities[list(feature_cols)].to_numpy(dtype=np.float64)
+    for arr in (features, weights, low_mask, crit_sector, crit_feature, crit_weight, crit_low):
+        arr.setflags(write=False)
+
+    return CompiledData(
+        content_hash=content_hash,
+        source_names=tuple(Path(s.path).name for s in stamps),
+        source_sha256=tuple(s.sha256 for s in stamps),
+        city_names=tuple(df_cities["Sehir"].tolist()),
+        city_original=tuple(df_cities["Sehir_Original"].tolist()),
+        feature_cols=tuple(feature_cols),
+        features=features,
+        sector_names=tuple(sector_list),
+        weights=weights,
+        low_mask=low_mask,
+        crit_sector=crit_sector,
+        crit_feature=crit_feature,
+        crit_weight=crit_weight,
+        crit_low=crit_low,
+    )
+
+
+def _cities_frame(c: CompiledData) -> "pd.DataFrame":
+    import pandas as pd
+
+    df = pd.DataFrame(np.array(c.features), columns=list(c.feature_cols))
+    df.insert(0, "Sehir", list(c.city_names))
+    df.insert(1, "Sehir_Original", list(c.city_original))
+    return df
+
+
+def _criteria_frame(c: CompiledData) -> "pd.DataFrame":
+    import pandas as pd
+
+    return pd.DataFrame({
+        "Sektor": [c.sector_names[j] for j in c.crit_sector.tolist()],
+        "KriterKey": [c.feature_cols[f] for f in c.crit_feature.tolist()],
+        "Agirlik": np.array(c.crit_weight),
+        "Yon": np.where(c.crit_low, "DUSUK", "YUKSEK").tolist(),
+    })
+
+
+def _loaded(c: CompiledData, stamps: Sequence[SourceStamp], frames: Optional[Dict[str, "pd.DataFrame"]] = None) -> LoadedData:
+    return LoadedData(
+        arrays=c,
+        feature_cols=c.feature_cols,
+        sector_list=c.sector_names,
+        city_list=c.city_names,
+        shapes=DataShapes(
+            n_cities=len(c.city_names),
+            n_features=len(c.feature_cols),
+            n_criteria_rows=len(c.crit_sector),
+            n_sectors=len(c.sector_names),
+        ),
+        sources=tuple(stamps),
+        content_hash=c.content_hash,
+        _frames=dict(frames or {}),
     )
 
+
+def read_sources() -> LoadedData:
+    """
+    Excel kaynaklarını okuyup doğrular; module cache'e dokunmaz.
+    """
+    logger.info("Excel dosyaları yükleniyor...")
+    with DATA_LOAD_SECONDS.time(("read",)):
+        cities_raw, cities_stamp = _read_source(ILLER_FILE)
+        criteria_raw, criteria_stamp = _read_source(SEKTOR_FILE)
+    stamps = (cities_stamp, criteria_stamp)
+
+    with DATA_LOAD_SECONDS.time(("parse",)):
+        df_cities_raw = _read_excel_safe(ILLER_FILE, cities_raw)
+        df_criteria_raw = _read_excel_safe(SEKTOR_FILE, criteria_raw)
+
+    with DATA_LOAD_SECONDS.time(("validate",)):
+        df_cities, feature_cols, city_list = _validate_and_prepare_cities(df_cities_raw)
+        df_criteria, sector_list = _validate_and_prepare_criteria(df_criteria_raw, feature_cols)
+        arrays = _to_arrays(df_cities, df_criteria, feature_cols, sector_list, stamps, combined_hash(stamps))
+    data = _loaded(arrays, stamps, {"cities": df_cities, "criteria": df_criteria})
+    shapes = data.shapes
     logger.info(
         f"Yüklendi: {shapes.n_cities} il, {shapes.n_features} feature, "
         f"{shapes.n_criteria_rows} kriter satırı, {shapes.n_sectors} sektör."
     )
+    return data
+
+
+def source_hash() -> str:
+    """Kaynak Excel dosyalarının güncel birleşik içerik hash'i."""
+    return combined_hash(stamp_sources())
+
 
+def load_sources(stamps: Optional[Sequence[SourceStamp]] = None) -> LoadedData:
+    """
+    Derlenmiş snapshot Excel içeriğiyle aynı hash'i taşıyorsa onu, değilse Excel'i okur.
+    stamps: çağıran kaynak izlerini zaten hesapladıysa (tekrar hash'lenmez).
+    Excel dosyaları hiç yoksa (yalnız derlenmiş dosya dağıtıldıysa) derlenmiş dosya kullanılır.
+    """
+    with DATA_LOAD_SECONDS.time(("compiled",)):
+        compiled = read_compiled(COMPILED_DATA_FILE)
+    if compiled is not None:
+        stat = stat_sources()
+        if all(size < 0 for _, _, size in stat):
+            logger.warning("Excel kaynakları bulunamadı; derlenmiş snapshot hash kontrolsüz kullanılıyor.")
+            stamps = tuple(
+                SourceStamp(path, mtime_ns, size, sha)
+                for (path, mtime_ns, size), sha in zip(stat, compiled.source_sha256)
+            )
+            return _loaded(compiled, stamps)
+        try:
+            stamps = tuple(stamps) if stamps is not None else stamp_sources()
+        except OSError:
+            stamps = None
+        if stamps is not None and combined_hash(stamps) == compiled.content_hash:
+            logger.info(f"Derlenmiş snapshot kullanılıyor: {COMPILED_DATA_FILE.name} ({compiled.content_hash[:12]})")
+            return _loaded(compiled, stamps)
+        logger.info(f"{COMPILED_DATA_FILE.name} güncel değil; Excel kaynakları okunacak.")
+    return read_sources()
+
+
+def get_loaded_data(force_reload: bool = False) -> LoadedData:
+    """
+    Cache'teki veri sürümünü (kopyasız) döndürür; yoksa okuyup cache'e koyar.
+    """
+    global _CACHE
+    data = _CACHE
+    if force_reload or not CACHE_DATAFRAMES or data is None:
+        _CACHE_STATS.miss()
+        data = load_sources()
+        if CACHE_DATAFRAMES:
+            _CACHE = data
+    else:
+        _CACHE_STATS.hit()
+    return data
+
+
+def set_cache(data: LoadedData) -> None:
+    """
+    Dışarıda (ör. snapshot deposunda) okunmuş sürümü tek atamayla devreye alır.
+    """
+    global _CACHE
     if CACHE_DATAFRAMES:
-        _CITIES_DF = df_cities.copy()
-        _CRITERIA_DF = df_criteria.copy()
-        _FEATURE_COLS = list(feature_cols)
-        _SECTOR_LIST = list(sector_list)
-        _CITY_LIST = list(city_list)
+        _CACHE = data
 
-    return df_cities, df_criteria, feature_cols, sector_list, city_list, shapes
+
+def load_dataframes(force_reload: bool = False) -> Tuple["pd.DataFrame", "pd.DataFrame", List[str], List[str], List[str], DataShapes]:
+    """
+    Ana yükleme noktası.
+    Döner:
+      - df_cities: Sehir + feature kolonları
+      - df_criteria: Sektor, KriterKey, Agirlik, Yon
+      - feature_cols: List[str]
+      - sector_list: List[str]
+      - city_list: List[str]
+      - shapes: DataShapes
+    """
+    data = get_loaded_data(force_reload=force_reload)
+    return (
+        data.cities.copy(),
+        data.criteria.copy(),
+        list(data.feature_cols),
+        list(data.sector_list),
+        list(data.city_list),
+        data.shapes,
+    )
 
 
 def get_feature_columns() -> List[str]:
-    global _FEATURE_COLS
-    if _FEATURE_COLS is None:
-        load_dataframes()
-    return list(_FEATURE_COLS or [])
+    return list(get_loaded_data().feature_cols)
 
 
 def get_sector_list() -> List[str]:
-    global _SECTOR_LIST
-    if _SECTOR_LIST is None:
-        load_dataframes()
-    return list(_SECTOR_LIST or [])
+    return list(get_loaded_data().sector_list)
 
 
 def get_city_list() -> List[str]:
-    global _CITY_LIST
-    if _CITY_LIST is None:
-        load_dataframes()
-    return list(_CITY_LIST or [])
+    return list(get_loaded_data().city_list)
 
 
-def get_city_row(df_cities: pd.DataFrame, city: str) -> pd.Series:
+def get_city_row(df_cities: "pd.DataFrame", city: str) -> "pd.Series":
     """
-    Kanonik şehir adını bekler; eşleşmezse hata verir.
+    İl adını (yazım/aksan farkı, eşanlamlı, önek veya küçük yazım hatası ile) çözer;
+    eşleşmezse hata verir.
     """
-    mask = df_cities["Sehir"].str.casefold() == (city or "").casefold()
-    if not mask.any():
+    names = tuple(df_cities["Sehir"].tolist())
+    i = resolver_for(names, city_synonyms=True).resolve(city)
+    if i is None:
         raise KeyError(f"Şehir bulunamadı: '{city}'")
-    row = df_cities.loc[mask].iloc[0]
-    return row
+    return df_cities.iloc[i]
 
 
-def get_sector_slice(df_criteria: pd.DataFrame, sector: str) -> pd.DataFrame:
+def get_sector_slice(df_criteria: "pd.DataFrame", sector: str) -> "pd.DataFrame":
     """
     Verilen sektör için kriter satırlarını döndürür.
     """
-    mask = df_criteria["Sektor"].str.casefold() == (sector or "").casefold()
-    if not mask.any():
+    names = tuple(df_criteria["Sektor"].unique().tolist())
+    canonical = resolver_for(names).canonical(sector)
+    if canonical is None:
         raise KeyError(f"Sektör bulunamadı: '{sector}'")
+    mask = df_criteria["Sektor"] == canonical
     return df_criteria.loc[mask, ["KriterKey", "Agirlik", "Yon"]].reset_index(drop=True)
 
 
@@ -258,10 +608,6 @@ def invalidate_cache() -> None:
     """
     Excel güncellendiğinde cache'i boşaltmak için.
     """
-    global _CITIES_DF, _CRITERIA_DF, _FEATURE_COLS, _SECTOR_LIST, _CITY_LIST
-    _CITIES_DF = None
-    _CRITERIA_DF = None
-    _FEATURE_COLS = None
-    _SECTOR_LIST = None
-    _CITY_LIST = None
-    logger.info("Loader cache temizlendi.")
\ No newline at end of file
+    global _CACHE
+    _CACHE = None
+    logger.info("Loader cache temizlendi.")
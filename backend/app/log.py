@@ -0,0 +1,289 @@
+"""
+log.py
+- Uygulama logları için tek kurulum noktası ("app" logger ağacı; loader, snapshot, main...)
+- Kayıtlar istek thread'inde yalnızca kuyruğa atılır; JSON'a çevirme ve yazma QueueListener thread'inde
+- İstek kimliği (X-Request-ID) contextvar ile taşınır ve her kayda eklenir
+- Çağrı yeri başına hız sınırı + isteğe bağlı örnekleme: yüksek QPS log I/O'suna dönüşmez
+
+Kullanım:
+    logger = get_logger(__name__)
+    logger.info("Snapshot hazır", extra={"version": 3})
+    logger.info("istek", extra={"sample": 0.05})   # kayıtların ~%5'i yazılır
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextvars
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import (
+    LOG_ACCESS_SAMPLE,
+    LOG_FORMAT,
+    LOG_LEVEL,
+    LOG_RATE_LIMIT,
+    LOG_SLOW_REQUEST_MS,
+)
+
+# ---------------------------------------------------------------------------
+
+ROOT_LOGGER = "app"
+REQUEST_ID_HEADER = b"x-request-id"
+
+_REQUEST_ID: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+# LogRecord'un kendi alanları; geri kalanlar extra={...} ile gelmiştir
+_RESERVED = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id", "sample", "suppressed"}
+
+
+def current_request_id() -> Optional[str]:
+    return _REQUEST_ID.get()
+
+
+def _extras(record: logging.LogRecord) -> Dict[str, Any]:
+    return {k: v for k, v in record.__dict__.items() if k not in _RESERVED and not k.startswith("_")}
+
+
+class JsonFormatter(logging.Formatter):
+    """Tek satır JSON: ts, level, logger, msg, request_id, extra alanlar, exc."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            out["request_id"] = request_id
+        out.update(_extras(record))
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            out["suppressed"] = suppressed
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        return json.dumps(out, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Eski "[LEVEL] logger: mesaj" biçimi; extra alanlar key=value olarak eklenir."""
+
+    def __init__(self) -> None:
+        super().__init__("[%(levelname)s] %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _extras(record)
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            fields = {"request_id": request_id, **fields}
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            fields["suppressed"] = suppressed
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return line
+
+
+# ---- Örnekleme / hız sınırı ------------------------------------------------
+
+class SampleFilter(logging.Filter):
+    """extra={"sample": p} taşıyan kayıtları p olasılıkla geçirir (WARNING ve üstü hep geçer)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        p = getattr(record, "sample", None)
+        if p is None or record.levelno >= logging.WARNING:
+            return True
+        return p >= 1.0 or random.random() < p
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Çağrı yeri (dosya, satır) başına token bucket: saniyede `rate` kayıt, aynı miktarda patlama.
+    Atlanan kayıt sayısı bir sonraki geçen kayda `suppressed` olarak eklenir. CRITICAL sınırsızdır.
+    """
+
+    def __init__(self, rate: float = LOG_RATE_LIMIT) -> None:
+        super().__init__()
+        self.rate = float(rate)
+        # (dosya, satır) → [token, son güncelleme, atlanan]
+        self._buckets: Dict[Tuple[str, int], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno >= logging.CRITICAL:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.rate, now, 0]
+            else:
+                bucket[0] = min(self.rate, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1.0
+            if bucket[2]:
+                record.suppressed = int(bucket[2])
+                bucket[2] = 0
+        return True
+
+
+class _ContextQueueHandler(QueueHandler):
+    """
+    İstek thread'inde yalnızca mesajı birleştirir ve istek kimliğini ekler;
+    biçimlendirme ve yazma dinleyici thread'inde yapılır.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.request_id = _REQUEST_ID.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+# ---- Kurulum ---------------------------------------------------------------
+
+_LISTENER: Optional[QueueListener] = None
+_SETUP_LOCK = threading.Lock()
+
+
+def configure_logging(stream=None, fmt: str = LOG_FORMAT, level: str = LOG_LEVEL) -> logging.Logger:
+    """
+    "app" logger'ına kuyruk handler'ı kurar ve dinleyici thread'i başlatır (tekrar çağrılırsa dokunmaz).
+    """
+    global _LISTENER
+    root = logging.getLogger(ROOT_LOGGER)
+    with _SETUP_LOCK:
+        if _LISTENER is not None:
+            return root
+        target = logging.StreamHandler(stream or sys.stderr)
+        target.setFormatter(TextFormatter() if fmt == "text" else JsonFormatter())
+
+        q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        handler = _ContextQueueHandler(q)
+        handler.addFilter(SampleFilter())
+        handler.addFilter(RateLimitFilter())
+
+        root.handlers[:] = [handler]
+        root.setLevel(level)
+        root.propagate = False
+
+        _LISTENER = QueueListener(q, target, respect_handler_level=True)
+        _LISTENER.start()
+        atexit.register(shutdown_logging)
+    return root
+
+
+def shutdown_logging() -> None:
+    """Kuyruktaki kayıtları yazıp dinleyiciyi durdurur."""
+    global _LISTENER
+    with _SETUP_LOCK:
+        listener, _LISTENER = _LISTENER, None
+    if listener is not None:
+        listener.stop()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """app.* altında bir logger; ilk çağrıda kurulumu yapar."""
+    configure_logging()
+    return logging.getLogger(name)
+
+
+# ---- İstek kimliği + erişim logu (ASGI middleware) -------------------------
+
+_access_logger = logging.getLogger(f"{ROOT_LOGGER}.access")
+
+
+def _incoming_request_id(scope) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == REQUEST_ID_HEADER:
+            # Dışarıdan gelen kimlik loglara aynen yazılır; makul uzunluk ve ASCII ile sınırla
+            text = value.decode("latin-1")[:64]
+            return text if text.isascii() and text.isprintable() else None
+    return None
+
+
+class RequestLogMiddleware:
+    """
+    - Her isteğe X-Request-ID atar (gelen başlık varsa onu kullanır) ve yanıtta döndürür
+    - Erişim logu: 5xx → ERROR, yavaş (LOG_SLOW_REQUEST_MS) → WARNING, diğerleri örneklenmiş INFO
+    """
+
+    def __init__(self, app, sample: float = LOG_ACCESS_SAMPLE, slow_ms: float = LOG_SLOW_REQUEST_MS) -> None:
+        self.app = app
+        self.sample = sample
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _incoming_request_id(scope) or uuid.uuid4().hex[:16]
+        token = _REQUEST_ID.set(request_id)
+        header = (REQUEST_ID_HEADER, request_id.encode("latin-1"))
+        status = 500
+        t0 = time.perf_counter()
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", ()), header]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed_ms = (time.perf_counter() - t0) * 1000.0
+            if status >= 500:
+                level, msg = logging.ERROR, "istek başarısız"
+            elif elapsed_ms >= self.slow_ms:
+                level, msg = logging.WARNING, "yavaş istek"
+            elif self.sample > 0 and random.random() < self.sample:
+                # Örneklem dışı kalan isteklerde kayıt nesnesi bile oluşturulmaz
+                level, msg = logging.INFO, "istek"
+            else:
+                level = 0
+            if level and _access_logger.isEnabledFor(level):
+                _access_logger.log(level, msg, extra={
+                    "method": scope.get("method", ""),
+                    "path": scope.get("path", ""),
+                    "route": getattr(scope.get("route"), "path", None) or "unmatched",
+                    "status": status,
+                    "duration_ms": round(elapsed_ms, 3),
+                })
+            _REQUEST_ID.reset(token)
+
+
+__all__ = [
+    "JsonFormatter",
+    "TextFormatter",
+    "SampleFilter",
+    "RateLimitFilter",
+    "RequestLogMiddleware",
+    "configure_logging",
+    "shutdown_logging",
+    "get_logger",
+    "current_request_id",
+]
@@ -2,38 +2,85 @@
 main.py
 - FastAPI giriş noktası
 - Mod-1 (Sektör → İl) ve Mod-2 (İl → Sektör) endpoint'leri
-- Healthcheck ve cache reload yardımcı uçları
+- Healthcheck, cache reload ve Prometheus /metrics yardımcı uçları
 """
 
 from __future__ import annotations
 
-from typing import Dict, List
+from itertools import product
+from typing import Dict, Hashable, List, Literal, Optional
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-import pandas as pd
-import os
+from fastapi.responses import StreamingResponse
+
+from . import legend as legends, metrics, prerender, sensitivity
+from .config import MC_MAX_SAMPLES, PROFILING_ENABLED
+from .log import RequestLogMiddleware, get_logger
 
 from .schemas import (
+    BatchRequest,
+    BatchResponse,
+    Contribution,
+    ExplainEntry,
+    ExplainResponse,
     HealthResponse,
+    LegendBreaks,
     Mod1Response,
+    MultiSectorEntry,
+    MultiSectorResponse,
     Mod2Response,
+    RankedEntry,
+    RankingResponse,
+    RegionEntry,
+    RegionScoreStats,
+    RegionsResponse,
     ScoreEntry,
+    SensitivityCity,
+    SensitivityResponse,
+    SimilarCitiesResponse,
+    SimilarCity,
+    WhatIfRequest,
+    WhatIfResponse,
 )
-from .loader import (
-    load_dataframes,
-    invalidate_cache,
+from .engine import Ranked
+from .ranking import descending_order
+from .snapshot import (
+    DataSnapshot,
+    get_snapshot,
+    get_store,
 )
 from .scoring import (
+    contribution_list,
     score_all_cities,
     score_all_sectors,
     score_sector_for_city,
     sort_top_n,
 )
 from .explain import build_reasons_from_contributions
+from .whatif import compute_result, lookup, remember
+from .batch import run_batch
+from .skyline import aggregate_scores, skyline_mask
+from .similarity import neighbor_index
+from .regions import Level as RegionLevel, STATS as REGION_STATS, region_stats, stats_rows
+from .export import MEDIA_TYPES as EXPORT_MEDIA_TYPES, stream_rows
+from .workers import PoolSaturated, PoolUnavailable, get_pool
+from .http_cache import cache_headers, conditional_get, negotiate_encoding
+from .matrix_format import (
+    FORMATS,
+    encode_binary,
+    encode_csv,
+    encode_json,
+    negotiate_format,
+)
 
 APP_VERSION = "1.0.0"
 
+# mod1/mod2 topn ve bottomn üst sınırı (önceden hazırlanan yanıtlar da bu aralıkta)
+TOPN_MAX = 20
+
+logger = get_logger(__name__)
+
 app = FastAPI(
     title="Yatırım Karar Destek API",
     version=APP_VERSION,
@@ -50,173 +97,248 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ---- CSV dosya yolları ------------------------------------------------------
+# ---- Metrikler (route bazında sayaç + gecikme histogramı) ------------------
 
-CSV_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
-TOP5_ILLER_PER_SEKTOR_CSV = os.path.join(CSV_DIR, "Top5_Iller_Per_Sektor.csv")
-TOP5_SEKTORLER_PER_IL_CSV = os.path.join(CSV_DIR, "Top5_Sektorler_Per_Il.csv")
+app.add_middleware(metrics.MetricsMiddleware)
 
-# ---- CSV veri yükleme fonksiyonları ----------------------------------------
+# ---- İstek kimliği + örneklenmiş erişim logu (JSON, kuyruklu) --------------
 
-def load_top5_iller_per_sektor() -> pd.DataFrame:
-    """Top5_Iller_Per_Sektor.csv dosyasını yükler"""
-    try:
-        df = pd.read_csv(TOP5_ILLER_PER_SEKTOR_CSV)
-        return df
-    except Exception as e:
-        print(f"Top5_Iller_Per_Sektor.csv yükleme hatası: {e}")
-        return pd.DataFrame()
+app.add_middleware(RequestLogMiddleware)
 
-def load_top5_sektorler_per_il() -> pd.DataFrame:
-    """Top5_Sektorler_Per_Il.csv dosyasını yükler"""
-    try:
-        df = pd.read_csv(TOP5_SEKTORLER_PER_IL_CSV)
-        return df
-    except Exception as e:
-        print(f"Top5_Sektorler_Per_Il.csv yükleme hatası: {e}")
-        return pd.DataFrame()
+# ---- Skor matrisi üzerinden Top-N / Bottom-N -------------------------------
 
-def get_top5_cities_for_sector(sector: str) -> List[ScoreEntry]:
-    """Belirli bir sektör için top5 şehirleri CSV'den çeker"""
-    try:
-        df = load_top5_iller_per_sektor()
-        if df.empty:
-            print(f"CSV dosyası boş veya yüklenemedi")
-            return []
-        
-        # Sektör adını normalize et (büyük/küçük harf duyarsız)
-        # Önce tam eşleşme dene
-        sector_data = df[df['Sektor'] == sector]
-        
-        # Tam eşleşme yoksa kısmi eşleşme dene
-        if sector_data.empty:
-            sector_data = df[df['Sektor'].str.contains(sector, case=False, na=False)]
-        
-        if sector_data.empty:
-            print(f"'{sector}' sektörü CSV'de bulunamadı")
-            return []
-        
-        # Top5'i al ve ScoreEntry listesine dönüştür
-        top5_entries = []
-        for _, row in sector_data.head(5).iterrows():
-            try:
-                top5_entries.append(
-                    ScoreEntry(
-                        name=str(row['Sehir']),
-                        score=round(float(row['Skor']), 1),
-                        reasons=[f"{row['Sehir']} bu sektörde {row['Skor']:.1f} puan ile {row['Sira']}. sırada"]
-                    )
-                )
-            except Exception as e:
-                print(f"Satır işlenirken hata: {e}, satır: {row}")
-                continue
-        
-        print(f"'{sector}' sektörü için {len(top5_entries)} şehir bulundu")
-        return top5_entries
-        
-    except Exception as e:
-        print(f"get_top5_cities_for_sector hatası: {e}")
-        return []
+def _contributions(snap: DataSnapshot, city_idx: int, sector_idx: int) -> List[dict]:
+    """Snapshot'taki katkı tensöründen tek çiftin kriter listesi (yeniden hesap yok)."""
+    return contribution_list(snap.tables, city_idx, sector_idx, snap.contributions[city_idx, sector_idx])
 
-def get_top5_sectors_for_city(city: str) -> List[ScoreEntry]:
-    """Belirli bir şehir için top5 sektörleri CSV'den çeker"""
-    try:
-        df = load_top5_sektorler_per_il()
-        if df.empty:
-            print(f"CSV dosyası boş veya yüklenemedi")
-            return []
-        
-        # Şehir adını normalize et (büyük/küçük harf duyarsız)
-        # Önce tam eşleşme dene
-        city_data = df[df['Sehir'] == city]
-        
-        # Tam eşleşme yoksa kısmi eşleşme dene
-        if city_data.empty:
-            city_data = df[df['Sehir'].str.contains(city, case=False, na=False)]
-        
-        if city_data.empty:
-            print(f"'{city}' şehri CSV'de bulunamadı")
-            return []
-        
-        # Top5'i al ve ScoreEntry listesine dönüştür
-        top5_entries = []
-        for _, row in city_data.head(5).iterrows():
-            try:
-                top5_entries.append(
-                    ScoreEntry(
-                        name=str(row['Sektor']),
-                        score=round(float(row['Skor']), 1),
-                        reasons=[f"{row['Sektor']} sektöründe {row['Skor']:.1f} puan ile {row['Sira']}. sırada"]
-                    )
-                )
-            except Exception as e:
-                print(f"Satır işlenirken hata: {e}, satır: {row}")
-                continue
-        
-        print(f"'{city}' şehri için {len(top5_entries)} sektör bulundu")
-        return top5_entries
-        
-    except Exception as e:
-        print(f"get_top5_sectors_for_city hatası: {e}")
-        return []
+def _badge_table(snap: DataSnapshot) -> List[List[List[str]]]:
+    """badges[i][j]: il i, sektör j için + / ⚠ rozetleri (snapshot başına bir kez)."""
+    return [
+        [
+            build_reasons_from_contributions(_contributions(snap, i, j), labels=snap.labels)
+            for j in range(snap.engine.n_sectors)
+        ]
+        for i in range(snap.engine.n_cities)
+    ]
+
+def _badges(snap: DataSnapshot, city_idx: int, sector_idx: int) -> List[str]:
+    return snap.derived("badges", _badge_table)[city_idx][sector_idx]
+
+def _city_entries(snap: DataSnapshot, sector_idx: int, ranked: List[Ranked]) -> List[ScoreEntry]:
+    index = snap.engine.city_index
+    return [
+        ScoreEntry(
+            name=city,
+            score=round(score, 1),
+            reasons=[
+                f"{city} bu sektörde {score:.1f} puan ile {rank}. sırada",
+                *_badges(snap, index[city], sector_idx),
+            ],
+        )
+        for rank, city, score in ranked
+    ]
+
+def _sector_entries(snap: DataSnapshot, city_idx: int, ranked: List[Ranked]) -> List[ScoreEntry]:
+    index = snap.engine.sector_index
+    return [
+        ScoreEntry(
+            name=sector,
+            score=round(score, 1),
+            reasons=[
+                f"{sector} sektöründe {score:.1f} puan ile {rank}. sırada",
+                *_badges(snap, city_idx, index[sector]),
+            ],
+        )
+        for rank, sector, score in ranked
+    ]
+
+def get_top_cities_for_sector(snap: DataSnapshot, sector_idx: int, topn: int = 5) -> List[ScoreEntry]:
+    """Belirli bir sektör için en yüksek puanlı illeri bellekteki matristen çeker"""
+    return _city_entries(snap, sector_idx, snap.engine.top_cities(sector_idx, topn))
+
+def get_top_sectors_for_city(snap: DataSnapshot, city_idx: int, topn: int = 5) -> List[ScoreEntry]:
+    """Belirli bir il için en yüksek puanlı sektörleri bellekteki matristen çeker"""
+    return _sector_entries(snap, city_idx, snap.engine.top_sectors(city_idx, topn))
 
 # ---- Yaşam döngüsü ---------------------------------------------------------
 
 @app.on_event("startup")
 def _startup() -> None:
-    # CSV dosyalarını kullandığımız için Excel yükleme yapmıyoruz
-    print("[INFO] CSV tabanlı API hazır - Excel dosyası yüklenmedi")
+    # Veri snapshot'ını (skor matrisi dahil) ilk istekten önce hazırla
+    snap = get_snapshot()
+    logger.info(
+        f"Snapshot v{snap.version} hazır: {snap.engine.n_cities} il × {snap.engine.n_sectors} sektör",
+        extra={"version": snap.version, "content_hash": snap.content_hash[:12]},
+    )
+    # mod1/mod2 yanıtları her yeni snapshot için arka planda bayta çevrilir
+    get_store().subscribe(prerender.warm_in_background)
+    # Lejant eşikleri (Jenks dahil) yayın anında bir kez hesaplanır; istek yolu yalnızca tablo okur
+    get_store().subscribe(legends.warm)
+    # Worker'lar kendi snapshot'larını arka planda yükler; süreç başlatılamazsa işler aynı süreçte çalışır
+    pool = get_pool()
+    try:
+        pool.start()
+    except (OSError, RuntimeError) as e:
+        pool.fall_back_inline(e)
+
+@app.on_event("shutdown")
+def _shutdown() -> None:
+    get_pool().close()
 
 # ---- Yardımcılar -----------------------------------------------------------
 
 def _round_scores(d: Dict[str, float], ndigits: int = 1) -> Dict[str, float]:
     return {k: round(float(v), ndigits) for k, v in d.items()}
 
+async def _offload(job: str, fn, snap: DataSnapshot, *args):
+    """
+    CPU-yoğun işi süreç havuzunda çalıştırır; doluysa 429, havuz kullanılamıyorsa 503 (Retry-After ile).
+    """
+    try:
+        return await get_pool().run(job, fn, snap, *args)
+    except PoolSaturated as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except PoolUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
 # ---- Endpoint'ler ----------------------------------------------------------
 
 @app.get("/health", response_model=HealthResponse, tags=["system"])
 def health() -> HealthResponse:
     return HealthResponse(version=APP_VERSION)
 
+@app.get("/metrics", tags=["system"], include_in_schema=False)
+def prometheus_metrics() -> Response:
+    """
+    Prometheus metin formatı. Snapshot kurulumunu tetiklemez; sayaçlar okunurken toplanır.
+    """
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.post("/api/reload", tags=["system"])
-def reload_data() -> Dict[str, str]:
+def reload_data(
+    wait: bool = Query(False, description="Yeni snapshot devreye girene kadar bekle"),
+    timeout: float = Query(60.0, gt=0, le=600, description="wait=true iken en fazla bekleme (sn)"),
+) -> Dict[str, str]:
     """
-    CSV dosyaları güncellendiğinde yeniden yüklemek için.
+    Excel dosyaları güncellendiğinde snapshot'ı arka planda yeniden kurar.
+    Kurulum bitene kadar istekler mevcut snapshot'tan sunulmaya devam eder.
     """
-    try:
-        # CSV dosyaları her istekte yeniden yüklendiği için cache temizlemeye gerek yok
-        return {"status": "ok", "message": "CSV dosyaları her istekte yeniden okunuyor."}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Yeniden yükleme hatası: {e}")
+    store = get_store()
+    before = store.get()
+    builder = store.request_rebuild(force=True)
+    if not wait:
+        return {
+            "status": "accepted",
+            "message": "Yeniden yükleme arka planda başlatıldı.",
+            "version": str(before.version),
+        }
+
+    builder.join(timeout)
+    if builder.is_alive():
+        raise HTTPException(status_code=504, detail="Yeniden yükleme zaman aşımına uğradı; arka planda sürüyor.")
+    if store.last_error:
+        raise HTTPException(status_code=500, detail=f"Yeniden yükleme hatası: {store.last_error}")
+
+    after = store.get()
+    changed = after.version != before.version
+    return {
+        "status": "ok",
+        "message": "Yeni snapshot devrede." if changed else "Kaynak dosyalar değişmemiş.",
+        "version": str(after.version),
+        "contentHash": after.content_hash,
+    }
+
+def _mod1_model(
+    snap: DataSnapshot, sector_idx: int, topn: int, bottomn: int = 0, legend: Optional[LegendBreaks] = None
+) -> Mod1Response:
+    engine = snap.engine
+    top_entries = get_top_cities_for_sector(snap, sector_idx, topn)
+    return Mod1Response(
+        sector=engine.sector_names[sector_idx],
+        # scoresByCity dictionary'si (geriye uyumluluk için)
+        scoresByCity={entry.name: entry.score for entry in top_entries},
+        top5=top_entries,
+        bottom=_city_entries(snap, sector_idx, engine.bottom_cities(sector_idx, bottomn)) if bottomn else None,
+        legend=legend,
+    )
+
+def _mod2_model(
+    snap: DataSnapshot, city_idx: int, topn: int, bottomn: int = 0, legend: Optional[LegendBreaks] = None
+) -> Mod2Response:
+    engine = snap.engine
+    top_entries = get_top_sectors_for_city(snap, city_idx, topn)
+    return Mod2Response(
+        city=engine.city_names[city_idx],
+        # scoresBySector dictionary'si (geriye uyumluluk için)
+        scoresBySector={entry.name: entry.score for entry in top_entries},
+        top5=top_entries,
+        bottom=_sector_entries(snap, city_idx, engine.bottom_sectors(city_idx, bottomn)) if bottomn else None,
+        legend=legend,
+    )
+
+# bottomn=0 ve lejantsız her (sektör, topn) ve (il, topn) yanıtı snapshot başına bir kez bayta çevrilir
+_MOD1_RENDERED = prerender.register(
+    "mod1",
+    lambda snap, key: _mod1_model(snap, *key).model_dump_json().encode("utf-8"),
+    lambda snap: product(range(snap.engine.n_sectors), range(1, TOPN_MAX + 1)),
+)
+_MOD2_RENDERED = prerender.register(
+    "mod2",
+    lambda snap, key: _mod2_model(snap, *key).model_dump_json().encode("utf-8"),
+    lambda snap: product(range(snap.engine.n_cities), range(1, TOPN_MAX + 1)),
+)
+
+def _prerendered_response(snap: DataSnapshot, cache: prerender.Prerendered, key: Hashable, encoding: str, etag: str) -> Response:
+    headers = {"Vary": "Accept-Encoding", **cache_headers(etag)}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=cache.get(snap, key).body(encoding), media_type="application/json", headers=headers)
+
+def _negotiated_get(snap: DataSnapshot, request: Request, prerendered: bool):
+    """
+    (kodlama, etag, 304 | None). Yalnızca önceden sıkıştırılmış baytlar sunulacaksa ETag kodlamaya göre
+    ayrışır (Vary: Accept-Encoding); handler modeli kendisi kurarsa gövde her zaman identity'dir,
+    identity ETag'i kullanılır ve paylaşılan cache'ler bölünmez.
+    """
+    if not prerendered:
+        etag, not_modified = conditional_get(snap, request)
+        return "identity", etag, not_modified
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), prerender.ENCODINGS)
+    etag, not_modified = conditional_get(snap, request, *(() if encoding == "identity" else (encoding,)))
+    if not_modified is not None:
+        not_modified.headers["Vary"] = "Accept-Encoding"
+    return encoding, etag, not_modified
 
 @app.get("/api/mod1", response_model=Mod1Response, tags=["scoring"])
 def mod1_sector_to_cities(
+    request: Request,
+    response: Response,
     sector: str = Query(..., description="Sektör adı (ör. 'Turizm / Otelcilik')"),
-    topn: int = Query(5, ge=1, le=20, description="Top-N il sayısı"),
+    topn: int = Query(5, ge=1, le=TOPN_MAX, description="Top-N il sayısı"),
+    bottomn: int = Query(0, ge=0, le=TOPN_MAX, description="Bottom-N il sayısı (0: yok)"),
+    legend: Optional[legends.Method] = Query(None, description="Lejant yöntemi: quantile, equal ya da jenks (81 il puanı üzerinden)"),
+    classes: int = Query(legends.DEFAULT_CLASSES, ge=legends.MIN_CLASSES, le=legends.MAX_CLASSES, description="Lejant sınıf sayısı"),
 ):
     """
-    Mod-1: Seçili sektör için CSV'den top şehirleri getir.
+    Mod-1: Seçili sektör için bellekteki skor matrisinden top şehirleri getir.
     """
+    snap = get_snapshot()
+    prerendered = not bottomn and legend is None
+    encoding, etag, not_modified = _negotiated_get(snap, request, prerendered)
+    if not_modified is not None:
+        return not_modified
+
     try:
-        # CSV'den direkt oku
-        top_entries = get_top5_cities_for_sector(sector)
-        
-        if not top_entries:
+        sector_idx = snap.engine.find_sector(sector)
+        if sector_idx is None:
             raise HTTPException(status_code=404, detail=f"'{sector}' sektörü için veri bulunamadı")
-        
-        # Sadece istenen sayıda döndür
-        top_entries = top_entries[:topn]
-        
-        # scoresByCity dictionary'sini oluştur (geriye uyumluluk için)
-        scores_by_city = {entry.name: entry.score for entry in top_entries}
-        
-        return Mod1Response(
-            sector=sector,
-            scoresByCity=scores_by_city,
-            top5=top_entries,
-            legend=None,  # CSV'den okurken legend gerekmiyor
-        )
-        
+        if prerendered:
+            return _prerendered_response(snap, _MOD1_RENDERED, (sector_idx, topn), encoding, etag)
+
+        response.headers.update(cache_headers(etag))
+        breaks = legends.legend(snap, "sector", sector_idx, legend, classes) if legend else None
+        return _mod1_model(snap, sector_idx, topn, bottomn, breaks)
+
     except HTTPException:
         raise
     except Exception as e:
@@ -224,33 +346,500 @@ def mod1_sector_to_cities(
 
 @app.get("/api/mod2", response_model=Mod2Response, tags=["scoring"])
 def mod2_city_to_sectors(
+    request: Request,
+    response: Response,
     city: str = Query(..., description="İl adı (ör. 'İzmir')"),
-    topn: int = Query(5, ge=1, le=20, description="Top-N sektör sayısı"),
+    topn: int = Query(5, ge=1, le=TOPN_MAX, description="Top-N sektör sayısı"),
+    bottomn: int = Query(0, ge=0, le=TOPN_MAX, description="Bottom-N sektör sayısı (0: yok)"),
+    legend: Optional[legends.Method] = Query(None, description="Lejant yöntemi: quantile, equal ya da jenks (ilin sektör puanları üzerinden)"),
+    classes: int = Query(legends.DEFAULT_CLASSES, ge=legends.MIN_CLASSES, le=legends.MAX_CLASSES, description="Lejant sınıf sayısı"),
 ):
     """
-    Mod-2: Seçili il için CSV'den top sektörleri getir.
+    Mod-2: Seçili il için bellekteki skor matrisinden top sektörleri getir.
     """
+    snap = get_snapshot()
+    prerendered = not bottomn and legend is None
+    encoding, etag, not_modified = _negotiated_get(snap, request, prerendered)
+    if not_modified is not None:
+        return not_modified
+
     try:
-        # CSV'den direkt oku
-        top_entries = get_top5_sectors_for_city(city)
-        
-        if not top_entries:
+        city_idx = snap.engine.find_city(city)
+        if city_idx is None:
             raise HTTPException(status_code=404, detail=f"'{city}' şehri için veri bulunamadı")
-        
-        # Sadece istenen sayıda döndür
-        top_entries = top_entries[:topn]
-        
-        # scoresBySector dictionary'sini oluştur (geriye uyumluluk için)
-        scores_by_sector = {entry.name: entry.score for entry in top_entries}
-        
-        return Mod2Response(
-            city=city,
-            scoresBySector=scores_by_sector,
-            top5=top_entries,
-            legend=None,  # CSV'den okurken legend gerekmiyor
-        )
-        
+        if prerendered:
+            return _prerendered_response(snap, _MOD2_RENDERED, (city_idx, topn), encoding, etag)
+
+        response.headers.update(cache_headers(etag))
+        breaks = legends.legend(snap, "city", city_idx, legend, classes) if legend else None
+        return _mod2_model(snap, city_idx, topn, bottomn, breaks)
+
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Veri okuma hatası: {e}")
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=f"Veri okuma hatası: {e}")
+
+@app.get("/api/ranking", response_model=RankingResponse, tags=["scoring"])
+def full_ranking(
+    request: Request,
+    response: Response,
+    sector: Optional[str] = Query(None, description="Sektör adı: 81 ilin tam sıralaması"),
+    city: Optional[str] = Query(None, description="İl adı: tüm sektörlerin tam sıralaması"),
+):
+    """
+    Tam sıralama (eşit puanda listede önce gelen üstte). sector ve city'den tam olarak biri verilmeli.
+    """
+    if (sector is None) == (city is None):
+        raise HTTPException(status_code=400, detail="sector veya city parametrelerinden tam olarak biri verilmeli")
+
+    snap = get_snapshot()
+    etag, not_modified = conditional_get(snap, request)
+    if not_modified is not None:
+        return not_modified
+    response.headers.update(cache_headers(etag))
+
+    engine = snap.engine
+    if sector is not None:
+        idx = engine.find_sector(sector)
+        if idx is None:
+            raise HTTPException(status_code=404, detail=f"'{sector}' sektörü için veri bulunamadı")
+        axis, name, ranked = "sector", engine.sector_names[idx], engine.city_ranking(idx)
+    else:
+        idx = engine.find_city(city)
+        if idx is None:
+            raise HTTPException(status_code=404, detail=f"'{city}' şehri için veri bulunamadı")
+        axis, name, ranked = "city", engine.city_names[idx], engine.sector_ranking(idx)
+
+    return RankingResponse(
+        axis=axis,
+        name=name,
+        version=snap.version,
+        total=len(ranked),
+        ranking=[RankedEntry(rank=rank, name=n, score=round(score, 1)) for rank, n, score in ranked],
+    )
+
+def _explain_entry(snap: DataSnapshot, city_idx: int, sector_idx: int, rank: int) -> ExplainEntry:
+    engine = snap.engine
+    return ExplainEntry(
+        city=engine.city_names[city_idx],
+        sector=engine.sector_names[sector_idx],
+        rank=rank,
+        score=round(float(engine.scores[city_idx, sector_idx]), 1),
+        reasons=_badges(snap, city_idx, sector_idx),
+        contributions=[Contribution(**c) for c in _contributions(snap, city_idx, sector_idx)],
+    )
+
+@app.get("/api/explain", response_model=ExplainResponse, tags=["scoring"])
+def explain_scores(
+    request: Request,
+    response: Response,
+    city: Optional[str] = Query(None, description="İl adı"),
+    sector: Optional[str] = Query(None, description="Sektör adı"),
+    topn: int = Query(5, ge=1, le=TOPN_MAX, description="Yalnız biri verildiğinde açıklanacak Top-N"),
+):
+    """
+    Kriter bazlı katkılar ve + / ⚠ rozetleri.
+    - city + sector: tek çift (rank: ilin sektördeki sırası)
+    - yalnız sector: sektörün Top-N ili
+    - yalnız city:   ilin Top-N sektörü
+    """
+    if city is None and sector is None:
+        raise HTTPException(status_code=400, detail="city veya sector parametrelerinden en az biri verilmeli")
+
+    snap = get_snapshot()
+    etag, not_modified = conditional_get(snap, request)
+    if not_modified is not None:
+        return not_modified
+    response.headers.update(cache_headers(etag))
+
+    engine = snap.engine
+    city_idx = sector_idx = None
+    if city is not None:
+        city_idx = engine.find_city(city)
+        if city_idx is None:
+            raise HTTPException(status_code=404, detail=f"'{city}' şehri için veri bulunamadı")
+    if sector is not None:
+        sector_idx = engine.find_sector(sector)
+        if sector_idx is None:
+            raise HTTPException(status_code=404, detail=f"'{sector}' sektörü için veri bulunamadı")
+
+    if city_idx is not None and sector_idx is not None:
+        rank = int(engine.sector_ranks[sector_idx, city_idx])
+        entries = [_explain_entry(snap, city_idx, sector_idx, rank)]
+    elif sector_idx is not None:
+        entries = [
+            _explain_entry(snap, engine.city_index[name], sector_idx, rank)
+            for rank, name, _ in engine.top_cities(sector_idx, topn)
+        ]
+    else:
+        entries = [
+            _explain_entry(snap, city_idx, engine.sector_index[name], rank)
+            for rank, name, _ in engine.top_sectors(city_idx, topn)
+        ]
+
+    return ExplainResponse(
+        version=snap.version,
+        city=engine.city_names[city_idx] if city_idx is not None else None,
+        sector=engine.sector_names[sector_idx] if sector_idx is not None else None,
+        entries=entries,
+    )
+
+@app.post("/api/whatif", response_model=WhatIfResponse, tags=["scoring"])
+async def whatif_custom_weights(body: WhatIfRequest):
+    """
+    Özel (KriterKey, Agirlik, Yon) seti ile 81 ilin puanını ve sıralamasını hesaplar.
+    Excel'deki kurallar geçerlidir: ağırlık toplamı 100, KriterKey veri setinde olmalı.
+    """
+    snap = get_snapshot()
+    engine = snap.engine
+
+    sector_idx = None
+    if body.sector is not None:
+        sector_idx = engine.find_sector(body.sector)
+        if sector_idx is None:
+            raise HTTPException(status_code=404, detail=f"'{body.sector}' sektörü için veri bulunamadı")
+
+    canon, key, result = lookup(snap, ((c.KriterKey, c.Agirlik, c.Yon) for c in body.criteria))
+    cached = result is not None
+    if result is None:
+        try:
+            result = await _offload("whatif", compute_result, snap, canon, key)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        remember(result)
+
+    scores = result.scores.tolist()
+    ranking = [
+        RankedEntry(rank=rank, name=engine.city_names[i], score=round(scores[i], 1))
+        for rank, i in enumerate(result.order.tolist(), 1)
+    ]
+
+    baseline = None
+    if sector_idx is not None:
+        baseline = _round_scores(dict(zip(engine.city_names, engine.cities_for_sector(sector_idx).tolist())))
+
+    return WhatIfResponse(
+        sector=engine.sector_names[sector_idx] if sector_idx is not None else None,
+        version=snap.version,
+        weightHash=result.weight_hash,
+        cached=cached,
+        scoresByCity=_round_scores(dict(zip(engine.city_names, scores))),
+        ranking=ranking,
+        baselineScoresByCity=baseline,
+    )
+
+@app.post("/api/batch", response_model=BatchResponse, tags=["scoring"])
+async def batch_scores(body: BatchRequest):
+    """
+    Çok sayıda sektör / il / (il, sektör) sorgusunu tek çağrıda yanıtlar.
+    Bulunamayan isimler ilgili öğede `error` ile raporlanır.
+    """
+    return await _offload("batch", run_batch, get_snapshot(), body)
+
+@app.get("/api/sensitivity", response_model=SensitivityResponse, tags=["scoring"])
+async def weight_sensitivity(
+    request: Request,
+    response: Response,
+    sector: str = Query(..., description="Sektör adı"),
+    samples: int = Query(2000, ge=100, le=MC_MAX_SAMPLES, description="Örneklenecek ağırlık seti sayısı"),
+    concentration: float = Query(50.0, gt=0, le=10000, description="Dirichlet yoğunluğu (büyük → mevcut ağırlıklara yakın)"),
+    seed: int = Query(0, ge=0, description="Rastgele tohum (aynı tohum → aynı sonuç)"),
+    topk: int = Query(5, ge=1, le=81),
+    ci: float = Query(0.9, gt=0, lt=1, description="Güven aralığı düzeyi"),
+):
+    """
+    Monte Carlo ağırlık duyarlılığı: her il için sıra dağılımı, Top-K olasılığı ve puan güven aralıkları.
+    """
+    snap = get_snapshot()
+    engine = snap.engine
+    sector_idx = engine.find_sector(sector)
+    if sector_idx is None:
+        raise HTTPException(status_code=404, detail=f"'{sector}' sektörü için veri bulunamadı")
+
+    etag, not_modified = conditional_get(snap, request)
+    if not_modified is not None:
+        return not_modified
+    response.headers.update(cache_headers(etag))
+
+    key = sensitivity.cache_key(snap, sector_idx, samples, concentration, seed, topk, ci)
+    result = sensitivity.cached(key)
+    if result is None:
+        try:
+            result = await _offload(
+                "montecarlo", sensitivity.run_sensitivity, snap, sector_idx, samples, concentration, seed, topk, ci,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        sensitivity.remember(key, result)
+
+    probs = (result.rank_counts / result.samples).tolist()
+    cities = []
+    for i in result.baseline_ranks.argsort(kind="stable").tolist():
+        cities.append(SensitivityCity(
+            city=engine.city_names[i],
+            baselineScore=round(float(result.baseline_scores[i]), 1),
+            baselineRank=int(result.baseline_ranks[i]),
+            meanScore=round(float(result.mean_scores[i]), 2),
+            scoreStd=round(float(result.std_scores[i]), 2),
+            scoreCI=(float(result.score_lo[i]), float(result.score_hi[i])),
+            medianRank=int(result.rank_median[i]),
+            rankCI=(int(result.rank_lo[i]), int(result.rank_hi[i])),
+            pTopK=round(float(result.p_topk[i]), 4),
+            rankDistribution={r: round(p, 4) for r, p in enumerate(probs[i], 1) if p > 0},
+        ))
+
+    return SensitivityResponse(
+        sector=engine.sector_names[sector_idx],
+        version=snap.version,
+        samples=result.samples,
+        concentration=result.concentration,
+        seed=result.seed,
+        topk=result.topk,
+        ciLevel=result.ci_level,
+        criteria=[snap.feature_cols[c] for c in result.criteria],
+        cities=cities,
+    )
+
+def _encode_matrix(snap, axis: str, fmt: str, precision: int, city_idx, sector_idx) -> bytes:
+    engine = snap.engine
+    values = engine.scores
+    rows, cols = engine.city_names, engine.sector_names
+    if city_idx is not None:
+        values = values[city_idx, :]
+        rows = tuple(rows[i] for i in city_idx)
+    if sector_idx is not None:
+        values = values[:, sector_idx]
+        cols = tuple(cols[j] for j in sector_idx)
+    row_axis, col_axis = "city", "sector"
+    if axis == "sector":
+        values, rows, cols = values.T, cols, rows
+        row_axis, col_axis = col_axis, row_axis
+
+    meta = {"rowAxis": row_axis, "colAxis": col_axis, "version": snap.version, "contentHash": snap.content_hash}
+    if fmt == "bin":
+        return encode_binary(values, rows, cols, meta)
+    if fmt == "csv":
+        return encode_csv(values, rows, cols, "Sektor" if row_axis == "sector" else "Sehir", precision)
+    return encode_json(values, rows, cols, meta, precision)
+
+
+def _resolve_many(names: Optional[List[str]], find, label: str) -> Optional[List[int]]:
+    if not names:
+        return None
+    idx = [find(n) for n in names]
+    missing = [n for n, i in zip(names, idx) if i is None]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Bulunamayan {label}: {', '.join(missing)}")
+    return idx
+
+
+@app.get("/api/skyline", response_model=MultiSectorResponse, tags=["scoring"])
+def multi_sector_skyline(
+    request: Request,
+    response: Response,
+    sector: List[str] = Query(..., description="Sektörler (tekrarlanabilir): ?sector=Lojistik&sector=Sanayi"),
+    weight: Optional[List[float]] = Query(None, description="Sektör sırasıyla ağırlıklar (opsiyonel; yoksa eşit)"),
+    topn: int = Query(10, ge=1, le=81, description="Toplu sıralamada döndürülecek il sayısı"),
+):
+    """
+    Seçilen sektörlerde Pareto-optimal iller (skyline) ve ağırlıklı ortalama puana göre toplu sıralama.
+    """
+    snap = get_snapshot()
+    engine = snap.engine
+    etag, not_modified = conditional_get(snap, request)
+    if not_modified is not None:
+        return not_modified
+
+    cols = _resolve_many(sector, engine.find_sector, "sektörler")
+    if len(set(cols)) != len(cols):
+        raise HTTPException(status_code=400, detail="Aynı sektör birden fazla kez verildi")
+    if weight is not None and len(weight) != len(cols):
+        raise HTTPException(status_code=400, detail=f"{len(cols)} sektör için {len(weight)} ağırlık verildi")
+
+    points = engine.scores[:, cols]
+    try:
+        total, w = aggregate_scores(points, weight)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    on_skyline = skyline_mask(points)
+    order = descending_order(total)
+    names = [engine.sector_names[j] for j in cols]
+    response.headers.update(cache_headers(etag))
+
+    def entry(rank: int, i: int) -> MultiSectorEntry:
+        return MultiSectorEntry(
+            rank=rank,
+            city=engine.city_names[i],
+            score=round(float(total[i]), 1),
+            onSkyline=bool(on_skyline[i]),
+            scoresBySector=_round_scores(dict(zip(names, points[i].tolist()))),
+        )
+
+    ranked = list(enumerate(order.tolist(), 1))
+    return MultiSectorResponse(
+        version=snap.version,
+        sectors=names,
+        weights={name: round(float(x), 4) for name, x in zip(names, w)},
+        skyline=[entry(rank, i) for rank, i in ranked if on_skyline[i]],
+        ranking=[entry(rank, i) for rank, i in ranked[:topn]],
+    )
+
+@app.get("/api/similar", response_model=SimilarCitiesResponse, tags=["scoring"])
+def similar_cities(
+    request: Request,
+    response: Response,
+    city: str = Query(..., description="İl adı"),
+    k: int = Query(5, ge=1, le=80, description="Döndürülecek komşu sayısı"),
+    metric: Literal["cosine", "euclidean"] = Query("cosine", description="Mesafe ölçüsü"),
+    sector: Optional[str] = Query(None, description="Yalnızca bu sektörün kriterleriyle karşılaştır (opsiyonel)"),
+):
+    """
+    Normalize feature vektörlerine göre verilen ile en çok benzeyen k il (yakından uzağa).
+    """
+    snap = get_snapshot()
+    engine = snap.engine
+    etag, not_modified = conditional_get(snap, request)
+    if not_modified is not None:
+        return not_modified
+
+    city_idx = engine.find_city(city)
+    if city_idx is None:
+        raise HTTPException(status_code=404, detail=f"'{city}' şehri için veri bulunamadı")
+    sector_idx = None
+    if sector is not None:
+        sector_idx = engine.find_sector(sector)
+        if sector_idx is None:
+            raise HTTPException(status_code=404, detail=f"'{sector}' sektörü için veri bulunamadı")
+
+    index = neighbor_index(snap, metric, sector_idx)
+    order, distances = index.neighbors(city_idx, k)
+    response.headers.update(cache_headers(etag))
+    return SimilarCitiesResponse(
+        city=engine.city_names[city_idx],
+        metric=metric,
+        sector=engine.sector_names[sector_idx] if sector_idx is not None else None,
+        version=snap.version,
+        criteria=[snap.feature_cols[c] for c in index.columns],
+        neighbors=[
+            SimilarCity(rank=rank, city=engine.city_names[i], distance=round(d, 4))
+            for rank, (i, d) in enumerate(zip(order.tolist(), distances.tolist()), 1)
+        ],
+    )
+
+@app.get("/api/matrix", tags=["scoring"])
+def score_matrix_full(
+    request: Request,
+    axis: Literal["sector", "city"] = Query("sector", description="Satır ekseni: sector → sektör × il, city → il × sektör"),
+    sector: Optional[List[str]] = Query(None, description="Yalnızca bu sektörler (tekrarlanabilir)"),
+    city: Optional[List[str]] = Query(None, description="Yalnızca bu iller (tekrarlanabilir)"),
+    format: Optional[Literal["json", "bin", "csv"]] = Query(None, description="Accept başlığı yerine açık format seçimi"),
+    precision: int = Query(1, ge=0, le=6, description="JSON/CSV için ondalık basamak"),
+):
+    """
+    Tüm skor matrisi. Format Accept başlığına göre seçilir:
+    - application/json (varsayılan): {rows, cols, values: [[...]]}
+    - application/vnd.ecominds.matrix | application/octet-stream: float32 LE ikili tampon (bkz. matrix_format.py)
+    - text/csv
+    """
+    snap = get_snapshot()
+    engine = snap.engine
+    fmt = format or negotiate_format(request.headers.get("accept"))
+    etag, not_modified = conditional_get(snap, request, fmt)
+    if not_modified is not None:
+        return not_modified
+
+    city_idx = _resolve_many(city, engine.find_city, "iller")
+    sector_idx = _resolve_many(sector, engine.find_sector, "sektörler")
+
+    if city_idx is None and sector_idx is None:
+        # Filtresiz matris snapshot başına bir kez kodlanır
+        body = snap.derived(
+            ("matrix", axis, fmt, precision),
+            lambda s: _encode_matrix(s, axis, fmt, precision, None, None),
+        )
+    else:
+        body = _encode_matrix(snap, axis, fmt, precision, city_idx, sector_idx)
+
+    media_type = FORMATS[fmt] + ("; charset=utf-8" if fmt == "csv" else "")
+    return Response(content=body, media_type=media_type, headers={"Vary": "Accept", **cache_headers(etag)})
+
+@app.get("/api/regions", response_model=RegionsResponse, tags=["scoring"])
+def regional_scores(
+    request: Request,
+    response: Response,
+    level: RegionLevel = Query("region", description="region: 7 coğrafi bölge, nuts1: İBBS Düzey-1, nuts2: İBBS Düzey-2"),
+    sector: Optional[List[str]] = Query(None, description="Sektörler (tekrarlanabilir; yoksa tümü)"),
+):
+    """
+    Bölge başına her sektör için ortalama, medyan, min, max ve nüfus ağırlıklı ortalama puan.
+    """
+    snap = get_snapshot()
+    engine = snap.engine
+    etag, not_modified = conditional_get(snap, request)
+    if not_modified is not None:
+        return not_modified
+
+    cols = _resolve_many(sector, engine.find_sector, "sektörler") or list(range(engine.n_sectors))
+    stats = region_stats(snap, level)
+    index = stats.index
+    names = [engine.sector_names[j] for j in cols]
+    response.headers.update(cache_headers(etag))
+
+    regions = []
+    for g, row in enumerate(stats_rows(stats, cols)):
+        per_sector = zip(*(row[name] for name in REGION_STATS))
+        regions.append(RegionEntry(
+            region=index.names[g],
+            cities=[engine.city_names[i] for i in index.members(g).tolist()],
+            population=int(stats.population[g]),
+            sectors={
+                name: RegionScoreStats(**dict(zip(REGION_STATS, values)))
+                for name, values in zip(names, per_sector)
+            },
+        ))
+    return RegionsResponse(
+        version=snap.version,
+        level=level,
+        sectors=names,
+        regions=regions,
+        unmatched=list(index.unmatched),
+    )
+
+@app.get("/api/export", tags=["scoring"])
+def export_scores(
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson (satır başına JSON) ya da csv"),
+    sector: Optional[List[str]] = Query(None, description="Yalnızca bu sektörler (tekrarlanabilir)"),
+    city: Optional[List[str]] = Query(None, description="Yalnızca bu iller (tekrarlanabilir)"),
+    contributions: bool = Query(False, description="Kriter katkılarını da ekle"),
+    precision: int = Query(1, ge=0, le=6, description="Puan ondalık basamağı"),
+):
+    """
+    Tüm (il, sektör) puanları ve sıraları, isteğe bağlı kriter katkılarıyla; gövde akışla üretilir.
+    """
+    snap = get_snapshot()
+    engine = snap.engine
+    etag, not_modified = conditional_get(snap, request)
+    if not_modified is not None:
+        return not_modified
+
+    # İsim hataları akış başlamadan 404 olarak dönsün
+    city_idx = _resolve_many(city, engine.find_city, "iller")
+    sector_idx = _resolve_many(sector, engine.find_sector, "sektörler")
+
+    suffix = "_katkilar" if contributions else ""
+    return StreamingResponse(
+        stream_rows(snap, format, sector_idx, city_idx, contributions, precision),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="skorlar{suffix}_v{snap.version}.{format}"',
+            **cache_headers(etag),
+        },
+    )
+
+# ---- İsteğe bağlı profil (PROFILING_ENABLED + X-Profile başlığı) -----------
+
+if PROFILING_ENABLED:
+    from . import profiling
+
+    profiling.install(app)
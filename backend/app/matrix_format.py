@@ -0,0 +1,140 @@
+"""
+matrix_format.py
+- Skor matrisini JSON (kolonsal), yoğun float32 ikili tampon ve CSV olarak kodlar
+- İkili format tarayıcıda tek kopyasız Float32Array görünümüyle okunabilir
+
+İkili düzen (tüm tamsayılar little-endian):
+    0   4s   magic  b"ECMX"
+    4   u16  format sürümü (1)
+    6   u16  bayraklar (0)
+    8   u32  satır sayısı (R)
+    12  u32  kolon sayısı (C)
+    16  u32  başlık uzunluğu (H, bayt)
+    20  H    UTF-8 JSON başlık: {"rows": [...], "cols": [...], "rowAxis", "colAxis", "version", "contentHash"}
+    ..       0–3 bayt dolgu (veri 4 bayt hizalı başlasın)
+    ..  R×C  float32 LE, satır öncelikli
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import struct
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+# ---------------------------------------------------------------------------
+
+MAGIC = b"ECMX"
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<4sHHIII")
+
+MEDIA_JSON = "application/json"
+MEDIA_BINARY = "application/vnd.ecominds.matrix"
+MEDIA_OCTET = "application/octet-stream"
+MEDIA_CSV = "text/csv"
+
+# format adı → yanıt media type
+FORMATS: Dict[str, str] = {
+    "json": MEDIA_JSON,
+    "bin": MEDIA_BINARY,
+    "csv": MEDIA_CSV,
+}
+
+
+def negotiate_format(accept: str | None) -> str:
+    """
+    Accept başlığından format seçer (q değerlerine göre). q=0 "kabul edilmez" demektir, aday olmaz;
+    kabul edilebilir eşleşme kalmazsa json.
+    """
+    best, best_q = "json", 0.0
+    for part in (accept or "").split(","):
+        fields = [f.strip() for f in part.split(";")]
+        media = fields[0].lower()
+        q = 1.0
+        for f in fields[1:]:
+            if f.startswith("q="):
+                try:
+                    q = float(f[2:])
+                except ValueError:
+                    q = 0.0
+        if media in (MEDIA_BINARY, MEDIA_OCTET):
+            fmt = "bin"
+        elif media == MEDIA_CSV:
+            fmt = "csv"
+        elif media in (MEDIA_JSON, "*/*", "application/*"):
+            fmt = "json"
+        else:
+            continue
+        if q <= 0:
+            continue
+        if q > best_q:
+            best, best_q = fmt, q
+    return best
+
+
+def encode_binary(values: np.ndarray, rows: Sequence[str], cols: Sequence[str], meta: Dict[str, Any]) -> bytes:
+    header = json.dumps(
+        {"rows": list(rows), "cols": list(cols), **meta},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    pad = (-(_PREFIX.size + len(header))) % 4
+    data = np.ascontiguousarray(values, dtype="<f4")
+    prefix = _PREFIX.pack(MAGIC, FORMAT_VERSION, 0, data.shape[0], data.shape[1], len(header))
+    return b"".join((prefix, header, b"\0" * pad, data.tobytes()))
+
+
+def decode_binary(buf: bytes) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    encode_binary'nin tersi (Python istemcileri ve doğrulama için).
+    """
+    magic, version, _flags, n_rows, n_cols, header_len = _PREFIX.unpack_from(buf, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Geçersiz matris tamponu")
+    start = _PREFIX.size
+    header = json.loads(bytes(buf[start:start + header_len]).decode("utf-8"))
+    offset = start + header_len
+    offset += (-offset) % 4
+    values = np.frombuffer(buf, dtype="<f4", count=n_rows * n_cols, offset=offset).reshape(n_rows, n_cols)
+    return values, header
+
+
+def encode_json(values: np.ndarray, rows: Sequence[str], cols: Sequence[str], meta: Dict[str, Any], precision: int) -> bytes:
+    """
+    Kolonsal JSON: isimler bir kez, değerler iç içe listeler halinde.
+    """
+    payload = {
+        **meta,
+        "rows": list(rows),
+        "cols": list(cols),
+        "values": np.round(values, precision).tolist(),
+    }
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_csv(values: np.ndarray, rows: Sequence[str], cols: Sequence[str], row_label: str, precision: int) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow([row_label, *cols])
+    fmt = f"{{:.{precision}f}}"
+    for name, row in zip(rows, values.tolist()):
+        writer.writerow([name, *(fmt.format(v) for v in row)])
+    return buf.getvalue().encode("utf-8")
+
+
+__all__ = [
+    "MAGIC",
+    "FORMAT_VERSION",
+    "FORMATS",
+    "MEDIA_JSON",
+    "MEDIA_BINARY",
+    "MEDIA_CSV",
+    "negotiate_format",
+    "encode_binary",
+    "decode_binary",
+    "encode_json",
+    "encode_csv",
+]
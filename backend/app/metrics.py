@@ -0,0 +1,286 @@
+"""
+metrics.py
+- Prometheus metin formatında (0.0.4) metrikler; harici kütüphane gerektirmez
+- Sayaç / histogram serileri etiket demeti başına bir kez oluşur, kayıt kilitli küçük bir artıştır
+- Gauge'lar (snapshot sürümü/yaşı, cache sayaçları) yalnızca /metrics okunurken hesaplanır;
+  istek yolunda ek iş yoktur
+- MetricsMiddleware: route şablonu bazında istek sayısı, gecikme histogramı ve hata sayısı
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from .cache import all_caches
+
+# ---------------------------------------------------------------------------
+
+PREFIX = "ecominds"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Saniye; API istekleri ms mertebesinde, snapshot kurulumu saniyeler sürebilir
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+BUILD_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+Labels = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _fmt_value(v: float) -> str:
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    if v == int(v) and abs(v) < 1e15:
+        return str(int(v))
+    return repr(float(v))
+
+
+class _Family:
+    kind = "untyped"
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = f"{PREFIX}_{name}"
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{_fmt_labels(labels)} {_fmt_value(value)}")
+        return lines
+
+
+class Counter(_Family):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, doc, labelnames)
+        # Etiketsiz sayaç ilk olaydan önce de 0 olarak görünsün
+        self._values: Dict[Labels, float] = {} if self.labelnames else {(): 0.0}
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield self.name, dict(zip(self.labelnames, labels)), value
+
+
+class Histogram(_Family):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        doc: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, doc, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # etiketler → [kova sayıları..., +Inf kovası, toplam süre]
+        self._series: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            series[i] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, labels: Labels = ()) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, labels)
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for labels, series in items:
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative += count
+                le = "+Inf" if math.isinf(bound) else repr(bound)
+                yield f"{self.name}_bucket", {**base, "le": le}, cumulative
+            yield f"{self.name}_sum", base, series[-1]
+            yield f"{self.name}_count", base, cumulative
+
+
+class GaugeCallback(_Family):
+    """
+    Değeri okuma anında hesaplanan gauge; fn → [(etiketler, değer), ...].
+    """
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        doc: str,
+        labelnames: Sequence[str],
+        fn: Callable[[], Iterable[Tuple[Labels, float]]],
+        kind: str = "gauge",
+    ) -> None:
+        super().__init__(name, doc, labelnames)
+        self.kind = kind
+        self._fn = fn
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self._fn():
+            yield self.name, dict(zip(self.labelnames, labels)), float(value)
+
+
+_REGISTRY: List[_Family] = []
+
+
+def register(family: _Family) -> _Family:
+    _REGISTRY.append(family)
+    return family
+
+
+def render() -> str:
+    lines: List[str] = []
+    for family in list(_REGISTRY):
+        lines.extend(family.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---- Uygulama metrikleri ---------------------------------------------------
+
+HTTP_REQUESTS = register(Counter(
+    "http_requests_total", "HTTP istek sayısı (route şablonu, yöntem, durum kodu)",
+    ("method", "route", "status"),
+))
+HTTP_ERRORS = register(Counter(
+    "http_request_errors_total", "4xx/5xx yanıtlar ve yakalanmamış hatalar",
+    ("method", "route", "kind"),
+))
+HTTP_LATENCY = register(Histogram(
+    "http_request_duration_seconds", "İstek süresi (yanıt gövdesi gönderilene kadar)",
+    ("method", "route"),
+))
+DATA_LOAD_SECONDS = register(Histogram(
+    "data_load_seconds", "Veri yükleme aşamaları: read, parse, validate, compiled",
+    ("stage",), BUILD_BUCKETS,
+))
+SNAPSHOT_BUILD_SECONDS = register(Histogram(
+    "snapshot_build_seconds", "Snapshot kurulumu (yükleme + skorlama + türetilmiş tablolar)",
+    (), BUILD_BUCKETS,
+))
+SNAPSHOT_ERRORS = register(Counter(
+    "snapshot_rebuild_errors_total", "Başarısız snapshot yeniden kurulumları",
+))
+SCORING_SECONDS = register(Histogram(
+    "scoring_seconds", "Skorlama işlemleri: score_tables, contributions, whatif, batch, montecarlo",
+    ("op",),
+))
+
+
+
+def _cache_samples(field: str) -> Callable[[], List[Tuple[Labels, float]]]:
+    def collect() -> List[Tuple[Labels, float]]:
+        out = []
+        for cache in all_caches():
+            value = getattr(cache.stats(), field)
+            if value is not None:
+                out.append(((cache.name,), value))
+        return out
+    return collect
+
+
+register(GaugeCallback("cache_hits_total", "Önbellek isabetleri", ("cache",), _cache_samples("hits"), kind="counter"))
+register(GaugeCallback("cache_misses_total", "Önbellek ıskaları", ("cache",), _cache_samples("misses"), kind="counter"))
+register(GaugeCallback("cache_entries", "Önbellekteki kayıt sayısı", ("cache",), _cache_samples("size")))
+register(GaugeCallback("cache_max_entries", "Önbellek kapasitesi", ("cache",), _cache_samples("maxsize")))
+
+
+class MetricsMiddleware:
+    """
+    Saf ASGI middleware. Route etiketi eşleşen route'un şablonudur (/api/mod1),
+    böylece sorgu parametreleri ve isimler kardinaliteyi büyütmez.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        t0 = time.perf_counter()
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        raised = False
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            raised = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - t0
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            HTTP_LATENCY.observe(elapsed, (method, route_label))
+            HTTP_REQUESTS.inc((method, route_label, str(status)))
+            if raised:
+                HTTP_ERRORS.inc((method, route_label, "exception"))
+            elif status >= 500:
+                HTTP_ERRORS.inc((method, route_label, "5xx"))
+            elif status >= 400:
+                HTTP_ERRORS.inc((method, route_label, "4xx"))
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "Counter",
+    "Histogram",
+    "GaugeCallback",
+    "register",
+    "render",
+    "HTTP_REQUESTS",
+    "HTTP_ERRORS",
+    "HTTP_LATENCY",
+    "DATA_LOAD_SECONDS",
+    "SNAPSHOT_BUILD_SECONDS",
+    "SNAPSHOT_ERRORS",
+    "SCORING_SECONDS",
+    "MetricsMiddleware",
+]
@@ -0,0 +1,151 @@
+"""
+prerender.py
+- Sıcak GET yanıtları (ör. her sektör × topn, her il × topn) snapshot başına bir kez JSON bayta çevrilir
+- Yanlarında gzip ve (brotli kuruluysa) br varyantları tutulur; handler Accept-Encoding'e göre baytı aynen döner,
+  istek yolunda pydantic doğrulaması / JSON kodlama / sıkıştırma kalmaz
+- Snapshot yayınlanınca tüm anahtarlar arka plan thread'inde hazırlanır; henüz hazır olmayan anahtar ilk
+  istekte üretilip saklanır (aynı anahtar iki kez üretilebilir, ilk yazılan kalır)
+"""
+
+from __future__ import annotations
+
+import gzip
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .cache import CacheCounter
+from .log import get_logger
+from .snapshot import DataSnapshot, get_store
+
+try:  # opsiyonel bağımlılık: yoksa yalnızca gzip sunulur
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+
+# Bir kez sıkıştırılıp defalarca sunulduğu için yüksek seviyeler; brotli 11 yanıt başına fazla yavaş
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+# Tercih sırası (eşit q değerinde önce gelen seçilir)
+ENCODINGS: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+@dataclass(frozen=True)
+class Rendered:
+    identity: bytes
+    gzip: bytes
+    br: Optional[bytes] = None
+
+    def body(self, encoding: str) -> bytes:
+        if encoding == "br" and self.br is not None:
+            return self.br
+        if encoding == "gzip":
+            return self.gzip
+        return self.identity
+
+
+def compress(body: bytes) -> Rendered:
+    return Rendered(
+        identity=body,
+        # mtime=0: aynı içerik → aynı bayt (ETag ve CDN için)
+        gzip=gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+        br=brotli.compress(body, quality=BROTLI_QUALITY) if brotli is not None else None,
+    )
+
+
+_STATS = CacheCounter("prerendered", size=lambda: _rendered_size())
+
+
+class Prerendered:
+    """
+    render(snap, key) → JSON baytları; keys(snap) → ısıtılacak tüm anahtarlar.
+    Baytlar snapshot'ın derived deposunda tutulur ve snapshot ile birlikte atılır.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        render: Callable[[DataSnapshot, Hashable], bytes],
+        keys: Callable[[DataSnapshot], Iterable[Hashable]],
+    ) -> None:
+        self.name = name
+        self._render = render
+        self._keys = keys
+
+    def _store(self, snap: DataSnapshot) -> Dict[Hashable, Rendered]:
+        return snap.derived(("prerendered", self.name), lambda s: {})
+
+    def get(self, snap: DataSnapshot, key: Hashable) -> Rendered:
+        store = self._store(snap)
+        rendered = store.get(key)
+        if rendered is not None:
+            _STATS.hit()
+            return rendered
+        _STATS.miss()
+        return store.setdefault(key, compress(self._render(snap, key)))
+
+    def warm(self, snap: DataSnapshot) -> int:
+        store = self._store(snap)
+        count = 0
+        for key in self._keys(snap):
+            if key not in store:
+                store.setdefault(key, compress(self._render(snap, key)))
+                count += 1
+        return count
+
+
+_REGISTRY: List[Prerendered] = []
+
+
+def register(
+    name: str,
+    render: Callable[[DataSnapshot, Hashable], bytes],
+    keys: Callable[[DataSnapshot], Iterable[Hashable]],
+) -> Prerendered:
+    cache = Prerendered(name, render, keys)
+    _REGISTRY.append(cache)
+    return cache
+
+
+def _rendered_size() -> int:
+    snap = get_store().current
+    if snap is None:
+        return 0
+    return sum(len(snap._derived.get(("prerendered", c.name), ())) for c in _REGISTRY)
+
+
+def warm_all(snap: DataSnapshot) -> None:
+    t0 = time.perf_counter()
+    try:
+        count = sum(cache.warm(snap) for cache in _REGISTRY)
+    except Exception:
+        # Eksik kalan anahtarlar ilk istekte üretilir; ısıtma hatası sunumu durdurmaz
+        logger.exception(f"Snapshot v{snap.version} yanıtları önceden hazırlanamadı")
+        return
+    logger.info(
+        f"Snapshot v{snap.version}: {count} yanıt önceden hazırlandı ({time.perf_counter() - t0:.2f} sn)",
+        extra={"version": snap.version, "encodings": ",".join(ENCODINGS)},
+    )
+
+
+def warm_in_background(snap: DataSnapshot) -> threading.Thread:
+    thread = threading.Thread(target=warm_all, args=(snap,), name="prerender-warm", daemon=True)
+    thread.start()
+    return thread
+
+
+__all__ = [
+    "ENCODINGS",
+    "Rendered",
+    "Prerendered",
+    "compress",
+    "register",
+    "warm_all",
+    "warm_in_background",
+]
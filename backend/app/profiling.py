@@ -0,0 +1,228 @@
+"""
+profiling.py
+- İsteğe bağlı, istek bazlı deterministik profil: PROFILING_ENABLED açıkken `X-Profile: 1` başlıklı istekler
+- Çağrı yığınları tam olarak kaydedilir ve flamegraph uyumlu "folded stacks" dosyası yazılır
+  (satır başına `modül.fonksiyon;modül.fonksiyon;... <öz süre µs>`; flamegraph.pl, speedscope, inferno okur)
+- Kapsam: event loop thread'i (routing, doğrulama, serileştirme) + sync handler'ın çalıştığı worker thread;
+  loop thread'inde await beklemeleri (epoll) ve aynı anda işlenen diğer istekler de görünebilir
+- Bayrak kapalıyken hiçbir şey kurulmaz; açıkken başlıksız istekler yalnızca bir başlık taraması öder
+
+Dosya adı yanıtta `X-Profile-File` başlığıyla döner; dosyalar PROFILE_DIR altında tutulur.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .config import PROFILE_DIR, PROFILE_MAX_FILES
+
+# ---------------------------------------------------------------------------
+
+HEADER = b"x-profile"
+RESULT_HEADER = b"x-profile-file"
+SKIPPED_HEADER = b"x-profile-skipped"
+SUFFIX = ".folded"
+
+_SESSION: contextvars.ContextVar[Optional["ProfileSession"]] = contextvars.ContextVar("profile_session", default=None)
+
+# Event loop thread'inde sys.setprofile tekil; aynı anda tek profil oturumu
+_ACTIVE = threading.Lock()
+
+
+def _frame_name(frame) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{frame.f_code.co_qualname}"
+
+
+def _c_name(fn: Any) -> str:
+    module = getattr(fn, "__module__", None) or type(getattr(fn, "__self__", None)).__name__
+    return f"{module}.{getattr(fn, '__qualname__', repr(fn))}"
+
+
+class _ThreadTracer:
+    """
+    sys.setprofile fonksiyonu. Yığını kendisi tutar; her çıkışta çerçevenin öz süresini
+    (alt çağrılar hariç) yığın yoluna ekler. Kurulduğu çerçeveden önceki dönüşler yok sayılır.
+    """
+
+    def __init__(self, folded: Dict[str, float]) -> None:
+        self.folded = folded
+        # (isim, başlangıç, alt çağrılarda geçen süre)
+        self.stack: List[List[Any]] = []
+
+    def __call__(self, frame, event: str, arg) -> None:
+        now = time.perf_counter()
+        if event == "call":
+            self.stack.append([_frame_name(frame), now, 0.0])
+        elif event == "c_call":
+            self.stack.append([_c_name(arg), now, 0.0])
+        elif event in ("return", "c_return", "c_exception"):
+            if not self.stack:
+                return
+            path = ";".join(entry[0] for entry in self.stack)
+            name, start, child = self.stack.pop()
+            elapsed = now - start
+            self.folded[path] = self.folded.get(path, 0.0) + (elapsed - child)
+            if self.stack:
+                self.stack[-1][2] += elapsed
+
+    def flush(self) -> None:
+        # Profil kapanırken açık kalan çerçeveler (ör. handler'ın kendisi) de sayılsın
+        now = time.perf_counter()
+        while self.stack:
+            path = ";".join(entry[0] for entry in self.stack)
+            name, start, child = self.stack.pop()
+            elapsed = now - start
+            self.folded[path] = self.folded.get(path, 0.0) + (elapsed - child)
+            if self.stack:
+                self.stack[-1][2] += elapsed
+
+
+class ProfileSession:
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.file_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{label}-{uuid.uuid4().hex[:8]}{SUFFIX}"
+        self.started = time.perf_counter()
+        self._folded: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def trace_thread(self) -> Iterator[None]:
+        """Çağıran thread'i oturum süresince izler (thread başına ayrı yığın)."""
+        local: Dict[str, float] = {}
+        tracer = _ThreadTracer(local)
+        previous = sys.getprofile()
+        sys.setprofile(tracer)
+        try:
+            yield
+        finally:
+            sys.setprofile(previous)
+            tracer.flush()
+            # Her thread flamegraph'ta ayrı bir kök altında görünür
+            root = f"thread:{threading.current_thread().name.replace(' ', '_')}"
+            with self._lock:
+                for path, seconds in local.items():
+                    key = f"{root};{path}"
+                    self._folded[key] = self._folded.get(key, 0.0) + seconds
+
+    def folded_lines(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._folded.items())
+        return [f"{path} {round(seconds * 1e6)}" for path, seconds in items if seconds * 1e6 >= 0.5]
+
+    def write(self, directory: Path = PROFILE_DIR) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / self.file_name
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text("\n".join(self.folded_lines()) + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+        _prune(directory)
+        return path
+
+
+def _prune(directory: Path, keep: int = PROFILE_MAX_FILES) -> None:
+    files = sorted(directory.glob(f"*{SUFFIX}"), key=lambda p: p.stat().st_mtime)
+    for old in files[:max(0, len(files) - keep)]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+
+def _label(path: str) -> str:
+    slug = "".join(ch if ch.isalnum() else "-" for ch in path.strip("/"))
+    return slug[:40] or "root"
+
+
+def _header_value(scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value
+    return None
+
+
+# ---- ASGI middleware + sync handler sarmalayıcı ----------------------------
+
+class ProfilingMiddleware:
+    """
+    `X-Profile` başlığı 1/true ise isteği profiller. Başka bir profil sürüyorsa istek
+    profilsiz sunulur ve `X-Profile-Skipped: busy` döner.
+    """
+
+    def __init__(self, app, directory: Path = PROFILE_DIR) -> None:
+        self.app = app
+        self.directory = Path(directory)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        flag = _header_value(scope, HEADER)
+        if flag is None or flag.lower() not in (b"1", b"true", b"yes", b"on"):
+            await self.app(scope, receive, send)
+            return
+
+        if not _ACTIVE.acquire(blocking=False):
+            await self.app(scope, receive, _add_header(send, SKIPPED_HEADER, b"busy"))
+            return
+        try:
+            session = ProfileSession(_label(scope.get("path", "")))
+            token = _SESSION.set(session)
+            try:
+                with session.trace_thread():
+                    await self.app(scope, receive, _add_header(send, RESULT_HEADER, session.file_name.encode("ascii")))
+            finally:
+                _SESSION.reset(token)
+            session.write(self.directory)
+        finally:
+            _ACTIVE.release()
+
+
+def _add_header(send, name: bytes, value: bytes):
+    async def wrapped(message) -> None:
+        if message["type"] == "http.response.start":
+            message = {**message, "headers": [*message.get("headers", ()), (name, value)]}
+        await send(message)
+    return wrapped
+
+
+def _wrap_sync(call: Callable[..., Any]) -> Callable[..., Any]:
+    def profiled_call(**values):
+        session = _SESSION.get()
+        if session is None:
+            return call(**values)
+        # Context, worker thread'e kopyalandığı için oturum burada da görünür
+        with session.trace_thread():
+            return call(**values)
+    profiled_call.__wrapped__ = call
+    return profiled_call
+
+
+def install(app, directory: Path = PROFILE_DIR) -> None:
+    """
+    Middleware'i ekler ve sync endpoint'leri (threadpool'da koşanlar) sarar.
+    Async endpoint'ler zaten event loop thread'inde izlenir. Tüm route'lar tanımlandıktan sonra çağrılmalı.
+    """
+    import asyncio
+
+    from fastapi.routing import APIRoute
+
+    for route in app.routes:
+        if isinstance(route, APIRoute) and not asyncio.iscoroutinefunction(route.dependant.call):
+            route.dependant.call = _wrap_sync(route.dependant.call)
+    app.add_middleware(ProfilingMiddleware, directory=directory)
+
+
+__all__ = [
+    "ProfileSession",
+    "ProfilingMiddleware",
+    "install",
+]
@@ -0,0 +1,85 @@
+"""
+ranking.py
+- Skor vektörlerinden Top-N / Bottom-N / tam sıralama üretir
+- Eşitlik kuralı her yerde aynı: eşit puanda listede önce gelen (küçük indeks) üstte yer alır
+- Top-N / Bottom-N tam sıralama yapmadan np.argpartition ile kısmi seçimle bulunur
+- Matrisin kolon bazlı tam sıralamaları snapshot başına bir kez hesaplanır (engine.py)
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+# ---------------------------------------------------------------------------
+
+def descending_order(values: np.ndarray) -> np.ndarray:
+    """
+    Tam sıralama: azalan puan, eşitlikte artan indeks.
+    """
+    return np.argsort(-np.asarray(values), kind="stable")
+
+
+def column_orders(scores: np.ndarray) -> np.ndarray:
+    """
+    (R, C) matrisin her kolonu için descending_order; sonuç (C, R).
+    orders[j, k] = j. kolonda k. sıradaki satır indeksi.
+    """
+    return np.argsort(-np.asarray(scores).T, axis=1, kind="stable")
+
+
+def rank_positions(orders: np.ndarray) -> np.ndarray:
+    """
+    orders'ın tersi (1 tabanlı): ranks[j, i] = i satırının j. kolondaki sırası.
+    """
+    ranks = np.empty_like(orders)
+    rows = np.arange(orders.shape[0])[:, None]
+    ranks[rows, orders] = np.arange(1, orders.shape[1] + 1)
+    return ranks
+
+
+def select_top(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    En yüksek n değerin indeksleri, descending_order(values)[:n] ile birebir aynı.
+    Önce argpartition ile n. değer bulunur; yalnızca o eşiğin üstündekiler sıralanır.
+    """
+    values = np.asarray(values)
+    size = values.shape[0]
+    n = min(max(n, 0), size)
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+    if n < size:
+        neg = -values
+        kth = neg[np.argpartition(neg, n - 1)[n - 1]]
+        cand = np.flatnonzero(neg <= kth)
+    else:
+        cand = np.arange(size)
+    order = np.lexsort((cand, -values[cand]))
+    return cand[order[:n]]
+
+
+def select_bottom(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    En düşük n değerin indeksleri, en kötüden başlayarak: descending_order(values)[::-1][:n].
+    Eşitlikte büyük indeks daha alttadır (tam sıralamayla tutarlı).
+    """
+    values = np.asarray(values)
+    size = values.shape[0]
+    n = min(max(n, 0), size)
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+    if n < size:
+        kth = values[np.argpartition(values, n - 1)[n - 1]]
+        cand = np.flatnonzero(values <= kth)
+    else:
+        cand = np.arange(size)
+    order = np.lexsort((-cand, values[cand]))
+    return cand[order[:n]]
+
+
+__all__ = [
+    "descending_order",
+    "column_orders",
+    "rank_positions",
+    "select_top",
+    "select_bottom",
+]
@@ -0,0 +1,187 @@
+"""
+regions.py
+- Paketle gelen il → coğrafi bölge / NUTS-1 / NUTS-2 / nüfus eşlemesi (data/Il_Bolge.csv, REGIONS_FILE)
+- İl adları config.canonicalize_city_name ile engine'deki adlarla eşlenir; eşleşmeyen il gruba girmez, raporlanır
+- Bölge başına her sektör için ortalama, medyan, min, max ve nüfus ağırlıklı ortalama puan
+- Grup indeksleri (illerin bölgeye göre sıralı dizisi + segment başlangıçları) snapshot başına bir kez kurulur;
+  toplama skor matrisi üzerinde segmentli indirgemedir (np.*.reduceat), istek başına groupby yoktur
+"""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Literal, Sequence, Tuple
+
+import numpy as np
+
+from .config import REGIONS_FILE, canonicalize_city_name
+from .log import get_logger
+from .snapshot import DataSnapshot
+
+logger = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+
+Level = Literal["region", "nuts1", "nuts2"]
+# Seviye → CSV kolonu
+LEVELS: Dict[str, str] = {"region": "Bolge", "nuts1": "NUTS1", "nuts2": "NUTS2"}
+
+STATS: Tuple[str, ...] = ("mean", "median", "min", "max", "weighted")
+
+
+@dataclass(frozen=True)
+class ProvinceRegion:
+    city: str        # kanonik il adı
+    region: str      # coğrafi bölge (7)
+    nuts1: str       # İBBS Düzey-1 (12)
+    nuts2: str       # İBBS Düzey-2 (26)
+    population: int
+
+
+def load_mapping(path: Path = REGIONS_FILE) -> Dict[str, ProvinceRegion]:
+    """Kanonik il adı → bölge bilgisi."""
+    mapping: Dict[str, ProvinceRegion] = {}
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            city = canonicalize_city_name(row["Il"])
+            mapping[city] = ProvinceRegion(
+                city=city,
+                region=row["Bolge"].strip(),
+                nuts1=row["NUTS1"].strip(),
+                nuts2=row["NUTS2"].strip(),
+                population=int(row["Nufus"]),
+            )
+    return mapping
+
+
+@dataclass(frozen=True)
+class GroupIndex:
+    """
+    order: gruplu illerin engine indeksleri, grup sırasıyla (grup içinde engine sırası)
+    starts / counts: order içinde her grubun segment başlangıcı ve uzunluğu
+    population: order sırasıyla il nüfusları
+    unmatched: eşlemede bulunamayan iller (hiçbir gruba girmez)
+    """
+    level: str
+    names: Tuple[str, ...]
+    order: np.ndarray
+    starts: np.ndarray
+    counts: np.ndarray
+    population: np.ndarray
+    unmatched: Tuple[str, ...]
+
+    def members(self, g: int) -> np.ndarray:
+        return self.order[self.starts[g]:self.starts[g] + self.counts[g]]
+
+
+def build_groups(city_names: Sequence[str], mapping: Dict[str, ProvinceRegion], level: str) -> GroupIndex:
+    if level not in LEVELS:
+        raise ValueError(f"Geçersiz bölge seviyesi: {level}")
+    attr = "region" if level == "region" else level
+    matched = [i for i, name in enumerate(city_names) if name in mapping]
+    unmatched = tuple(name for name in city_names if name not in mapping)
+    labels = [getattr(mapping[city_names[i]], attr) for i in matched]
+
+    names, group_of = np.unique(np.array(labels, dtype=object), return_inverse=True)
+    perm = np.argsort(group_of, kind="stable")
+    order = np.asarray(matched, dtype=np.intp)[perm]
+    counts = np.bincount(group_of, minlength=len(names))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    population = np.array([mapping[city_names[i]].population for i in order], dtype=np.float64)
+    for arr in (order, starts, counts, population):
+        arr.setflags(write=False)
+    return GroupIndex(
+        level=level,
+        names=tuple(names.tolist()),
+        order=order,
+        starts=starts,
+        counts=counts,
+        population=population,
+        unmatched=unmatched,
+    )
+
+
+@dataclass(frozen=True)
+class RegionStats:
+    """İstatistik dizileri (grup, sektör) biçiminde, 0–100 ölçeğinde."""
+    index: GroupIndex
+    population: np.ndarray  # grup başına toplam nüfus
+    mean: np.ndarray
+    median: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    weighted: np.ndarray
+
+
+def aggregate(scores: np.ndarray, index: GroupIndex) -> RegionStats:
+    """
+    scores: (il, sektör). Gruplu iller segmentlere dizilir, her istatistik tek reduceat çağrısıdır;
+    medyan için değerler segment içinde sıralanıp ortadaki iki eleman okunur.
+    """
+    vals = np.asarray(scores, dtype=np.float64)[index.order]
+    starts, counts = index.starts, index.counts
+    seg = np.repeat(np.arange(len(counts)), counts)
+
+    mean = np.add.reduceat(vals, starts, axis=0) / counts[:, None]
+    pop_total = np.add.reduceat(index.population, starts)
+    weighted = np.add.reduceat(vals * index.population[:, None], starts, axis=0) / pop_total[:, None]
+
+    # Kolon başına önce değere, sonra (kararlı) segmente göre sırala → segment içinde artan değerler
+    by_value = np.argsort(vals, axis=0, kind="stable")
+    by_segment = np.argsort(seg[by_value], axis=0, kind="stable")
+    sorted_vals = np.take_along_axis(vals, np.take_along_axis(by_value, by_segment, axis=0), axis=0)
+    lo = starts + (counts - 1) // 2
+    hi = starts + counts // 2
+    median = (sorted_vals[lo] + sorted_vals[hi]) / 2.0
+
+    out = dict(
+        mean=mean,
+        median=median,
+        min=np.minimum.reduceat(vals, starts, axis=0),
+        max=np.maximum.reduceat(vals, starts, axis=0),
+        weighted=weighted,
+    )
+    for arr in (pop_total, *out.values()):
+        arr.setflags(write=False)
+    return RegionStats(index=index, population=pop_total, **out)
+
+
+def region_stats(snapshot: DataSnapshot, level: str = "region") -> RegionStats:
+    """Snapshot'a bağlı bölge istatistikleri (seviye başına bir kez)."""
+    if level not in LEVELS:
+        raise ValueError(f"Geçersiz bölge seviyesi: {level}")
+
+    def factory(snap: DataSnapshot) -> RegionStats:
+        index = build_groups(snap.engine.city_names, load_mapping(), level)
+        if index.unmatched:
+            logger.warning(
+                f"Bölge eşlemesinde bulunamayan iller: {', '.join(index.unmatched)}",
+                extra={"level": level, "version": snap.version},
+            )
+        return aggregate(snap.engine.scores, index)
+
+    return snapshot.derived(("regions", level), factory)
+
+
+def stats_rows(stats: RegionStats, sector_idx: Sequence[int], ndigits: int = 1) -> List[Dict[str, List[float]]]:
+    """Grup başına {istatistik: [seçili sektörlerin değerleri]} (yuvarlanmış, JSON'a hazır)."""
+    cols = list(sector_idx)
+    tables = {name: np.round(getattr(stats, name)[:, cols], ndigits).tolist() for name in STATS}
+    return [{name: tables[name][g] for name in STATS} for g in range(len(stats.index.names))]
+
+
+__all__ = [
+    "Level",
+    "LEVELS",
+    "STATS",
+    "ProvinceRegion",
+    "load_mapping",
+    "GroupIndex",
+    "build_groups",
+    "RegionStats",
+    "aggregate",
+    "region_stats",
+    "stats_rows",
+]
@@ -0,0 +1,171 @@
+"""
+resolver.py
+- İl/sektör adlarını kanonik isme çeviren indeksli çözücü
+- Sırasıyla: birebir → normalize anahtar (+ eşanlamlılar) → kelime başı öneki (en az MIN_PREFIX_LEN karakter)
+  → sınırlı edit mesafesi
+- Veri snapshot'ı başına bir kez kurulur; regex kullanılmaz, özel karakterlerden etkilenmez
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .cache import CacheCounter, register_lru_function
+from .config import CITY_SYNONYMS, normalize_city_key
+
+# ---------------------------------------------------------------------------
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+# Önek eşleşmesi için en az katlanmış karakter: "a" / "te" gibi girdiler ilk adaya sessizce çözülmesin
+MIN_PREFIX_LEN = 3
+
+# Bulanık eşleşme sonuçlarının sınırı (çözücü başına)
+_MEMO_LIMIT = 4096
+
+# Tüm çözücülerin bulanık sonuç memo'ları için ortak sayaç (birebir/anahtar eşleşmesi sayılmaz)
+_MEMO_STATS = CacheCounter("name_resolver_memo", maxsize=_MEMO_LIMIT)
+
+
+def fold_key(text: str) -> str:
+    """
+    Eşleştirme anahtarı: aksansız, küçük harf, harf/rakam dışı her şey tek boşluk.
+    'Konut & İnşaat' → 'konut insaat', 'Çevre / Atık' → 'cevre atik'
+    """
+    return _NON_WORD.sub(" ", normalize_city_key(text)).strip()
+
+
+def _max_distance(n: int) -> int:
+    # 4 karakterden kısa girdilerde hata toleransı yok; 4–6 karakterde tek, daha uzunlarda iki harf hatası
+    if n < 4:
+        return 0
+    return 1 if n <= 6 else 2
+
+
+def bounded_levenshtein(a: str, b: str, limit: int) -> int:
+    """
+    a ile b arasındaki edit mesafesi; limit'i aşacağı anlaşılınca limit+1 döner.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) > len(b):
+        a, b = b, a
+    prev = list(range(len(a) + 1))
+    for j, cb in enumerate(b, 1):
+        cur = [j] + [0] * len(a)
+        row_min = j
+        for i, ca in enumerate(a, 1):
+            cur[i] = min(prev[i] + 1, cur[i - 1] + 1, prev[i - 1] + (ca != cb))
+            if cur[i] < row_min:
+                row_min = cur[i]
+        if row_min > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+class NameResolver:
+    """
+    names[i] için kanonik indeksi bulur.
+    - exact:  isim → indeks
+    - keys:   fold_key(isim) ve eşanlamlılar → indeks
+    - prefix: (kelime-başı sonek, indeks) sıralı listesi; bisect ile önek araması
+    """
+
+    def __init__(self, names: Sequence[str], synonyms: Optional[Mapping[str, str]] = None) -> None:
+        self.names: Tuple[str, ...] = tuple(names)
+        self.exact: Dict[str, int] = {}
+        self.keys: Dict[str, int] = {}
+        for i, name in enumerate(self.names):
+            self.exact.setdefault(name, i)
+            self.keys.setdefault(fold_key(name), i)
+        for alias, canonical in (synonyms or {}).items():
+            i = self.exact.get(canonical)
+            if i is not None:
+                self.keys.setdefault(fold_key(alias), i)
+
+        # "teknoloji yazilim" için hem "teknoloji yazilim" hem "yazilim" indekslenir
+        entries: List[Tuple[str, int]] = []
+        for key, i in self.keys.items():
+            words = key.split(" ")
+            for w in range(len(words)):
+                entries.append((" ".join(words[w:]), i))
+        entries.sort()
+        self._prefix_keys = [k for k, _ in entries]
+        self._prefix_idx = [i for _, i in entries]
+        self._memo: Dict[str, Optional[int]] = {}
+
+    def resolve(self, query: str) -> Optional[int]:
+        if query in self.exact:
+            return self.exact[query]
+        key = fold_key(query or "")
+        if not key:
+            return None
+        i = self.keys.get(key)
+        if i is not None:
+            return i
+        try:
+            i = self._memo[key]
+        except KeyError:
+            _MEMO_STATS.miss()
+        else:
+            _MEMO_STATS.hit()
+            return i
+        i = self._by_prefix(key) if len(key) >= MIN_PREFIX_LEN else None
+        if i is None:
+            i = self._by_distance(key)
+        if len(self._memo) >= _MEMO_LIMIT:
+            self._memo.clear()
+        self._memo[key] = i
+        return i
+
+    def canonical(self, query: str) -> Optional[str]:
+        i = self.resolve(query)
+        return None if i is None else self.names[i]
+
+    def _by_prefix(self, key: str) -> Optional[int]:
+        lo = bisect.bisect_left(self._prefix_keys, key)
+        hi = bisect.bisect_right(self._prefix_keys, key + "￿", lo)
+        if lo == hi:
+            return None
+        # Birden çok aday varsa listede ilk gelen (eski "ilk eşleşme" davranışı)
+        return min(self._prefix_idx[lo:hi])
+
+    def _by_distance(self, key: str) -> Optional[int]:
+        limit = _max_distance(len(key))
+        if limit == 0:
+            return None
+        # Tam anahtarlar ve kelime-başı sonekleri ("teknolji" → "teknoloji yazilim")
+        best, best_d = None, limit + 1
+        for cand, i in zip(self._prefix_keys, self._prefix_idx):
+            bound = min(limit, best_d)
+            d = bounded_levenshtein(key, cand, bound)
+            if d > bound and len(cand) > len(key):
+                # Yazım hatalı önek: "teknolji" ~ "teknoloj(i yazilim)"
+                d = bounded_levenshtein(key, cand[:len(key)], bound)
+            if d < best_d or (d == best_d and best is not None and i < best):
+                best, best_d = i, d
+        return best if best_d <= limit else None
+
+
+@lru_cache(maxsize=16)
+def resolver_for(names: Tuple[str, ...], city_synonyms: bool = False) -> NameResolver:
+    """
+    Aynı isim listesi için tek çözücü (loader yardımcıları DataFrame'den çağırır).
+    """
+    return NameResolver(names, CITY_SYNONYMS if city_synonyms else None)
+
+
+register_lru_function("resolver_for", resolver_for)
+
+
+__all__ = [
+    "MIN_PREFIX_LEN",
+    "NameResolver",
+    "fold_key",
+    "bounded_levenshtein",
+    "resolver_for",
+]
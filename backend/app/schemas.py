@@ -51,7 +51,7 @@ class Contribution(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     kriter: str = Field(..., description="Kriter anahtarı")
-    katkı: float = Field(..., description="0–1 bandında katkı (ağırlık uyg.).")
+    katki: float = Field(..., description="0–1 bandında katkı (ağırlık uyg.).")
     yon: WeightDirection = Field(..., description="Kriter yönü")
     agirlik: float = Field(..., ge=0, le=100, description="Kriter ağırlığı (yüzde)")
     ham_deger: float = Field(..., ge=0, le=1, description="Normalize ham değer (0–1)")
@@ -77,6 +77,7 @@ class Mod1Response(BaseModel):
     sector: str
     scoresByCity: ScoreDict
     top5: List[ScoreEntry]
+    bottom: Optional[List[ScoreEntry]] = None  # bottomn > 0 ise en düşük iller (en kötüden)
     legend: Optional[LegendBreaks] = None  # choropleth eşiği (opsiyonel)
 
 class Mod2Response(BaseModel):
@@ -88,8 +89,272 @@ class Mod2Response(BaseModel):
     city: str
     scoresBySector: ScoreDict
     top5: List[ScoreEntry]
+    bottom: Optional[List[ScoreEntry]] = None
     legend: Optional[LegendBreaks] = None
 
+class RankingResponse(BaseModel):
+    """
+    Tam sıralama: sektör verilirse 81 il, il verilirse tüm sektörler.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    axis: Literal["sector", "city"]
+    name: str
+    version: int
+    total: int
+    ranking: List[RankedEntry]
+
+# ---- Açıklama (kriter katkıları) -------------------------------------------
+
+class ExplainEntry(BaseModel):
+    """
+    Tek (il, sektör) için puan, sıra, rozetler ve kriter bazlı katkılar.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    city: str
+    sector: str
+    rank: int = Field(..., ge=1, description="Sorgu eksenindeki sıra (il için sektördeki, sektör için ildeki)")
+    score: float = Field(..., ge=0, le=100)
+    reasons: List[str] = Field(default_factory=list, description="+ / ⚠ rozetleri")
+    contributions: List[Contribution]
+
+class ExplainResponse(BaseModel):
+    """
+    city+sector: tek çift; yalnız sector: Top-N il; yalnız city: Top-N sektör.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    version: int
+    city: Optional[str] = None
+    sector: Optional[str] = None
+    entries: List[ExplainEntry]
+
+# ---- What-if (özel ağırlık) ------------------------------------------------
+
+class CriterionWeight(BaseModel):
+    """
+    Kullanıcının gönderdiği tek kriter satırı (Sektor_Kriter_Agirlik.xlsx ile aynı alanlar).
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    KriterKey: str = Field(..., description="Normalize veri setindeki kolon adı")
+    Agirlik: float = Field(..., ge=0, le=100, description="Ağırlık (yüzde); toplam 100 olmalı")
+    Yon: WeightDirection = Field(..., description="Yön: YUKSEK | DUSUK")
+
+class WhatIfRequest(BaseModel):
+    """
+    Bir sektör için alternatif ağırlık seti. sector verilirse mevcut skorlar da döner.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    sector: Optional[str] = Field(None, description="Karşılaştırma için sektör adı (opsiyonel)")
+    criteria: List[CriterionWeight] = Field(..., min_length=1, description="Kriter ağırlıkları")
+
+class RankedEntry(BaseModel):
+    """
+    Sıralamadaki tek satır.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    rank: int = Field(..., ge=1)
+    name: str
+    score: float = Field(..., ge=0, le=100)
+
+class WhatIfResponse(BaseModel):
+    """
+    Özel ağırlıklarla 81 ilin puanı ve sıralaması.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    sector: Optional[str] = None
+    version: int = Field(..., description="Kullanılan veri snapshot sürümü")
+    weightHash: str = Field(..., description="Ağırlık setinin kanonik hash'i")
+    cached: bool
+    scoresByCity: ScoreDict
+    ranking: List[RankedEntry]
+    baselineScoresByCity: Optional[ScoreDict] = None
+
+# ---- Toplu (batch) skorlama ------------------------------------------------
+
+BATCH_MAX_ITEMS = 5000  # liste başına üst sınır
+
+class BatchPair(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    city: str = Field(..., description="İl adı")
+    sector: str = Field(..., description="Sektör adı")
+
+class BatchRequest(BaseModel):
+    """
+    Tek çağrıda birden çok sorgu:
+    - sectors: her sektör için tüm illerin puanı
+    - cities:  her il için tüm sektörlerin puanı
+    - pairs:   açık (il, sektör) çiftleri; includeContributions ile kriter katkıları
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    sectors: List[str] = Field(default_factory=list, max_length=BATCH_MAX_ITEMS)
+    cities: List[str] = Field(default_factory=list, max_length=BATCH_MAX_ITEMS)
+    pairs: List[BatchPair] = Field(default_factory=list, max_length=BATCH_MAX_ITEMS)
+    includeContributions: bool = Field(False, description="pairs için kriter katkılarını da döndür")
+
+class BatchSectorResult(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    query: str
+    sector: Optional[str] = None
+    scoresByCity: Optional[ScoreDict] = None
+    error: Optional[str] = None
+
+class BatchCityResult(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    query: str
+    city: Optional[str] = None
+    scoresBySector: Optional[ScoreDict] = None
+    error: Optional[str] = None
+
+class BatchPairResult(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    query: BatchPair
+    city: Optional[str] = None
+    sector: Optional[str] = None
+    score: Optional[float] = None
+    contributions: Optional[List[Contribution]] = None
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    """
+    Sonuçlar istek sırasıyla döner; hatalı öğeler `error` alanıyla işaretlenir.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    version: int
+    sectors: List[BatchSectorResult] = Field(default_factory=list)
+    cities: List[BatchCityResult] = Field(default_factory=list)
+    pairs: List[BatchPairResult] = Field(default_factory=list)
+
+# ---- Ağırlık duyarlılığı (Monte Carlo) -------------------------------------
+
+class SensitivityCity(BaseModel):
+    """
+    Bir ilin örneklenen ağırlık setleri altındaki puan/sıra dağılımı.
+    rankDistribution: {sıra: olasılık}, yalnızca sıfır olmayanlar.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    city: str
+    baselineScore: float
+    baselineRank: int
+    meanScore: float
+    scoreStd: float
+    scoreCI: Tuple[float, float]
+    medianRank: int
+    rankCI: Tuple[int, int]
+    pTopK: float = Field(..., description="Top-K'da olma olasılığı")
+    rankDistribution: Dict[int, float]
+
+class SensitivityResponse(BaseModel):
+    """
+    Sektör ağırlıkları Dirichlet(concentration × mevcut ağırlıklar) ile örneklendiğinde
+    81 ilin sıralama kararlılığı. İller mevcut (baseline) sıraya göre listelenir.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    sector: str
+    version: int
+    samples: int
+    concentration: float
+    seed: int
+    topk: int
+    ciLevel: float
+    criteria: List[str]
+    cities: List[SensitivityCity]
+
+# ---- Çok sektörlü sorgu (skyline + toplu sıralama) ------------------------
+
+class MultiSectorEntry(BaseModel):
+    """
+    score: seçilen sektörlerin ağırlıklı ortalaması; onSkyline: hiçbir il her sektörde ondan iyi değil.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    rank: int = Field(..., ge=1, description="Toplu puana göre sıra")
+    city: str
+    score: float = Field(..., ge=0, le=100)
+    onSkyline: bool
+    scoresBySector: ScoreDict
+
+class MultiSectorResponse(BaseModel):
+    """
+    skyline: Pareto-optimal iller (toplu puana göre); ranking: toplu puana göre ilk topn il.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    version: int
+    sectors: List[str]
+    weights: Dict[str, float] = Field(..., description="Normalize sektör ağırlıkları (toplam 1)")
+    skyline: List[MultiSectorEntry]
+    ranking: List[MultiSectorEntry]
+
+# ---- Benzer iller ----------------------------------------------------------
+
+class SimilarCity(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    rank: int = Field(..., ge=1)
+    city: str
+    distance: float = Field(..., ge=0, description="cosine: 1 − benzerlik; euclidean: normalize uzayda uzaklık")
+
+class SimilarCitiesResponse(BaseModel):
+    """
+    criteria: mesafede kullanılan feature kolonları (sector verilirse yalnızca onun kriterleri).
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    city: str
+    metric: Literal["cosine", "euclidean"]
+    sector: Optional[str] = None
+    version: int
+    criteria: List[str]
+    neighbors: List[SimilarCity]
+
+# ---- Bölgesel toplamlar ----------------------------------------------------
+
+class RegionScoreStats(BaseModel):
+    """
+    weighted: il nüfuslarıyla ağırlıklı ortalama.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    mean: float = Field(..., ge=0, le=100)
+    median: float = Field(..., ge=0, le=100)
+    min: float = Field(..., ge=0, le=100)
+    max: float = Field(..., ge=0, le=100)
+    weighted: float = Field(..., ge=0, le=100)
+
+class RegionEntry(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    region: str = Field(..., description="Bölge adı ya da NUTS kodu (ör. 'Ege', 'TR3', 'TR31')")
+    cities: List[str]
+    population: int = Field(..., ge=0)
+    sectors: Dict[str, RegionScoreStats]
+
+class RegionsResponse(BaseModel):
+    """
+    unmatched: bölge eşlemesinde bulunamadığı için hiçbir bölgeye girmeyen iller.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    version: int
+    level: Literal["region", "nuts1", "nuts2"]
+    sectors: List[str]
+    regions: List[RegionEntry]
+    unmatched: List[str] = Field(default_factory=list)
+
 # ---- Sağlık/teknik uçlar için küçük modeller -------------------------------
 
 class HealthResponse(BaseModel):
@@ -125,6 +390,28 @@ __all__ = [
     "ScoreEntry",
     "Mod1Response",
     "Mod2Response",
+    "RankingResponse",
+    "ExplainEntry",
+    "ExplainResponse",
+    "CriterionWeight",
+    "WhatIfRequest",
+    "RankedEntry",
+    "WhatIfResponse",
+    "BatchPair",
+    "BatchRequest",
+    "BatchSectorResult",
+    "BatchCityResult",
+    "BatchPairResult",
+    "BatchResponse",
+    "SensitivityCity",
+    "SensitivityResponse",
+    "MultiSectorEntry",
+    "MultiSectorResponse",
+    "SimilarCity",
+    "SimilarCitiesResponse",
+    "RegionScoreStats",
+    "RegionEntry",
+    "RegionsResponse",
     "HealthResponse",
     "SectorRequest",
     "CityRequest",
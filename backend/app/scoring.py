@@ -3,25 +3,67 @@ scoring.py
 - Yön dönüşümü + ağırlıklı toplam ile skor hesaplar
 - 0–1 skorları 0–100 puana çevirir
 - Tüm iller / tüm sektörler için hesaplama fonksiyonları sunar
+
+Hesaplama tek bir matris çarpımıdır:
+  Sektor_Kriter_Agirlik bir kez (sektör × feature) yoğun ağırlık matrisine derlenir.
+  Yon=DUSUK katkısı w·(1−x) = w − w·x olduğundan, işaretli ağırlıklar (W±) ve
+  sektör başına sabit (DUSUK ağırlıklarının toplamı) ile:
+      skor(il, sektör) = X[il] · W±[sektör] + sabit[sektör]
+  Tüm iller × tüm sektörler = X @ W±ᵀ + sabit
 """
 
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
-import pandas as pd
 
-from .config import SCORE_SCALE_MAX
-from .loader import (
-    load_dataframes,
-    get_sector_slice,
-    get_city_row,
-)
+if TYPE_CHECKING:  # istek yolu pandas'sız; DataFrame kabul eden yardımcılar için
+    import pandas as pd
+
+from .config import CITY_SYNONYMS, SCORE_SCALE_MAX
+from .legend import breaks_for
+from .loader import LoadedData
+from .resolver import NameResolver
 
 # ---------------------------------------------------------------------------
 
-def _apply_direction(values: pd.Series, direction: str) -> pd.Series:
+@dataclass(frozen=True)
+class WeightMatrix:
+    """
+    Sektor_Kriter_Agirlik'in derlenmiş hali.
+    - weights:  (n_sectors, n_features) Agirlik (yüzde, Excel'deki gibi)
+    - low_mask: (n_sectors, n_features) Yon=DUSUK olan hücreler
+    - signed:   0–1 ağırlık w = Agirlik/100; YUKSEK için +w, DUSUK için −w
+    - offset:   (n_sectors,) DUSUK ağırlıklarının toplamı
+    - criteria: sektör başına Excel sırasıyla feature indeksleri (katkı listesi için)
+    """
+    sector_names: Tuple[str, ...]
+    feature_cols: Tuple[str, ...]
+    weights: np.ndarray
+    low_mask: np.ndarray
+    signed: np.ndarray
+    offset: np.ndarray
+    criteria: Tuple[Tuple[int, ...], ...]
+
+
+@dataclass(frozen=True)
+class ScoreTables:
+    """
+    Bir veri sürümü için hesaplanmış tüm skorlar.
+    - features: (n_cities, n_features) normalize il değerleri
+    - scores:   (n_cities, n_sectors) 0–1 skorlar
+    """
+    city_names: Tuple[str, ...]
+    city_resolver: NameResolver
+    sector_resolver: NameResolver
+    features: np.ndarray
+    weights: WeightMatrix
+    scores: np.ndarray
+
+
+def _apply_direction(values: "pd.Series", direction: str) -> "pd.Series":
     """
     Yon=YUKSEK -> katkı = değer
     Yon=DUSUK  -> katkı = 1 - değer
@@ -35,25 +77,187 @@ def _apply_direction(values: pd.Series, direction: str) -> pd.Series:
         raise ValueError(f"Geçersiz yön: {direction}")
 
 
-def _score_vector_for_sector(df_cities: pd.DataFrame, sector_slice: pd.DataFrame) -> pd.Series:
+def weight_matrix_from_indices(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    pct: np.ndarray,
+    low: np.ndarray,
+    sector_list: Sequence[str],
+    feature_cols: Sequence[str],
+) -> WeightMatrix:
     """
-    Verilen sektör için (KriterKey, Agirlik, Yon) satırlarına göre
-    tüm iller için 0–1 skor vektörü döndürür.
+    Kriter satırlarının (sektör indeksi, feature indeksi, Agirlik yüzdesi, DUSUK mu)
+    dizilerinden yoğun sektör × feature matrisini kurar.
+    Aynı sektörde tekrar eden KriterKey ağırlıkları toplanır; tekrarların yönü farklıysa ValueError
+    (tek low_mask hücresi iki yönü birden taşıyamaz, katkılar skorla ayrışırdı).
     """
-    # Başlangıç 0
-    score = pd.Series(0.0, index=df_cities.index)
-
-    for _, row in sector_slice.iterrows():
-        key = row["KriterKey"]
-        w = float(row["Agirlik"]) / 100.0
-        direction = row["Yon"]
+    rows = np.asarray(rows, dtype=np.intp)
+    cols = np.asarray(cols, dtype=np.intp)
+    low = np.asarray(low, dtype=bool)
+    pct = np.asarray(pct, dtype=np.float64)
+    w = pct / 100.0
+
+    shape = (len(sector_list), len(feature_cols))
+    weights = np.zeros(shape, dtype=np.float64)
+    signed = np.zeros(shape, dtype=np.float64)
+    low_mask = np.zeros(shape, dtype=bool)
+    np.add.at(weights, (rows, cols), pct)
+    np.add.at(signed, (rows, cols), np.where(low, -w, w))
+    low_mask[rows[low], cols[low]] = True
+    mixed = low_mask[rows[~low], cols[~low]]
+    if mixed.any():
+        pairs = sorted({(sector_list[r], feature_cols[c]) for r, c in zip(rows[~low][mixed], cols[~low][mixed])})
+        raise ValueError(
+            "Aynı sektörde hem YUKSEK hem DUSUK yönlü tekrar eden kriterler: "
+            + ", ".join(f"{s}/{k}" for s, k in pairs)
+        )
+    offset = np.zeros(len(sector_list), dtype=np.float64)
+    np.add.at(offset, rows[low], w[low])
+
+    criteria: List[List[int]] = [[] for _ in sector_list]
+    for r, c in zip(rows.tolist(), cols.tolist()):
+        if c not in criteria[r]:
+            criteria[r].append(c)
+
+    for arr in (weights, signed, low_mask, offset):
+        arr.setflags(write=False)
+
+    return WeightMatrix(
+        sector_names=tuple(sector_list),
+        feature_cols=tuple(feature_cols),
+        weights=weights,
+        low_mask=low_mask,
+        signed=signed,
+        offset=offset,
+        criteria=tuple(tuple(c) for c in criteria),
+    )
+
+
+def compile_weight_rows(
+    rows: Iterable[Tuple[str, str, float, str]],
+    feature_cols: Sequence[str],
+    sector_list: Optional[Sequence[str]] = None,
+) -> WeightMatrix:
+    """
+    (Sektor, KriterKey, Agirlik, Yon) satırlarını yoğun sektör × feature matrisine derler.
+    """
+    rows = list(rows)
+    if sector_list is None:
+        sector_list = sorted({r[0] for r in rows})
+    sector_pos = {s: i for i, s in enumerate(sector_list)}
+    feature_pos = {f: i for i, f in enumerate(feature_cols)}
+
+    try:
+        ri = [sector_pos[r[0]] for r in rows]
+        ci = [feature_pos[r[1]] for r in rows]
+    except KeyError:
+        raise KeyError("Kriter tablosunda sektör/feature listesinde olmayan satırlar var.") from None
+
+    direction = [str(r[3]).upper() for r in rows]
+    bad = set(direction) - {"YUKSEK", "DUSUK"}
+    if bad:
+        raise ValueError(f"Geçersiz yön: {sorted(bad)}")
+
+    return weight_matrix_from_indices(
+        np.array(ri, dtype=np.intp),
+        np.array(ci, dtype=np.intp),
+        np.array([r[2] for r in rows], dtype=np.float64),
+        np.array([d == "DUSUK" for d in direction], dtype=bool),
+        sector_list,
+        feature_cols,
+    )
+
+
+def compile_weight_matrix(
+    df_criteria: "pd.DataFrame",
+    feature_cols: Sequence[str],
+    sector_list: Optional[Sequence[str]] = None,
+) -> WeightMatrix:
+    """
+    DataFrame (Sektor, KriterKey, Agirlik, Yon) için compile_weight_rows.
+    """
+    return compile_weight_rows(
+        zip(df_criteria["Sektor"], df_criteria["KriterKey"], df_criteria["Agirlik"], df_criteria["Yon"]),
+        feature_cols,
+        sector_list,
+    )
 
-        contrib = _apply_direction(df_cities[key], direction) * w
-        score = score.add(contrib, fill_value=0.0)
 
+def score_matrix(features: np.ndarray, wm: WeightMatrix) -> np.ndarray:
+    """
+    (n_cities, n_features) × derlenmiş ağırlıklar → (n_cities, n_sectors) 0–1 skor.
+    """
+    scores = features @ wm.signed.T + wm.offset
     # Skor 0..1 aralığında kalmalı (işlem hatalarını tolere et)
-    score = score.clip(lower=0.0, upper=1.0)
-    return score
+    np.clip(scores, 0.0, 1.0, out=scores)
+    return scores
+
+
+def build_score_tables(data: LoadedData) -> ScoreTables:
+    """
+    Doğrulanmış veri sürümünden ağırlık matrisini derler ve tüm skorları hesaplar.
+    """
+    city_list = data.city_list
+    sector_list = data.sector_list
+
+    arrays = data.arrays
+    features = np.array(arrays.features, dtype=np.float64)
+    wm = weight_matrix_from_indices(
+        arrays.crit_sector, arrays.crit_feature, arrays.crit_weight, arrays.crit_low,
+        sector_list, data.feature_cols,
+    )
+    scores = score_matrix(features, wm)
+    features.setflags(write=False)
+    scores.setflags(write=False)
+
+    return ScoreTables(
+        city_names=tuple(city_list),
+        city_resolver=NameResolver(city_list, CITY_SYNONYMS),
+        sector_resolver=NameResolver(sector_list),
+        features=features,
+        weights=wm,
+        scores=scores,
+    )
+
+
+def get_score_tables() -> ScoreTables:
+    """
+    Güncel veri snapshot'ının derlenmiş ağırlıklarını ve il × sektör skorlarını döndürür.
+    Skorlar snapshot başına bir kez hesaplanır.
+    """
+    return _current_snapshot().tables
+
+
+def _current_snapshot():
+    from .snapshot import get_snapshot  # snapshot bu modülü içe aktarır
+    return get_snapshot()
+
+
+def _city_idx(tables: ScoreTables, city: str) -> int:
+    i = tables.city_resolver.resolve(city)
+    if i is None:
+        raise KeyError(f"Şehir bulunamadı: '{city}'")
+    return i
+
+
+def _sector_idx(tables: ScoreTables, sector: str) -> int:
+    j = tables.sector_resolver.resolve(sector)
+    if j is None:
+        raise KeyError(f"Sektör bulunamadı: '{sector}'")
+    return j
+
+
+def _score_vector_for_sector(df_cities: "pd.DataFrame", sector_slice: "pd.DataFrame") -> "pd.Series":
+    """
+    Verilen sektör için (KriterKey, Agirlik, Yon) satırlarına göre
+    tüm iller için 0–1 skor vektörü döndürür.
+    """
+    import pandas as pd
+
+    keys = sector_slice["KriterKey"].astype(str).unique().tolist()
+    wm = compile_weight_matrix(sector_slice.assign(Sektor=""), keys, [""])
+    features = df_cities[keys].to_numpy(dtype=np.float64)
+    return pd.Series(score_matrix(features, wm)[:, 0], index=df_cities.index)
 
 
 def score_all_cities(sector: str) -> Tuple[Dict[str, float], List[float]]:
@@ -61,19 +265,15 @@ def score_all_cities(sector: str) -> Tuple[Dict[str, float], List[float]]:
     Mod-1: Belirli bir sektör için 81 ilin skorlarını hesaplar (0–100'e ölçekli).
     Döner:
       - scores_by_city: { "İzmir": 60.6, ... }
-      - legend: [0, 20, 40, 60, 80, 100] (basit linear eşik; UI'da quantile de yapılabilir)
+      - legend: 81 il puanından 5 sınıflı quantile eşikleri (Jenks/diğerleri: /api/mod1?legend=...)
     """
-    df_cities, df_criteria, feature_cols, sector_list, city_list, _ = load_dataframes()
-
-    sector_slice = get_sector_slice(df_criteria, sector)  # KriterKey, Agirlik, Yon
-    score_0_1 = _score_vector_for_sector(df_cities, sector_slice)
+    tables = get_score_tables()
+    j = _sector_idx(tables, sector)
+    col = tables.scores[:, j] * SCORE_SCALE_MAX
 
-    scores_by_city = {
-        df_cities.loc[i, "Sehir"]: float(score_0_1.iloc[idx] * SCORE_SCALE_MAX)
-        for idx, i in enumerate(score_0_1.index)
-    }
+    scores_by_city = dict(zip(tables.city_names, col.tolist()))
 
-    legend = [0, 20, 40, 60, 80, 100]
+    legend = breaks_for(col)
     return scores_by_city, legend
 
 
@@ -82,22 +282,15 @@ def score_all_sectors(city: str) -> Tuple[Dict[str, float], List[float]]:
     Mod-2: Belirli bir il için tüm sektörlerin skorlarını hesaplar (0–100'e ölçekli).
     Döner:
       - scores_by_sector: { "Turizm": 60.6, ... }
-      - legend: [0, 20, 40, 60, 80, 100]
+      - legend: sektör puanlarından 5 sınıflı quantile eşikleri
     """
-    df_cities, df_criteria, feature_cols, sector_list, city_list, _ = load_dataframes()
+    tables = get_score_tables()
+    i = _city_idx(tables, city)
+    row = tables.scores[i, :] * SCORE_SCALE_MAX
 
-    # İlgili şehir satırını alın
-    row = get_city_row(df_cities, city)  # Series
-    # Hesaplamayı kolaylaştırmak için tek satırlık DataFrame'e çevir
-    one_city_df = pd.DataFrame([row]).set_index(pd.Index([0]))
+    scores_by_sector = dict(zip(tables.weights.sector_names, row.tolist()))
 
-    scores_by_sector: Dict[str, float] = {}
-    for sector in sector_list:
-        sector_slice = df_criteria.loc[df_criteria["Sektor"].str.casefold() == sector.casefold(), ["KriterKey", "Agirlik", "Yon"]]
-        score_0_1 = _score_vector_for_sector(one_city_df, sector_slice)
-        scores_by_sector[sector] = float(score_0_1.iloc[0] * SCORE_SCALE_MAX)
-
-    legend = [0, 20, 40, 60, 80, 100]
+    legend = breaks_for(row)
     return scores_by_sector, legend
 
 
@@ -111,43 +304,66 @@ def score_sector_for_city(city: str, sector: str, return_contributions: bool = F
             { 'kriter': 'Konut...', 'yon': 'YUKSEK', 'agirlik': 24.0,
               'ham_deger': 0.62, 'katki': 0.1488 }   # (katki 0–1 bandında)
     """
-    df_cities, df_criteria, feature_cols, sector_list, city_list, _ = load_dataframes()
+    snap = _current_snapshot()
+    tables = snap.tables
+    i = _city_idx(tables, city)
+    j = _sector_idx(tables, sector)
 
-    row = get_city_row(df_cities, city)  # Series
-    sec_slice = get_sector_slice(df_criteria, sector)
+    score = float(tables.scores[i, j] * SCORE_SCALE_MAX)
+    if not return_contributions:
+        return score
 
-    score_0_1 = 0.0
-    contribs: List[dict] = []
+    return score, contribution_list(tables, i, j, snap.contributions[i, j])
 
-    for _, r in sec_slice.iterrows():
-        key = r["KriterKey"]
-        w = float(r["Agirlik"]) / 100.0
-        direction = r["Yon"]
-        val = float(row[key])
 
-        val_dir = val if direction == "YUKSEK" else (1.0 - val)
-        katki = val_dir * w
-        score_0_1 += katki
+def contribution_matrix(tables: ScoreTables, city_idx: np.ndarray, sector_idx: np.ndarray) -> np.ndarray:
+    """
+    (il, sektör) çiftleri için feature bazlı katkılar: (n_pairs, n_features), 0–1 bandında.
+    Kriter olmayan feature'ların katkısı 0'dır. Satır toplamı = 0–1 skor (kırpma öncesi).
+    """
+    wm = tables.weights
+    values = tables.features[city_idx]
+    low = wm.low_mask[sector_idx]
+    return np.where(low, 1.0 - values, values) * (wm.weights[sector_idx] / 100.0)
 
-        if return_contributions:
-            contribs.append({
-                "kriter": key,
-                "yon": direction,
-                "agirlik": float(r["Agirlik"]),
-                "ham_deger": val,
-                "katki": float(katki),  # 0–1 bandında
-            })
 
-    score_0_1 = min(max(score_0_1, 0.0), 1.0)
-    score = float(score_0_1 * SCORE_SCALE_MAX)
+def contribution_tensor(tables: ScoreTables) -> np.ndarray:
+    """
+    Tüm iller × sektörler × feature'lar için katkılar: (n_cities, n_sectors, n_features).
+    contribution_matrix'in tam ızgara hali; snapshot kurulurken bir kez hesaplanır.
+    """
+    wm = tables.weights
+    values = tables.features[:, None, :]
+    return np.where(wm.low_mask[None, :, :], 1.0 - values, values) * (wm.weights[None, :, :] / 100.0)
+
 
-    if return_contributions:
-        return score, contribs
-    return score
+def contribution_list(
+    tables: ScoreTables,
+    city_idx: int,
+    sector_idx: int,
+    contrib_row: Optional[np.ndarray] = None,
+) -> List[dict]:
+    """
+    Tek (il, sektör) için explain.py formatında katkı listesi (Excel kriter sırasıyla).
+    contrib_row verilirse (contribution_matrix satırı) yeniden hesaplanmaz.
+    """
+    wm = tables.weights
+    if contrib_row is None:
+        contrib_row = contribution_matrix(tables, np.array([city_idx]), np.array([sector_idx]))[0]
+    return [
+        {
+            "kriter": wm.feature_cols[f],
+            "yon": "DUSUK" if wm.low_mask[sector_idx, f] else "YUKSEK",
+            "agirlik": float(wm.weights[sector_idx, f]),
+            "ham_deger": float(tables.features[city_idx, f]),
+            "katki": float(contrib_row[f]),  # 0–1 bandında
+        }
+        for f in wm.criteria[sector_idx]
+    ]
 
 
 def sort_top_n(score_dict: Dict[str, float], n: int = 5) -> List[Tuple[str, float]]:
     """
     Puan sözlüğünü (isim → puan) azalan sıralar, ilk n çifti döndürür.
     """
-    return sorted(score_dict.items(), key=lambda kv: kv[1], reverse=True)[:n]
\ No newline at end of file
+    return sorted(score_dict.items(), key=lambda kv: kv[1], reverse=True)[:n]
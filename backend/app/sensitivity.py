@@ -0,0 +1,266 @@
+"""
+sensitivity.py
+- Sektör ağırlıklarının belirsizliği: Dirichlet(concentration × mevcut ağırlıklar) ile ağırlık seti örnekler
+- Her parça (chunk) tek matris çarpımıyla 81 ili puanlar; sıralar argsort ile, eşitlikte il sırası korunur
+- Bellek örnek sayısından bağımsızdır: parça başına sıra sayaçları ve 0.1 puan çözünürlüklü
+  puan histogramları biriktirilir (güven aralıkları histogramdan okunur)
+
+Kullanım (backend/ içinden):
+    python -m app.sensitivity --sector "Turizm / Otelcilik" --samples 5000 [--seed 0] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .cache import LRUCache
+from .config import MC_CACHE_SIZE, MC_CHUNK_SIZE, SCORE_SCALE_MAX
+from .snapshot import DataSnapshot
+
+# ---------------------------------------------------------------------------
+
+# Puan histogramı çözünürlüğü: 0.1 puan (yanıtlar da 1 ondalıkla döner)
+_BINS_PER_POINT = 10
+
+
+@dataclass(frozen=True)
+class SensitivityResult:
+    """
+    Dizilerin hepsi snapshot.city_list sırasıyla (n_cities,) — rank_counts hariç.
+    - rank_counts[i, r]: il i'nin r+1. sıraya düştüğü örnek sayısı
+    - criteria: örneklenen feature indeksleri; base_weights bunların 0–1 ağırlıkları
+    """
+    sector_idx: int
+    samples: int
+    concentration: float
+    seed: int
+    topk: int
+    ci_level: float
+    criteria: Tuple[int, ...]
+    base_weights: np.ndarray
+    baseline_scores: np.ndarray
+    baseline_ranks: np.ndarray
+    mean_scores: np.ndarray
+    std_scores: np.ndarray
+    score_lo: np.ndarray
+    score_hi: np.ndarray
+    rank_median: np.ndarray
+    rank_lo: np.ndarray
+    rank_hi: np.ndarray
+    p_topk: np.ndarray
+    rank_counts: np.ndarray
+
+
+def _directed_features(snapshot: DataSnapshot, sector_idx: int) -> Tuple[np.ndarray, np.ndarray, Tuple[int, ...]]:
+    """
+    (D, w0, kriterler): D[:, k] = değer (YUKSEK) ya da 1 − değer (DUSUK); skor = D @ w0.
+    w0 Agirlik/100'dür (toplamı Excel'deki gibi 1'den biraz sapabilir), böylece taban skor API ile aynıdır.
+    """
+    wm = snapshot.tables.weights
+    criteria = tuple(wm.criteria[sector_idx])
+    if not criteria:
+        raise ValueError(f"'{wm.sector_names[sector_idx]}' sektörünün kriteri yok")
+    cols = np.asarray(criteria, dtype=np.intp)
+    features = snapshot.tables.features[:, cols]
+    low = wm.low_mask[sector_idx, cols]
+    directed = np.where(low, 1.0 - features, features)
+    w0 = wm.weights[sector_idx, cols] / 100.0
+    return directed, w0, criteria
+
+
+def _ranks(scores: np.ndarray) -> np.ndarray:
+    """(n_cities, m) puanlar → 0 tabanlı sıralar; eşit puanda küçük indeks önde."""
+    order = np.argsort(-scores, axis=0, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(scores.shape[0])[:, None], axis=0)
+    return ranks
+
+
+def _quantile_from_counts(counts: np.ndarray, q: float) -> np.ndarray:
+    """Satır başına histogramdan q-kantil kovası (ilk kümülatif ≥ q·toplam)."""
+    cum = np.cumsum(counts, axis=1)
+    target = q * cum[:, -1:]
+    return np.argmax(cum >= np.maximum(target, 1), axis=1)
+
+
+def run_sensitivity(
+    snapshot: DataSnapshot,
+    sector_idx: int,
+    samples: int = 2000,
+    concentration: float = 50.0,
+    seed: int = 0,
+    topk: int = 5,
+    ci_level: float = 0.9,
+    chunk_size: int = MC_CHUNK_SIZE,
+) -> SensitivityResult:
+    """
+    Ağırlık duyarlılığı analizi. Örnekler w = toplam(w0) · Dirichlet(concentration · w0 / toplam(w0));
+    toplam ağırlık korunur, E[w] = w0 ve concentration büyüdükçe örnekler w0'a yaklaşır
+    (Var[p_k] = p_k(1 − p_k) / (concentration + 1)).
+    """
+    if samples < 1:
+        raise ValueError("samples en az 1 olmalı")
+    if concentration <= 0:
+        raise ValueError("concentration pozitif olmalı")
+
+    directed, w0, criteria = _directed_features(snapshot, sector_idx)
+    n = directed.shape[0]
+    total_weight = float(w0.sum())
+    alpha = concentration * w0 / total_weight
+    rng = np.random.default_rng(seed)
+    n_bins = int(SCORE_SCALE_MAX) * _BINS_PER_POINT + 1
+
+    rank_counts = np.zeros(n * n, dtype=np.int64)
+    score_counts = np.zeros(n * n_bins, dtype=np.int64)
+    total = np.zeros(n)
+    total_sq = np.zeros(n)
+    row_offset = np.arange(n)[:, None]
+
+    done = 0
+    while done < samples:
+        m = min(chunk_size, samples - done)
+        weights = rng.dirichlet(alpha, size=m) * total_weight      # (m, k)
+        scores = directed @ weights.T                              # (n, m)
+        np.clip(scores, 0.0, 1.0, out=scores)
+        scores *= SCORE_SCALE_MAX
+
+        ranks = _ranks(scores)
+        rank_counts += np.bincount((row_offset * n + ranks).ravel(), minlength=n * n)
+        bins = np.rint(scores * _BINS_PER_POINT).astype(np.intp)
+        score_counts += np.bincount((row_offset * n_bins + bins).ravel(), minlength=n * n_bins)
+        total += scores.sum(axis=1)
+        total_sq += np.square(scores).sum(axis=1)
+        done += m
+
+    rank_counts = rank_counts.reshape(n, n)
+    score_counts = score_counts.reshape(n, n_bins)
+    mean = total / samples
+    std = np.sqrt(np.maximum(total_sq / samples - mean ** 2, 0.0))
+    lo_q, hi_q = (1.0 - ci_level) / 2.0, 1.0 - (1.0 - ci_level) / 2.0
+
+    baseline = np.clip(directed @ w0, 0.0, 1.0) * SCORE_SCALE_MAX
+    baseline_ranks = _ranks(baseline[:, None])[:, 0] + 1
+
+    return SensitivityResult(
+        sector_idx=sector_idx,
+        samples=samples,
+        concentration=float(concentration),
+        seed=int(seed),
+        topk=int(topk),
+        ci_level=float(ci_level),
+        criteria=criteria,
+        base_weights=w0,
+        baseline_scores=baseline,
+        baseline_ranks=baseline_ranks,
+        mean_scores=mean,
+        std_scores=std,
+        score_lo=_quantile_from_counts(score_counts, lo_q) / _BINS_PER_POINT,
+        score_hi=_quantile_from_counts(score_counts, hi_q) / _BINS_PER_POINT,
+        rank_median=_quantile_from_counts(rank_counts, 0.5) + 1,
+        rank_lo=_quantile_from_counts(rank_counts, lo_q) + 1,
+        rank_hi=_quantile_from_counts(rank_counts, hi_q) + 1,
+        p_topk=rank_counts[:, :topk].sum(axis=1) / samples,
+        rank_counts=rank_counts,
+    )
+
+
+# (içerik hash'i, sektör, parametreler) → sonuç; seed sabit olduğundan aynı istek aynı sonucu verir
+_RESULTS: LRUCache[SensitivityResult] = LRUCache("sensitivity", MC_CACHE_SIZE)
+
+
+def cache_key(snapshot: DataSnapshot, sector_idx: int, *params) -> tuple:
+    return (snapshot.content_hash, sector_idx, *params)
+
+
+def cached(key: tuple) -> Optional[SensitivityResult]:
+    return _RESULTS.get(key)
+
+
+def remember(key: tuple, result: SensitivityResult) -> None:
+    # Süreçler arası gelen diziler yazılabilir olur; cache'teki sonuç salt-okunur kalsın
+    for value in vars(result).values():
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+    _RESULTS.put(key, result)
+
+
+__all__ = [
+    "SensitivityResult",
+    "run_sensitivity",
+    "cache_key",
+    "cached",
+    "remember",
+]
+
+
+# ---- CLI -------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    from .snapshot import get_snapshot
+
+    parser = argparse.ArgumentParser(description="Sektör ağırlıkları için Monte Carlo duyarlılık analizi")
+    parser.add_argument("--sector", required=True, help="Sektör adı (bulanık eşleşme)")
+    parser.add_argument("--samples", type=int, default=5000)
+    parser.add_argument("--concentration", type=float, default=50.0, help="Dirichlet yoğunluğu (büyük → az sapma)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--topk", type=int, default=5)
+    parser.add_argument("--ci", type=float, default=0.9, help="Güven aralığı düzeyi")
+    parser.add_argument("--rows", type=int, default=15, help="Tabloda gösterilecek il sayısı")
+    parser.add_argument("--json", action="store_true", help="Tüm iller için JSON çıktı")
+    args = parser.parse_args(argv)
+
+    snap = get_snapshot()
+    j: Optional[int] = snap.engine.find_sector(args.sector)
+    if j is None:
+        print(f"'{args.sector}' sektörü bulunamadı", file=sys.stderr)
+        return 2
+
+    t0 = time.perf_counter()
+    r = run_sensitivity(snap, j, args.samples, args.concentration, args.seed, args.topk, args.ci)
+    elapsed = time.perf_counter() - t0
+    cities = snap.engine.city_names
+    order = np.argsort(r.baseline_ranks, kind="stable")
+
+    if args.json:
+        print(json.dumps({
+            "sector": snap.engine.sector_names[j],
+            "samples": r.samples,
+            "seconds": round(elapsed, 4),
+            "cities": [
+                {
+                    "city": cities[i],
+                    "baselineRank": int(r.baseline_ranks[i]),
+                    "baselineScore": round(float(r.baseline_scores[i]), 1),
+                    "meanScore": round(float(r.mean_scores[i]), 2),
+                    "scoreCI": [float(r.score_lo[i]), float(r.score_hi[i])],
+                    "rankCI": [int(r.rank_lo[i]), int(r.rank_hi[i])],
+                    "pTopK": round(float(r.p_topk[i]), 4),
+                }
+                for i in order
+            ],
+        }, ensure_ascii=False, indent=2))
+        return 0
+
+    print(
+        f"{snap.engine.sector_names[j]}: {r.samples} örnek, concentration={r.concentration:g}, "
+        f"seed={r.seed} ({elapsed * 1000:.0f} ms)"
+    )
+    ci = f"%{r.ci_level * 100:.0f} GA"
+    print(f"{'sıra':>4}  {'il':<16}{'puan':>7}{'ort':>8}  {ci + ' puan':<16}{ci + ' sıra':<14}{'P(top' + str(r.topk) + ')':>9}")
+    for i in order[:args.rows]:
+        print(
+            f"{int(r.baseline_ranks[i]):>4}  {cities[i]:<16}{r.baseline_scores[i]:>7.1f}{r.mean_scores[i]:>8.1f}  "
+            f"{f'{r.score_lo[i]:.1f}–{r.score_hi[i]:.1f}':<16}{f'{r.rank_lo[i]}–{r.rank_hi[i]}':<14}{r.p_topk[i]:>9.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
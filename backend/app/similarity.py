@@ -0,0 +1,95 @@
+"""
+similarity.py
+- "X'e benzeyen iller": normalize feature vektörleri üzerinde k en yakın il
+- Mesafe: cosine (1 − cos benzerliği) ya da euclidean; istenirse yalnızca bir sektörün kriter kolonları
+- Komşu listeleri (il başına diğer tüm iller, yakından uzağa) snapshot başına (metrik, sektör) için bir kez
+  hesaplanır; istek yolu yalnızca satır okur
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal, Optional, Tuple
+
+import numpy as np
+
+from .snapshot import DataSnapshot
+
+# ---------------------------------------------------------------------------
+
+Metric = Literal["cosine", "euclidean"]
+METRICS: Tuple[str, ...] = ("cosine", "euclidean")
+
+
+@dataclass(frozen=True)
+class NeighborIndex:
+    """
+    order[i]: i dışındaki iller, i'ye yakından uzağa (eşit mesafede küçük indeks önce)
+    distances[i]: aynı sırayla mesafeler
+    columns: kullanılan feature indeksleri
+    """
+    metric: str
+    columns: Tuple[int, ...]
+    order: np.ndarray
+    distances: np.ndarray
+
+    def neighbors(self, city_idx: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        return self.order[city_idx, :k], self.distances[city_idx, :k]
+
+
+def distance_matrix(vectors: np.ndarray, metric: str) -> np.ndarray:
+    """(n, F) → (n, n) simetrik mesafe matrisi."""
+    x = np.asarray(vectors, dtype=np.float64)
+    if metric == "cosine":
+        norms = np.linalg.norm(x, axis=1)
+        # Sıfır vektör hiçbir ile benzemez (benzerlik 0 → mesafe 1)
+        unit = np.divide(x, norms[:, None], out=np.zeros_like(x), where=norms[:, None] > 0)
+        dist = 1.0 - unit @ unit.T
+        np.clip(dist, 0.0, 2.0, out=dist)
+    elif metric == "euclidean":
+        # 81 × 81 × F küçük: Gram açılımının yuvarlama hatası yerine doğrudan farklar (tam simetrik)
+        dist = np.sqrt(np.square(x[:, None, :] - x[None, :, :]).sum(axis=2))
+    else:
+        raise ValueError(f"Geçersiz mesafe: {metric}")
+    np.fill_diagonal(dist, 0.0)
+    return dist
+
+
+def build_index(vectors: np.ndarray, metric: str, columns: Tuple[int, ...]) -> NeighborIndex:
+    dist = distance_matrix(vectors, metric)
+    n = dist.shape[0]
+    # Kendisi listenin sonuna düşsün, sonra atılsın
+    ranked = dist.copy()
+    np.fill_diagonal(ranked, np.inf)
+    order = np.argsort(ranked, axis=1, kind="stable")[:, :n - 1]
+    distances = np.take_along_axis(dist, order, axis=1)
+    order.setflags(write=False)
+    distances.setflags(write=False)
+    return NeighborIndex(metric=metric, columns=columns, order=order, distances=distances)
+
+
+def neighbor_index(snapshot: DataSnapshot, metric: str = "cosine", sector_idx: Optional[int] = None) -> NeighborIndex:
+    """
+    Snapshot'a bağlı komşu indeksi; sector_idx verilirse yalnızca o sektörün kriter kolonları kullanılır.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Geçersiz mesafe: {metric}")
+
+    def factory(snap: DataSnapshot) -> NeighborIndex:
+        if sector_idx is None:
+            columns = tuple(range(len(snap.feature_cols)))
+        else:
+            columns = tuple(sorted(snap.tables.weights.criteria[sector_idx]))
+        return build_index(snap.tables.features[:, list(columns)], metric, columns)
+
+    return snapshot.derived(("neighbors", metric, sector_idx), factory)
+
+
+__all__ = [
+    "METRICS",
+    "Metric",
+    "NeighborIndex",
+    "distance_matrix",
+    "build_index",
+    "neighbor_index",
+]
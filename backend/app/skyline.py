@@ -0,0 +1,92 @@
+"""
+skyline.py
+- Çok sektörlü sorgu: seçilen sektörlerde Pareto-optimal iller (skyline) + ağırlıklı toplu sıralama
+- Skyline "sort-filter-skyline" ile bulunur: noktalar puan toplamına göre azalan sıralanır, böylece bir il
+  yalnızca kendinden önce gelenlerce baskılanabilir; karşılaştırmalar blok blok numpy yayınlamasıyla yapılır
+- Girdi snapshot'taki hazır skor matrisinin kolonlarıdır; yeniden skorlama yoktur
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ranking import descending_order
+
+# ---------------------------------------------------------------------------
+
+# Blok başına karşılaştırma: blok × (skyline + blok) boolean; 81 il için tek blok yeter
+_BLOCK = 256
+
+
+def _dominated(candidates: np.ndarray, by: np.ndarray) -> np.ndarray:
+    """
+    candidates (b, k), by (m, k) → (b,) bool: by'dan en az biri adayı baskılıyor mu
+    (her sektörde ≥ ve en az birinde >).
+    """
+    if by.shape[0] == 0:
+        return np.zeros(candidates.shape[0], dtype=bool)
+    # Sektör sayısı küçük: kısa eksende .all/.any indirgemesi yerine sektör başına (b, m) karşılaştırma
+    ge = np.ones((candidates.shape[0], by.shape[0]), dtype=bool)
+    gt = np.zeros_like(ge)
+    for c in range(candidates.shape[1]):
+        col_by, col_cand = by[:, c], candidates[:, c, None]
+        ge &= col_by >= col_cand
+        gt |= col_by > col_cand
+    return (ge & gt).any(axis=1)
+
+
+def skyline_mask(points: np.ndarray, block: int = _BLOCK) -> np.ndarray:
+    """
+    (n, k) puanlar (büyük daha iyi) → (n,) bool: başka hiçbir satır tarafından baskılanmayanlar.
+    Birebir aynı puanlı satırlar birbirini baskılamaz; ikisi de skyline'da kalır.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    n = points.shape[0]
+    mask = np.zeros(n, dtype=bool)
+    if n == 0:
+        return mask
+
+    # Baskılayan satırın toplamı kesinlikle büyüktür → toplamca sıralı taramada geriye bakmak yeter
+    order = descending_order(points.sum(axis=1))
+    ranked = points[order]
+    sky = np.empty((0, points.shape[1]))
+    for start in range(0, n, block):
+        cand = ranked[start:start + block]
+        alive = ~_dominated(cand, sky)
+        # Blok içi: yalnızca önceki skyline'ın eleyemediği adaylar birbirine karşı
+        inner = cand[alive]
+        alive[alive] = ~_dominated(inner, inner)
+        mask[order[start:start + block]] = alive
+        sky = np.vstack([sky, cand[alive]])
+    return mask
+
+
+def aggregate_scores(
+    scores: np.ndarray,
+    weights: Optional[Sequence[float]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (n, k) puanlar → (toplu puan (n,), normalize ağırlıklar (k,)). Ağırlık yoksa eşit ağırlık.
+    """
+    k = scores.shape[1]
+    if weights is None:
+        w = np.full(k, 1.0 / k)
+    else:
+        w = np.asarray(weights, dtype=np.float64)
+        if w.shape != (k,):
+            raise ValueError(f"{k} sektör için {w.shape[0]} ağırlık verildi")
+        if (w < 0).any() or not np.isfinite(w).all():
+            raise ValueError("Ağırlıklar negatif olmayan sayılar olmalı")
+        total = w.sum()
+        if total <= 0:
+            raise ValueError("Ağırlıkların toplamı sıfırdan büyük olmalı")
+        w = w / total
+    return scores @ w, w
+
+
+__all__ = [
+    "skyline_mask",
+    "aggregate_scores",
+]
@@ -0,0 +1,311 @@
+"""
+snapshot.py
+- Veri + skorların sürümlü, değişmez anlık görüntüsü (DataSnapshot)
+- Kaynak Excel dosyalarında mtime/boyut/içerik değişimini tespit eder
+- Yeni snapshot'ı arka planda kurar ve tek atamayla devreye alır
+
+İstekler snapshot'ı bir kez alıp (get_snapshot) tüm işlem boyunca onu kullanır;
+böylece yeniden yükleme sırasında bile karışık sürüm görmez ve kilit beklemez.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Mapping, Optional, Tuple, TypeVar
+
+import numpy as np
+
+from .cache import CacheCounter
+from .config import SNAPSHOT_CHECK_INTERVAL
+from .engine import ScoreEngine, build_engine
+from .explain import label_table
+from .loader import (
+    LoadedData,
+    combined_hash,
+    load_sources,
+    logger,
+    set_cache,
+    stamp_sources,
+    stat_sources,
+)
+from .metrics import (
+    SCORING_SECONDS,
+    SNAPSHOT_BUILD_SECONDS,
+    SNAPSHOT_ERRORS,
+    GaugeCallback,
+    register,
+)
+from .scoring import ScoreTables, build_score_tables, contribution_tensor
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+T = TypeVar("T")
+
+# Güncel snapshot'ın derived() kayıt sayısı aşağıda, store tanımlandıktan sonra bağlanır
+_DERIVED_STATS = CacheCounter("snapshot_derived", size=lambda: _derived_size())
+
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    """
+    Bir veri sürümüne ait her şey: doğrulanmış tablolar, derlenmiş ağırlıklar,
+    il × sektör skorları ve isim indeksleri. Oluşturulduktan sonra değişmez.
+    - contributions[i, j, f]: il i, sektör j için feature f'nin 0–1 katkısı
+    - labels: feature anahtarı → okunur kısa etiket (explain rozetleri için)
+    """
+    version: int
+    created_at: float
+    data: LoadedData
+    tables: ScoreTables
+    engine: ScoreEngine
+    contributions: np.ndarray
+    labels: Mapping[str, str]
+    _derived: Dict[Hashable, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    def derived(self, key: Hashable, factory: Callable[["DataSnapshot"], T]) -> T:
+        """
+        Bu snapshot'a bağlı türetilmiş veriyi (sıralamalar, indeksler, hazır yanıtlar...)
+        ilk kullanımda bir kez hesaplar. Snapshot değişince eskisiyle birlikte atılır.
+        Eşzamanlı ilk çağrılar aynı değeri iki kez hesaplayabilir; ilk yazılan kalır.
+        """
+        try:
+            value = self._derived[key]
+        except KeyError:
+            _DERIVED_STATS.miss()
+            return self._derived.setdefault(key, factory(self))
+        _DERIVED_STATS.hit()
+        return value
+
+    @property
+    def content_hash(self) -> str:
+        return self.data.content_hash
+
+    @property
+    def cities(self) -> "pd.DataFrame":
+        return self.data.cities
+
+    @property
+    def criteria(self) -> "pd.DataFrame":
+        return self.data.criteria
+
+    @property
+    def feature_cols(self) -> Tuple[str, ...]:
+        return self.data.feature_cols
+
+    @property
+    def sector_list(self) -> Tuple[str, ...]:
+        return self.data.sector_list
+
+    @property
+    def city_list(self) -> Tuple[str, ...]:
+        return self.data.city_list
+
+    @property
+    def scores(self) -> np.ndarray:
+        """(n_cities, n_sectors) 0–100 puanlar (salt-okunur)."""
+        return self.engine.scores
+
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.created_at)
+
+
+def build_snapshot(data: LoadedData, version: int) -> DataSnapshot:
+    with SCORING_SECONDS.time(("score_tables",)):
+        tables = build_score_tables(data)
+    with SCORING_SECONDS.time(("contributions",)):
+        contributions = contribution_tensor(tables)
+    contributions.setflags(write=False)
+    return DataSnapshot(
+        version=version,
+        created_at=time.time(),
+        data=data,
+        tables=tables,
+        engine=build_engine(tables),
+        contributions=contributions,
+        labels=MappingProxyType(label_table(data.feature_cols)),
+    )
+
+
+class SnapshotStore:
+    """
+    Güncel snapshot'ı tutar.
+    - get(): kilitsiz okuma; en fazla check_interval saniyede bir os.stat ile değişim kontrolü
+    - request_rebuild(): arka planda yeniden kurulum (eşzamanlı istekler tek kuruluma birleşir)
+    """
+
+    def __init__(self, check_interval: float = SNAPSHOT_CHECK_INTERVAL) -> None:
+        self.check_interval = check_interval
+        self.last_error: Optional[str] = None
+        self.last_build_seconds: Optional[float] = None
+
+        self._current: Optional[DataSnapshot] = None
+        self._stat = None
+        self._next_check = 0.0
+        self._init_lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._builder: Optional[threading.Thread] = None
+        self._pending_force: Optional[bool] = None
+        self._listeners: List[Callable[[DataSnapshot], None]] = []
+
+    # ---- okuma -------------------------------------------------------------
+
+    @property
+    def current(self) -> Optional[DataSnapshot]:
+        """Kurulum tetiklemeden ve değişim kontrolü yapmadan güncel snapshot (yoksa None)."""
+        return self._current
+
+    def get(self) -> DataSnapshot:
+        snap = self._current
+        if snap is None:
+            return self._initial_build()
+        if self.check_interval >= 0:
+            self._maybe_check()
+        return snap
+
+    def _initial_build(self) -> DataSnapshot:
+        # İlk snapshot'tan önce sunulacak veri yok; yalnızca bu kurulum senkron yapılır
+        with self._init_lock:
+            if self._current is None:
+                stat = stat_sources()
+                t0 = time.perf_counter()
+                snap = build_snapshot(load_sources(), version=1)
+                self.last_build_seconds = time.perf_counter() - t0
+                SNAPSHOT_BUILD_SECONDS.observe(self.last_build_seconds)
+                self._publish(snap, stat)
+            return self._current
+
+    def _maybe_check(self) -> None:
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        if stat_sources() != self._stat:
+            self.request_rebuild()
+
+    # ---- yeniden kurulum ---------------------------------------------------
+
+    def request_rebuild(self, force: bool = False) -> threading.Thread:
+        """
+        Arka planda yeniden kurulum başlatır ve kurulum thread'ini döndürür.
+        Kurulum sürerken gelen istekler bir sonraki tura eklenir.
+        force=True: mtime/boyut aynı olsa da içerik hash'i yeniden hesaplanır.
+        """
+        with self._build_lock:
+            if self._builder is not None:
+                self._pending_force = bool(self._pending_force) or force
+                return self._builder
+            self._pending_force = force
+            builder = threading.Thread(target=self._run_builds, name="snapshot-rebuild", daemon=True)
+            self._builder = builder
+            builder.start()
+            return builder
+
+    def _run_builds(self) -> None:
+        while True:
+            with self._build_lock:
+                force = self._pending_force
+                if force is None:
+                    self._builder = None
+                    return
+                self._pending_force = None
+            self._rebuild_once(force)
+
+    def _rebuild_once(self, force: bool) -> None:
+        current = self._current or self._initial_build()
+        # stat'ı okumadan önce al: okuma sırasında dosya değişirse sonraki kontrol yakalar
+        stat = stat_sources()
+        try:
+            t0 = time.perf_counter()
+            stamps = stamp_sources(previous=() if force else current.data.sources)
+            data = None
+            if combined_hash(stamps) != current.content_hash:
+                data = load_sources(stamps)
+            if data is None or data.content_hash == current.content_hash:
+                self._stat = stat
+                self.last_error = None
+                logger.info(f"Kaynak içerik değişmemiş; snapshot v{current.version} korunuyor.")
+                return
+            snap = build_snapshot(data, version=current.version + 1)
+            self.last_build_seconds = time.perf_counter() - t0
+            SNAPSHOT_BUILD_SECONDS.observe(self.last_build_seconds)
+        except Exception as e:
+            self.last_error = str(e)
+            SNAPSHOT_ERRORS.inc()
+            logger.exception(f"Snapshot yeniden kurulamadı; v{current.version} kullanılmaya devam ediyor.")
+            # Hatalı dosya düzeltilene kadar aynı stat için tekrar denemeyelim
+            self._stat = stat
+            return
+        self._publish(snap, stat)
+        logger.info(f"Snapshot v{snap.version} devrede ({snap.content_hash[:12]}).")
+
+    def subscribe(self, listener: Callable[[DataSnapshot], None]) -> None:
+        """
+        Her yeni snapshot devreye girdikten sonra listener(snap) çağrılır (kurulum thread'inde; kısa tutulmalı).
+        Zaten bir snapshot varsa listener onunla hemen bir kez çağrılır. Aynı listener ikinci kez eklenmez.
+        """
+        if listener in self._listeners:
+            return
+        self._listeners.append(listener)
+        snap = self._current
+        if snap is not None:
+            listener(snap)
+
+    def _publish(self, snap: DataSnapshot, stat) -> None:
+        self._current = snap
+        self._stat = stat
+        self.last_error = None
+        set_cache(snap.data)
+        for listener in list(self._listeners):
+            try:
+                listener(snap)
+            except Exception:
+                logger.exception("Snapshot dinleyicisi hata verdi")
+
+
+_STORE = SnapshotStore()
+
+
+def get_store() -> SnapshotStore:
+    return _STORE
+
+
+def get_snapshot() -> DataSnapshot:
+    """
+    Güncel veri snapshot'ı. Bir istek boyunca tek bir kez alınıp kullanılmalı.
+    """
+    return _STORE.get()
+
+
+# ---- Metrikler (yalnızca /metrics okunurken hesaplanır) ---------------------
+
+def _derived_size() -> int:
+    snap = _STORE.current
+    return len(snap._derived) if snap is not None else 0
+
+
+def _gauge(name: str, doc: str, value: Callable[[DataSnapshot], Optional[float]]) -> None:
+    def collect():
+        snap = _STORE.current
+        v = value(snap) if snap is not None else None
+        return [((), v)] if v is not None else []
+    register(GaugeCallback(name, doc, (), collect))
+
+
+_gauge("snapshot_version", "Devredeki veri snapshot sürümü", lambda s: s.version)
+_gauge("snapshot_age_seconds", "Devredeki snapshot'ın yaşı (sn)", lambda s: s.age_seconds())
+_gauge("snapshot_last_build_seconds", "Son başarılı snapshot kurulumunun süresi (sn)", lambda s: _STORE.last_build_seconds)
+_gauge("snapshot_last_rebuild_failed", "Son yeniden kurulum hatalıysa 1", lambda s: int(_STORE.last_error is not None))
+
+
+__all__ = [
+    "DataSnapshot",
+    "SnapshotStore",
+    "build_snapshot",
+    "get_store",
+    "get_snapshot",
+]
@@ -0,0 +1,122 @@
+"""
+whatif.py
+- Kullanıcının gönderdiği (KriterKey, Agirlik, Yon) seti ile 81 ili puanlar
+- Doğrulama Excel ile aynı kurallarla yapılır (loader.validate_criteria_rows; pandas'sız)
+- Skorlar snapshot'taki il feature matrisi ile tek matris çarpımıdır
+- Sonuçlar ağırlık setinin kanonik hash'i ile sınırlı LRU cache'te tutulur
+- API, cache'te olmayan setleri compute_result ile süreç havuzunda (workers.py) hesaplatır
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+from .cache import LRUCache
+from .config import SCORE_SCALE_MAX, WHATIF_CACHE_SIZE
+from .loader import validate_criteria_rows
+from .ranking import descending_order
+from .scoring import compile_weight_rows, score_matrix
+from .snapshot import DataSnapshot
+
+# ---------------------------------------------------------------------------
+
+# Derlenen tek satırlık ağırlık matrisindeki sektör etiketi
+CUSTOM_SECTOR = "Özel"
+
+CanonicalWeights = Tuple[Tuple[str, float, str], ...]
+
+_RESULTS: LRUCache["WhatIfResult"] = LRUCache("whatif", WHATIF_CACHE_SIZE)
+
+
+@dataclass(frozen=True)
+class WhatIfResult:
+    """
+    - scores: (n_cities,) 0–100 puanlar, snapshot.city_list sırasıyla
+    - order:  azalan puana göre il indeksleri (eşitlikte il sırası korunur)
+    """
+    weight_hash: str
+    scores: np.ndarray
+    order: np.ndarray
+
+
+def canonical_weights(criteria: Iterable[Tuple[str, float, str]]) -> CanonicalWeights:
+    """
+    Sıra ve yazım farklarından bağımsız anahtar: (KriterKey, Agirlik, Yon) üçlüleri sıralı.
+    """
+    return tuple(sorted(
+        (str(key), float(weight), str(direction).upper())
+        for key, weight, direction in criteria
+    ))
+
+
+def weights_hash(snapshot: DataSnapshot, canon: CanonicalWeights) -> str:
+    h = hashlib.sha256(snapshot.content_hash.encode("ascii"))
+    for key, weight, direction in canon:
+        h.update(f"\x1f{key}\x1e{weight!r}\x1e{direction}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def compute_result(snapshot: DataSnapshot, canon: CanonicalWeights, weight_hash: str) -> WhatIfResult:
+    """
+    Cache'e bakmadan hesaplar (worker süreçlerinde de çalışır). Geçersiz sette ValueError.
+    """
+    rows, _ = validate_criteria_rows(
+        ((CUSTOM_SECTOR, k, w, d) for k, w, d in canon),
+        snapshot.feature_cols,
+        source_name="Gönderilen ağırlık seti",
+    )
+    wm = compile_weight_rows(rows, snapshot.feature_cols, [CUSTOM_SECTOR])
+
+    scores = score_matrix(snapshot.tables.features, wm)[:, 0] * SCORE_SCALE_MAX
+    order = descending_order(scores)
+    scores.setflags(write=False)
+    order.setflags(write=False)
+    return WhatIfResult(weight_hash=weight_hash, scores=scores, order=order)
+
+
+def score_custom_weights(
+    snapshot: DataSnapshot,
+    criteria: Iterable[Tuple[str, float, str]],
+) -> Tuple[WhatIfResult, bool]:
+    """
+    Verilen ağırlık seti ile tüm illeri puanlar. (sonuç, cache'ten mi) döndürür.
+    Geçersiz setlerde ValueError fırlatır (hatalar cache'lenmez).
+    """
+    canon, key, cached = lookup(snapshot, criteria)
+    if cached is not None:
+        return cached, True
+    result = compute_result(snapshot, canon, key)
+    remember(result)
+    return result, False
+
+
+def lookup(
+    snapshot: DataSnapshot,
+    criteria: Iterable[Tuple[str, float, str]],
+) -> Tuple[CanonicalWeights, str, Optional[WhatIfResult]]:
+    """(kanonik set, hash, cache'teki sonuç | None)."""
+    canon = canonical_weights(criteria)
+    key = weights_hash(snapshot, canon)
+    return canon, key, _RESULTS.get(key)
+
+
+def remember(result: WhatIfResult) -> None:
+    # Süreçler arası gelen diziler yazılabilir olur; cache'teki sonuç salt-okunur kalsın
+    result.scores.setflags(write=False)
+    result.order.setflags(write=False)
+    _RESULTS.put(result.weight_hash, result)
+
+
+__all__ = [
+    "WhatIfResult",
+    "canonical_weights",
+    "weights_hash",
+    "compute_result",
+    "lookup",
+    "remember",
+    "score_custom_weights",
+]
@@ -0,0 +1,242 @@
+"""
+workers.py
+- CPU-yoğun işler (what-if, batch, Monte Carlo) için sınırlı süreç havuzu
+- Worker'lar başlarken veri snapshot'ını (feature/ağırlık matrisleri, skorlar) bir kez yükler
+- Kabul kontrolü: kuyruk + çalışan iş sayısı sınırı aşılırsa PoolSaturated (API: 429 + Retry-After)
+- Havuz bozulur ya da iş zaman aşımına uğrarsa PoolUnavailable (API: 503 + Retry-After)
+
+Ucuz uçlar (/api/mod1, /api/mod2...) GIL'i bu işlerle paylaşmaz; event loop yalnızca sonucu bekler.
+İşler snapshot'ın içerik hash'ini taşır; worker farklı bir sürümdeyse önce kendini günceller.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from .config import CPU_POOL_MAX_QUEUE, CPU_POOL_TIMEOUT, CPU_POOL_WORKERS
+from .log import get_logger
+from .metrics import SCORING_SECONDS, Counter, GaugeCallback, register
+from .snapshot import DataSnapshot, get_snapshot, get_store
+
+logger = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+
+class PoolSaturated(Exception):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"İşlem kuyruğu dolu; {retry_after} sn sonra tekrar deneyin")
+        self.retry_after = retry_after
+
+
+class PoolUnavailable(Exception):
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class SnapshotMismatch(RuntimeError):
+    """Worker, işin istediği veri sürümüne ulaşamadı (ör. kaynak dosya tam o anda değişti)."""
+
+
+# ---- Worker tarafı ---------------------------------------------------------
+
+def _init_worker() -> None:
+    # Matrisler ilk işten önce hazır olsun (derlenmiş .npz varsa milisaniyeler)
+    get_snapshot()
+
+
+def worker_snapshot(content_hash: str, timeout: float = 60.0) -> DataSnapshot:
+    """
+    İşin istediği veri sürümündeki snapshot. Worker geride kaldıysa zorla yeniden kurar.
+    """
+    snap = get_snapshot()
+    if snap.content_hash == content_hash:
+        return snap
+    get_store().request_rebuild(force=True).join(timeout)
+    snap = get_snapshot()
+    if snap.content_hash != content_hash:
+        raise SnapshotMismatch(f"worker snapshot {snap.content_hash[:12]}, istenen {content_hash[:12]}")
+    return snap
+
+
+def _run_job(fn: Callable[..., Any], content_hash: str, args: tuple) -> Any:
+    return fn(worker_snapshot(content_hash), *args)
+
+
+def _ping() -> int:
+    return get_snapshot().version
+
+
+# ---- Ana süreç tarafı ------------------------------------------------------
+
+class CpuPool:
+    """
+    run(job, fn, snapshot, *args): fn(snapshot, *args) worker'da çalışır ve sonucu döner.
+    fn modül düzeyinde (pickle'lanabilir) olmalı; argümanlar ve sonuç da pickle'lanır.
+    workers=0: süreç havuzu kurulmaz, iş aynı süreçte sınıfın kendi thread havuzunda çalışır.
+    """
+
+    def __init__(
+        self,
+        workers: int = CPU_POOL_WORKERS,
+        max_queue: int = CPU_POOL_MAX_QUEUE,
+        timeout: float = CPU_POOL_TIMEOUT,
+    ) -> None:
+        self.workers = max(0, int(workers))
+        self.max_queue = max(1, int(max_queue))
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Havuzsuz mod için kendi thread havuzumuz: kabul sayacı thread'deki iş bitince düşsün
+        self._inline: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._inflight = 0
+        # Son işlerin ortalama süresi (sn, üstel hareketli ortalama); Retry-After tahmini için
+        self._avg_seconds = 0.1
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def start(self) -> None:
+        """Havuzu kurar ve her worker'ı ısıtır (bloklamaz)."""
+        if self.workers == 0:
+            return
+        with self._lock:
+            if self._executor is None:
+                # fork + thread'ler (log dinleyicisi, snapshot kurucusu) güvenli değil; spawn kullan
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+                for _ in range(self.workers):
+                    self._executor.submit(_ping)
+                logger.info(f"CPU havuzu başlatıldı: {self.workers} worker", extra={"max_queue": self.max_queue})
+
+    def fall_back_inline(self, error: BaseException) -> None:
+        """Süreç başlatılamayan ortamda (ör. /dev/shm ya da sem_open yok) havuzsuz moda geçer."""
+        logger.warning(f"CPU havuzu başlatılamadı, işler aynı süreçte çalışacak: {error}")
+        self.shutdown()
+        with self._lock:
+            self.workers = 0
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        """Uygulama kapanışı: süreç havuzu ve havuzsuz mod thread'leri."""
+        self.shutdown()
+        with self._lock:
+            inline, self._inline = self._inline, None
+        if inline is not None:
+            inline.shutdown(wait=False, cancel_futures=True)
+
+    def _inline_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._inline is None:
+                # Eşzamanlı iş sayısı zaten kabul kontrolüyle max_queue'ya sınırlı
+                self._inline = ThreadPoolExecutor(max_workers=self.max_queue, thread_name_prefix="cpu-inline")
+            return self._inline
+
+    def retry_after(self) -> int:
+        per_worker = self._inflight / max(1, self.workers)
+        return max(1, math.ceil(per_worker * self._avg_seconds))
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._inflight >= self.max_queue:
+                _REJECTED.inc(("saturated",))
+                raise PoolSaturated(self.retry_after())
+            self._inflight += 1
+
+    def _release(self, started: float) -> None:
+        seconds = time.perf_counter() - started
+        with self._lock:
+            self._inflight -= 1
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * seconds
+
+    def _submit(
+        self, fn: Callable[..., Any], snapshot: DataSnapshot, args: tuple, on_done: Callable[[Any], None],
+    ) -> "asyncio.Future[Any]":
+        loop = asyncio.get_running_loop()
+        if self.workers == 0:
+            # Havuzsuz mod: aynı süreçte, kendi thread havuzumuzda
+            job = self._inline_executor().submit(fn, snapshot, *args)
+            job.add_done_callback(on_done)
+            return asyncio.wrap_future(job, loop=loop)
+        self.start()
+        executor = self._executor
+        if executor is None:
+            raise BrokenProcessPool("havuz kapatıldı")
+        job = executor.submit(_run_job, fn, snapshot.content_hash, args)
+        # Kabul sayacı iş worker'da gerçekten bitince düşer (zaman aşımında worker hâlâ meşgul olabilir)
+        job.add_done_callback(on_done)
+        return asyncio.wrap_future(job, loop=loop)
+
+    async def run(self, job: str, fn: Callable[..., Any], snapshot: DataSnapshot, *args: Any) -> Any:
+        self._admit()
+        started = time.perf_counter()
+        try:
+            future = self._submit(fn, snapshot, args, lambda _: self._release(started))
+        except (BrokenProcessPool, RuntimeError, OSError) as e:
+            self._release(started)
+            if isinstance(e, OSError):
+                # ProcessPoolExecutor kurulamadı (semafor / paylaşımlı bellek yok): sonraki işler aynı süreçte
+                self.fall_back_inline(e)
+            else:
+                self._reset_broken(e)
+            raise PoolUnavailable("İşlem havuzu kullanılamıyor", self.retry_after()) from e
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            _REJECTED.inc(("timeout",))
+            raise PoolUnavailable("İşlem zaman aşımına uğradı", self.retry_after())
+        except BrokenProcessPool as e:
+            self._reset_broken(e)
+            raise PoolUnavailable("İşlem havuzu yeniden başlatılıyor", self.retry_after()) from e
+        except SnapshotMismatch:
+            # Veri tam o anda değişti: bu isteği aynı süreçte, elimizdeki snapshot ile tamamla
+            result = await asyncio.get_running_loop().run_in_executor(None, fn, snapshot, *args)
+        SCORING_SECONDS.observe(time.perf_counter() - started, (job,))
+        return result
+
+    def _reset_broken(self, error: BaseException) -> None:
+        _REJECTED.inc(("broken",))
+        logger.error(f"CPU havuzu bozuldu; yeniden kurulacak: {error}")
+        self.shutdown()
+
+
+_REJECTED = register(Counter(
+    "cpu_pool_rejected_total", "Süreç havuzunun reddettiği işler (saturated, timeout, broken)", ("reason",),
+))
+
+_POOL = CpuPool()
+
+register(GaugeCallback("cpu_pool_inflight", "Süreç havuzunda kuyrukta + çalışan iş sayısı", (), lambda: [((), _POOL.inflight)]))
+register(GaugeCallback("cpu_pool_max_queue", "Süreç havuzu kabul sınırı", (), lambda: [((), _POOL.max_queue)]))
+
+
+def get_pool() -> CpuPool:
+    return _POOL
+
+
+__all__ = [
+    "CpuPool",
+    "PoolSaturated",
+    "PoolUnavailable",
+    "SnapshotMismatch",
+    "get_pool",
+    "worker_snapshot",
+]
@@ -0,0 +1,88 @@
+"""
+asgi_client.py
+- Ağ/soket olmadan bir ASGI uygulamasına doğrudan GET isteği gönderen küçük istemci
+- Benchmark'larda endpoint maliyetini (routing, doğrulama, serileştirme dahil) ölçmek için
+- httpx/TestClient gerektirmez; tek bir olay döngüsü tüm istekler boyunca yeniden kullanılır
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ASGIResponse:
+    status: int
+    headers: Tuple[Tuple[str, str], ...]
+    body: bytes
+
+    def header(self, name: str) -> Optional[str]:
+        name = name.lower()
+        for k, v in self.headers:
+            if k == name:
+                return v
+        return None
+
+
+class ASGIClient:
+    def __init__(self, app) -> None:
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+
+    def close(self) -> None:
+        self.loop.close()
+
+    def get(
+        self,
+        path: str,
+        params: Optional[Mapping[str, object]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> ASGIResponse:
+        return self.loop.run_until_complete(self._request("GET", path, params or {}, headers or {}))
+
+    async def _request(self, method: str, path: str, params, headers) -> ASGIResponse:
+        query = urlencode(list(params.items()), doseq=True).encode("ascii")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": quote(path).encode("ascii"),
+            "query_string": query,
+            "root_path": "",
+            "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+            "client": ("127.0.0.1", 50000),
+            "server": ("bench", 80),
+        }
+        sent = False
+
+        async def receive() -> Dict:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            return {"type": "http.disconnect"}
+
+        status = 0
+        out_headers: List[Tuple[str, str]] = []
+        chunks: List[bytes] = []
+
+        async def send(message: Dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                out_headers.extend((k.decode("latin-1"), v.decode("latin-1")) for k, v in message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return ASGIResponse(status=status, headers=tuple(out_headers), body=b"".join(chunks))
+
+
+__all__ = ["ASGIClient", "ASGIResponse"]
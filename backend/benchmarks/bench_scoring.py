@@ -0,0 +1,112 @@
+"""
+bench_scoring.py
+- Eski iterrows döngüsü ile vektörize (matris çarpımı) skorlamayı karşılaştırır
+- Önce iki yolun aynı skorları ürettiğini doğrular, sonra süreleri ölçer
+
+Kullanım (backend/ içinden):
+    python benchmarks/bench_scoring.py [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.loader import load_dataframes, get_sector_slice  # noqa: E402
+from app.scoring import (  # noqa: E402
+    _apply_direction,
+    compile_weight_matrix,
+    score_matrix,
+)
+
+# ---- Eski (referans) uygulama ---------------------------------------------
+
+def legacy_score_vector_for_sector(df_cities: pd.DataFrame, sector_slice: pd.DataFrame) -> pd.Series:
+    score = pd.Series(0.0, index=df_cities.index)
+    for _, row in sector_slice.iterrows():
+        w = float(row["Agirlik"]) / 100.0
+        contrib = _apply_direction(df_cities[row["KriterKey"]], row["Yon"]) * w
+        score = score.add(contrib, fill_value=0.0)
+    return score.clip(lower=0.0, upper=1.0)
+
+
+def legacy_score_all(df_cities: pd.DataFrame, df_criteria: pd.DataFrame, sector_list) -> np.ndarray:
+    cols = [
+        legacy_score_vector_for_sector(df_cities, get_sector_slice(df_criteria, s)).to_numpy()
+        for s in sector_list
+    ]
+    return np.column_stack(cols)
+
+
+def legacy_score_all_sectors(df_cities: pd.DataFrame, df_criteria: pd.DataFrame, sector_list, city: str) -> np.ndarray:
+    row = df_cities.loc[df_cities["Sehir"] == city].iloc[0]
+    one_city_df = pd.DataFrame([row]).set_index(pd.Index([0]))
+    out = []
+    for sector in sector_list:
+        sector_slice = df_criteria.loc[df_criteria["Sektor"].str.casefold() == sector.casefold(), ["KriterKey", "Agirlik", "Yon"]]
+        out.append(float(legacy_score_vector_for_sector(one_city_df, sector_slice).iloc[0]))
+    return np.asarray(out)
+
+# ---- Vektörize uygulama ----------------------------------------------------
+
+def vectorized_score_all(df_cities: pd.DataFrame, df_criteria: pd.DataFrame, feature_cols, sector_list) -> np.ndarray:
+    features = df_cities[feature_cols].to_numpy(dtype=np.float64)
+    wm = compile_weight_matrix(df_criteria, feature_cols, sector_list)
+    return score_matrix(features, wm)
+
+# ---------------------------------------------------------------------------
+
+def _best_ms(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Skorlama benchmark'ı (eski döngü vs matris çarpımı)")
+    parser.add_argument("--repeat", type=int, default=20, help="Her ölçüm için tekrar sayısı")
+    args = parser.parse_args()
+
+    df_cities, df_criteria, feature_cols, sector_list, city_list, shapes = load_dataframes()
+    features = df_cities[feature_cols].to_numpy(dtype=np.float64)
+    wm = compile_weight_matrix(df_criteria, feature_cols, sector_list)
+    city = city_list[0]
+
+    legacy = legacy_score_all(df_cities, df_criteria, sector_list)
+    fast = vectorized_score_all(df_cities, df_criteria, feature_cols, sector_list)
+    max_diff = float(np.abs(legacy - fast).max())
+    assert max_diff < 1e-9, f"Skorlar uyuşmuyor (max fark={max_diff})"
+
+    cases = [
+        (
+            f"tüm iller × tüm sektörler ({shapes.n_cities}×{shapes.n_sectors})",
+            lambda: legacy_score_all(df_cities, df_criteria, sector_list),
+            lambda: vectorized_score_all(df_cities, df_criteria, feature_cols, sector_list),
+        ),
+        (
+            "  └ yalnızca çarpım (ağırlıklar derlenmiş)",
+            lambda: legacy_score_all(df_cities, df_criteria, sector_list),
+            lambda: score_matrix(features, wm),
+        ),
+        (
+            f"score_all_sectors('{city}')",
+            lambda: legacy_score_all_sectors(df_cities, df_criteria, sector_list, city),
+            lambda: score_matrix(features, wm)[0],
+        ),
+    ]
+
+    print(f"max |eski − yeni| = {max_diff:.2e}  (tekrar={args.repeat}, en iyi süre)")
+    print(f"{'durum':<48}{'eski (ms)':>12}{'yeni (ms)':>12}{'hızlanma':>12}")
+    for name, old_fn, new_fn in cases:
+        old_ms = _best_ms(old_fn, args.repeat)
+        new_ms = _best_ms(new_fn, args.repeat)
+        print(f"{name:<48}{old_ms:>12.3f}{new_ms:>12.4f}{old_ms / new_ms:>11.0f}×")
+
+
+if __name__ == "__main__":
+    main()
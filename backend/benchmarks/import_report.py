@@ -0,0 +1,140 @@
+"""
+import_report.py
+- Bir modülün soğuk import süresini `python -X importtime` ile ayrı süreçte ölçer
+- Modül başına kendi (self) ve kümülatif süreleri tablo ya da JSON olarak verir
+- Ağır bağımlılıkların (pandas, openpyxl) istek yolunda yüklenip yüklenmediğini gösterir
+
+Kullanım (backend/ içinden):
+    python benchmarks/import_report.py [--module app.main] [--runs 5] [--top 25] [--sort self] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Sequence, Tuple
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# İstek yolunda yüklenmemesi gereken modüller (yalnızca Excel/yönetim yolları)
+HEAVY_MODULES: Tuple[str, ...] = ("pandas", "openpyxl")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ModuleTime:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass(frozen=True)
+class ImportReport:
+    module: str
+    total_us: int
+    modules: Tuple[ModuleTime, ...]
+
+    @property
+    def total_seconds(self) -> float:
+        return self.total_us / 1e6
+
+    def loaded(self, name: str) -> bool:
+        """name veya alt modüllerinden biri yüklendi mi?"""
+        return any(m.name == name or m.name.startswith(name + ".") for m in self.modules)
+
+    def heavy_loaded(self, names: Sequence[str] = HEAVY_MODULES) -> List[str]:
+        return [n for n in names if self.loaded(n)]
+
+
+def parse_importtime(stderr: str, module: str) -> ImportReport:
+    modules: List[ModuleTime] = []
+    for line in stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            self_us, cum_us, indent, name = m.groups()
+            modules.append(ModuleTime(name, int(self_us), int(cum_us), len(indent) // 2))
+    top = [m for m in modules if m.name == module]
+    if not top:
+        raise RuntimeError(f"'{module}' import çıktısında bulunamadı:\n{stderr[-2000:]}")
+    return ImportReport(module=module, total_us=top[-1].cumulative_us, modules=tuple(modules))
+
+
+def measure(module: str = "app.main", runs: int = 3) -> ImportReport:
+    """
+    Her ölçüm temiz bir yorumlayıcıda yapılır; en hızlı koşu döner (gürültüye dayanıklı).
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    best = None
+    for _ in range(max(1, runs)):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=BACKEND_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"'{module}' import edilemedi:\n{proc.stderr[-2000:]}")
+        report = parse_importtime(proc.stderr, module)
+        if best is None or report.total_us < best.total_us:
+            best = report
+    return best
+
+
+def _aggregate(report: ImportReport) -> Dict[str, Tuple[int, int]]:
+    """Üst paket bazında (self toplamı, en büyük kümülatif)."""
+    out: Dict[str, Tuple[int, int]] = {}
+    for m in report.modules:
+        pkg = m.name.split(".")[0]
+        s, c = out.get(pkg, (0, 0))
+        out[pkg] = (s + m.self_us, max(c, m.cumulative_us))
+    return out
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Soğuk import süresi raporu (-X importtime)")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=3, help="Ölçüm sayısı (en hızlısı raporlanır)")
+    parser.add_argument("--top", type=int, default=25, help="Gösterilecek modül sayısı")
+    parser.add_argument("--sort", choices=("cumulative", "self"), default="cumulative")
+    parser.add_argument("--json", action="store_true", help="JSON çıktı")
+    args = parser.parse_args(argv)
+
+    report = measure(args.module, args.runs)
+    key = (lambda m: m.cumulative_us) if args.sort == "cumulative" else (lambda m: m.self_us)
+    ranked = sorted(report.modules, key=key, reverse=True)[:args.top]
+
+    if args.json:
+        print(json.dumps({
+            "module": report.module,
+            "total_us": report.total_us,
+            "heavy_loaded": report.heavy_loaded(),
+            "packages": {k: {"self_us": s, "cumulative_us": c} for k, (s, c) in sorted(_aggregate(report).items())},
+            "modules": [asdict(m) for m in ranked],
+        }, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"{report.module}: {report.total_seconds * 1000:.1f} ms ({len(report.modules)} modül, {args.runs} koşunun en hızlısı)")
+    heavy = report.heavy_loaded()
+    print(f"Ağır modüller: {', '.join(heavy) if heavy else 'yüklenmedi'}")
+    print()
+    print(f"{'self ms':>9} {'kümülatif ms':>13}  modül")
+    for m in ranked:
+        print(f"{m.self_us / 1000:9.1f} {m.cumulative_us / 1000:13.1f}  {'  ' * m.depth}{m.name}")
+    print()
+    print(f"{'self ms':>9} {'kümülatif ms':>13}  üst paket")
+    for pkg, (s, c) in sorted(_aggregate(report).items(), key=lambda kv: kv[1][0], reverse=True)[:10]:
+        print(f"{s / 1000:9.1f} {c / 1000:13.1f}  {pkg}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+suite.py
+- Loader, skorlama, isim çözümü ve endpoint'ler için mikro benchmark paketi
+- Sonuçlar sabit şemalı, anahtarları sıralı JSON olarak yazılır (commit'ler arası diff/karşılaştırma)
+- --compare ile önceki bir sonuç dosyasına göre eşik üstü yavaşlamalar raporlanır (çıkış kodu 1)
+
+Kullanım (backend/ içinden):
+    python benchmarks/suite.py --out bench.json
+    python benchmarks/suite.py --compare bench.json --threshold 0.15
+    python benchmarks/suite.py --filter http. --repeat 9
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Erişim logu örneklenmesin: satırlar sonuç tablosunu gömer, kuyruk/format işi http.* ölçümlerine eklenir
+# (app.main import edilmeden önce; açıkça verilen değer korunur)
+os.environ.setdefault("LOG_ACCESS_SAMPLE", "0")
+
+import numpy as np  # noqa: E402
+
+from asgi_client import ASGIClient  # noqa: E402
+
+SCHEMA_VERSION = 1
+
+# Bir ölçüm örneğinin hedef süresi; döngü sayısı buna göre ayarlanır
+TARGET_SAMPLE_SECONDS = 0.05
+
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    fn: Callable[[], object]
+    # Pahalı işler (ör. Excel okuma) için üst sınır; None → otomatik
+    max_loops: Optional[int] = None
+
+
+def _calibrate(fn: Callable[[], object], max_loops: Optional[int]) -> int:
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= TARGET_SAMPLE_SECONDS or (max_loops is not None and loops >= max_loops):
+            return loops
+        loops = loops * 10 if elapsed < TARGET_SAMPLE_SECONDS / 10 else loops * 2
+        if max_loops is not None:
+            loops = min(loops, max_loops)
+
+
+def run_case(case: Case, repeat: int) -> Dict[str, float]:
+    case.fn()  # ısınma
+    loops = _calibrate(case.fn, case.max_loops)
+    samples: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            case.fn()
+        samples.append((time.perf_counter() - t0) / loops * 1e6)
+    return {
+        "loops": loops,
+        "repeat": repeat,
+        "min_us": round(min(samples), 3),
+        "median_us": round(statistics.median(samples), 3),
+        "mean_us": round(statistics.fmean(samples), 3),
+        "stdev_us": round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+    }
+
+
+# ---- Benchmark durumları ---------------------------------------------------
+
+def build_cases() -> List[Case]:
+    from app.log import ROOT_LOGGER
+    from app.loader import get_sector_slice, load_dataframes, read_sources
+    from app.main import app
+    from app.scoring import _score_vector_for_sector, score_all_sectors, score_sector_for_city
+    from app.skyline import skyline_mask
+    from app.snapshot import get_snapshot
+
+    # Yükleme bilgileri ve yavaş olmayan istek kayıtları ölçümü kirletmesin (tüm app.* ağacı)
+    logging.getLogger(ROOT_LOGGER).setLevel(logging.WARNING)
+
+    snap = get_snapshot()
+    engine = snap.engine
+    city = "İzmir"
+    sector = "Turizm / Otelcilik"
+    df_cities, df_criteria, *_ = load_dataframes()
+    sector_slice = get_sector_slice(df_criteria, sector)
+
+    def resolve_uncached(query: str) -> Callable[[], object]:
+        resolver = engine.city_resolver
+
+        def fn():
+            resolver._memo.clear()
+            return resolver.resolve(query)
+        return fn
+
+    client = ASGIClient(app)
+    etag = client.get("/api/mod1", {"sector": sector, "topn": 5}).header("etag") or ""
+
+    def http_get(path: str, params: Dict[str, object], headers: Optional[Dict[str, str]] = None, status: int = 200):
+        def fn():
+            r = client.get(path, params, headers)
+            if r.status != status:
+                raise RuntimeError(f"{path} {params}: {r.status} {r.body[:200]!r}")
+            return r
+        return fn
+
+    return [
+        # loader
+        Case("loader.read_sources.excel", read_sources, max_loops=1),
+        Case("loader.load_dataframes.cold", lambda: load_dataframes(force_reload=True), max_loops=5),
+        Case("loader.load_dataframes.warm", load_dataframes),
+        # skorlama
+        Case("scoring._score_vector_for_sector", lambda: _score_vector_for_sector(df_cities, sector_slice)),
+        Case("scoring.score_all_sectors", lambda: score_all_sectors(city)),
+        Case("scoring.score_sector_for_city.contributions", lambda: score_sector_for_city(city, sector, return_contributions=True)),
+        Case("skyline.mask.3_sectors", lambda: skyline_mask(engine.scores[:, :3])),
+        # isim çözümü
+        Case("resolve.city.exact", lambda: engine.find_city("İzmir")),
+        Case("resolve.city.folded", lambda: engine.find_city("IZMIR")),
+        Case("resolve.city.synonym", lambda: engine.find_city("urfa")),
+        Case("resolve.city.fuzzy_uncached", resolve_uncached("Eskisehr")),
+        Case("resolve.sector.prefix", lambda: engine.find_sector("yazilim")),
+        # endpoint'ler (in-process ASGI)
+        Case("http.mod1.top5", http_get("/api/mod1", {"sector": sector, "topn": 5})),
+        Case("http.mod1.top20", http_get("/api/mod1", {"sector": sector, "topn": 20})),
+        Case("http.mod1.not_modified", http_get("/api/mod1", {"sector": sector, "topn": 5}, {"If-None-Match": etag}, status=304)),
+        Case("http.mod2.top5", http_get("/api/mod2", {"city": city, "topn": 5})),
+        Case("http.mod2.fuzzy_city", http_get("/api/mod2", {"city": "izmr", "topn": 5})),
+        Case("http.skyline.3_sectors", http_get("/api/skyline", {"sector": ["Lojistik", "Gıda İşleme", "Sanayi"], "weight": [2, 1, 1]})),
+        Case("http.similar.cosine", http_get("/api/similar", {"city": city, "k": 5})),
+        Case("http.metrics", http_get("/metrics", {})),
+    ]
+
+
+# ---- JSON çıktı / karşılaştırma --------------------------------------------
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(__file__), capture_output=True, text=True, timeout=5,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def collect(repeat: int, name_filter: Optional[str]) -> Dict[str, object]:
+    results: Dict[str, Dict[str, float]] = {}
+    for case in build_cases():
+        if name_filter and name_filter not in case.name:
+            continue
+        results[case.name] = run_case(case, repeat)
+        print(f"  {case.name:<48} {results[case.name]['median_us']:>12.2f} µs", file=sys.stderr)
+    return {
+        "schema": SCHEMA_VERSION,
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], threshold: float, metric: str) -> List[str]:
+    """
+    metric'e göre (current / baseline − 1) > threshold olan durumları döndürür.
+    """
+    key = f"{metric}_us"
+    regressions: List[str] = []
+    base_results = baseline.get("results", {})
+    print(f"\n{'durum':<48}{'önce µs':>12}{'şimdi µs':>12}{'değişim':>10}", file=sys.stderr)
+    for name, cur in sorted(current["results"].items()):
+        base = base_results.get(name)
+        if base is None:
+            print(f"{name:<48}{'—':>12}{cur[key]:>12.2f}{'yeni':>10}", file=sys.stderr)
+            continue
+        change = cur[key] / base[key] - 1.0 if base[key] > 0 else 0.0
+        flag = "  ✗" if change > threshold else ""
+        print(f"{name:<48}{base[key]:>12.2f}{cur[key]:>12.2f}{change:>+9.1%}{flag}", file=sys.stderr)
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Loader/skorlama/endpoint mikro benchmark'ları")
+    parser.add_argument("--repeat", type=int, default=7, help="Durum başına örnek sayısı")
+    parser.add_argument("--filter", default=None, help="Yalnızca adı bu metni içeren durumlar")
+    parser.add_argument("--out", default=None, help="JSON çıktı dosyası (varsayılan: stdout)")
+    parser.add_argument("--compare", default=None, help="Karşılaştırılacak önceki JSON sonuç dosyası")
+    parser.add_argument("--threshold", type=float, default=0.15, help="İzin verilen yavaşlama oranı (0.15 = %%15)")
+    parser.add_argument("--metric", choices=("min", "median"), default="min", help="Karşılaştırma ölçütü")
+    args = parser.parse_args(argv)
+
+    current = collect(args.repeat, args.filter)
+    text = json.dumps(current, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold, args.metric)
+        if regressions:
+            print(f"\n{len(regressions)} durumda %{args.threshold * 100:.0f} üstü yavaşlama: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+        print(f"\nEşik (%{args.threshold * 100:.0f}) aşılmadı.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""
+app.main'in soğuk import süresi ve istek yolunun ağır bağımlılıkları.
+Bütçe: config.IMPORT_TIME_BUDGET (ortam değişkeni IMPORT_TIME_BUDGET ile değiştirilebilir).
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from app.config import IMPORT_TIME_BUDGET  # noqa: E402
+from import_report import HEAVY_MODULES, measure  # noqa: E402
+
+
+def test_cold_import_within_budget():
+    report = measure("app.main", runs=3)
+    slowest = sorted(report.modules, key=lambda m: m.self_us, reverse=True)[:5]
+    assert report.total_seconds <= IMPORT_TIME_BUDGET, (
+        f"app.main import {report.total_seconds:.3f} sn > bütçe {IMPORT_TIME_BUDGET:.3f} sn; "
+        f"en yavaşlar: {[(m.name, m.self_us) for m in slowest]}"
+    )
+
+
+def test_serving_path_skips_heavy_modules():
+    report = measure("app.main", runs=1)
+    assert report.heavy_loaded(HEAVY_MODULES) == []
@@ -0,0 +1,33 @@
+"""
+matrix_format.negotiate_format: Accept başlığı ve q değerleri.
+"""
+
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.matrix_format import negotiate_format  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, "json"),
+        ("", "json"),
+        ("text/csv", "csv"),
+        ("application/vnd.ecominds.matrix", "bin"),
+        ("application/json;q=0.5, text/csv;q=0.9", "csv"),
+        ("text/html", "json"),
+        # q=0: kabul edilmez
+        ("text/csv;q=0", "json"),
+        ("text/csv;q=0, application/octet-stream;q=0.0", "json"),
+        ("application/json;q=0, text/csv;q=0.1", "csv"),
+        ("text/csv;q=0, */*;q=0.2", "json"),
+    ],
+)
+def test_negotiate_format(accept, expected):
+    assert negotiate_format(accept) == expected
@@ -0,0 +1,99 @@
+"""
+resolver.NameResolver: birebir, eşanlamlı, önek, yazım hatası, çok kısa ve özel karakterli girdiler.
+"""
+
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.config import CITY_SYNONYMS  # noqa: E402
+from app.resolver import NameResolver  # noqa: E402
+
+SECTORS = (
+    "Enerji", "Eğitim Kurumları", "Finans", "Gıda İşleme", "Konut & İnşaat", "Kültür & Sanat",
+    "Sanayi / Üretim", "Sağlık", "Teknoloji / Yazılım", "Telekom", "Turizm / Otelcilik", "Çevre / Atık",
+)
+CITIES = ("Afyonkarahisar", "Eskişehir", "İstanbul", "İzmir", "Şanlıurfa", "Van")
+
+
+@pytest.fixture(scope="module")
+def sectors():
+    return NameResolver(SECTORS)
+
+
+@pytest.fixture(scope="module")
+def cities():
+    return NameResolver(CITIES, CITY_SYNONYMS)
+
+
+@pytest.mark.parametrize("query", SECTORS)
+def test_exact(sectors, query):
+    assert sectors.canonical(query) == query
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("afyon", "Afyonkarahisar"),
+        ("urfa", "Şanlıurfa"),
+        ("IZMIR", "İzmir"),
+        ("  eskisehir ", "Eskişehir"),
+        ("Van", "Van"),
+    ],
+)
+def test_synonym_and_folded_key(cities, query, expected):
+    assert cities.canonical(query) == expected
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("tekno", "Teknoloji / Yazılım"),
+        ("yazilim", "Teknoloji / Yazılım"),
+        ("otel", "Turizm / Otelcilik"),
+        ("ist", "İstanbul"),
+    ],
+)
+def test_prefix(sectors, cities, query, expected):
+    assert (sectors.canonical(query) or cities.canonical(query)) == expected
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("Teknolji", "Teknoloji / Yazılım"),
+        ("Finanz", "Finans"),
+        ("Eskisehr", "Eskişehir"),
+        ("izmr", "İzmir"),
+    ],
+)
+def test_typo(sectors, cities, query, expected):
+    assert (sectors.canonical(query) or cities.canonical(query)) == expected
+
+
+@pytest.mark.parametrize("query", ["", "   ", "a", "e", "te", "/", "&"])
+def test_too_short_or_empty_is_unresolved(sectors, query):
+    assert sectors.canonical(query) is None
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("Konut & İnşaat", "Konut & İnşaat"),
+        ("konut insaat", "Konut & İnşaat"),
+        ("Konut&Inşaat", "Konut & İnşaat"),
+        ("kültür (sanat)", "Kültür & Sanat"),
+        ("çevre/atık", "Çevre / Atık"),
+        ("sanayi.*", "Sanayi / Üretim"),
+    ],
+)
+def test_metacharacters(sectors, query, expected):
+    assert sectors.canonical(query) == expected
+
+
+def test_unknown_is_unresolved(sectors):
+    assert sectors.canonical("Uzay Madenciliği") is None
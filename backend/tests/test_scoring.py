@@ -0,0 +1,82 @@
+"""
+Matris skorlama (score_matrix) ile eski satır döngüsünün (bench_scoring.legacy_*) aynı skorları üretmesi
+ve aynı sektörde yönü farklı tekrar eden kriterlerin reddedilmesi.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from app.loader import get_sector_slice, load_dataframes, validate_criteria_rows  # noqa: E402
+from app.scoring import (  # noqa: E402
+    _score_vector_for_sector,
+    compile_weight_matrix,
+    compile_weight_rows,
+    score_matrix,
+)
+from bench_scoring import legacy_score_all, legacy_score_vector_for_sector  # noqa: E402
+
+TOL = 1e-9
+
+
+@pytest.fixture(scope="module")
+def shipped():
+    df_cities, df_criteria, feature_cols, sector_list, _, _ = load_dataframes()
+    return df_cities, df_criteria, feature_cols, sector_list
+
+
+def test_score_matrix_matches_legacy_loop_on_shipped_data(shipped):
+    df_cities, df_criteria, feature_cols, sector_list = shipped
+    features = df_cities[feature_cols].to_numpy(dtype=np.float64)
+    fast = score_matrix(features, compile_weight_matrix(df_criteria, feature_cols, sector_list))
+    legacy = legacy_score_all(df_cities, df_criteria, sector_list)
+    assert fast.shape == legacy.shape
+    assert np.abs(fast - legacy).max() < TOL
+
+
+def test_score_vector_for_sector_matches_legacy_loop(shipped):
+    df_cities, df_criteria, _, sector_list = shipped
+    for sector in sector_list:
+        sector_slice = get_sector_slice(df_criteria, sector)
+        fast = _score_vector_for_sector(df_cities, sector_slice).to_numpy()
+        legacy = legacy_score_vector_for_sector(df_cities, sector_slice).to_numpy()
+        assert np.abs(fast - legacy).max() < TOL, sector
+
+
+def test_same_direction_duplicates_sum_like_legacy_loop():
+    cities = pd.DataFrame({"a": [0.2, 0.9, 0.5], "b": [0.4, 0.1, 0.7]})
+    rows = [("S", "a", 30.0, "YUKSEK"), ("S", "a", 20.0, "YUKSEK"), ("S", "b", 50.0, "DUSUK")]
+    wm = compile_weight_rows(rows, ["a", "b"], ["S"])
+    assert wm.weights[0].tolist() == [50.0, 50.0]
+    legacy = legacy_score_vector_for_sector(
+        cities, pd.DataFrame(rows, columns=["Sektor", "KriterKey", "Agirlik", "Yon"]),
+    ).to_numpy()
+    assert np.abs(score_matrix(cities.to_numpy(), wm)[:, 0] - legacy).max() < TOL
+
+
+MIXED = [("S", "a", 30.0, "YUKSEK"), ("S", "a", 20.0, "DUSUK"), ("S", "b", 50.0, "YUKSEK")]
+
+
+def test_mixed_direction_duplicates_rejected_by_validation():
+    with pytest.raises(ValueError, match="S/a"):
+        validate_criteria_rows(MIXED, ["a", "b"])
+
+
+def test_mixed_direction_duplicates_rejected_by_compiler():
+    with pytest.raises(ValueError, match="S/a"):
+        compile_weight_rows(MIXED, ["a", "b"], ["S"])
+
+
+def test_mixed_direction_in_other_sector_is_allowed():
+    rows = [("S", "a", 50.0, "YUKSEK"), ("S", "b", 50.0, "YUKSEK"), ("T", "a", 100.0, "DUSUK")]
+    _, sectors = validate_criteria_rows(rows, ["a", "b"])
+    assert sectors == ["S", "T"]
+    wm = compile_weight_rows(rows, ["a", "b"], sectors)
+    assert wm.low_mask.tolist() == [[False, False], [True, False]]
@@ -0,0 +1,137 @@
+"""
+CpuPool kabul kontrolü: max_queue'da 429 (PoolSaturated), bozuk havuz / zaman aşımında 503 (PoolUnavailable)
+ve her yolda kabul sayacının sıfıra dönmesi.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from app import workers  # noqa: E402
+from app.workers import CpuPool, PoolSaturated, PoolUnavailable  # noqa: E402
+
+SNAP = SimpleNamespace(content_hash="test")
+
+
+def _echo(snap, value):
+    return value
+
+
+def _wait_idle(pool: CpuPool, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while pool.inflight and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class _BrokenExecutor:
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("test")
+
+    def shutdown(self, *args, **kwargs):
+        pass
+
+
+class _FailingExecutor:
+    def __init__(self, error):
+        self.error = error
+
+    def submit(self, *args, **kwargs):
+        future = Future()
+        future.set_exception(self.error)
+        return future
+
+    def shutdown(self, *args, **kwargs):
+        pass
+
+
+def test_inline_success_releases_slot():
+    pool = CpuPool(workers=0, max_queue=1)
+    assert asyncio.run(pool.run("test", _echo, SNAP, 42)) == 42
+    assert pool.inflight == 0
+
+
+def test_saturated_at_max_queue():
+    pool = CpuPool(workers=0, max_queue=1)
+    gate = threading.Event()
+
+    def blocked(snap):
+        gate.wait(2)
+        return "ok"
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.run("test", blocked, SNAP))
+        await asyncio.sleep(0)
+        assert pool.inflight == 1
+        with pytest.raises(PoolSaturated) as exc:
+            await pool.run("test", _echo, SNAP, 1)
+        assert exc.value.retry_after >= 1
+        gate.set()
+        return await first
+
+    assert asyncio.run(scenario()) == "ok"
+    assert pool.inflight == 0
+
+
+def test_timeout_is_unavailable_and_releases_after_job():
+    pool = CpuPool(workers=0, max_queue=1, timeout=0.05)
+    finished = threading.Event()
+
+    def slow(snap):
+        time.sleep(0.3)
+        finished.set()
+
+    with pytest.raises(PoolUnavailable) as exc:
+        asyncio.run(pool.run("test", slow, SNAP))
+    assert exc.value.retry_after >= 1
+    # İş thread'de hâlâ çalışıyor: slot tutulur, yeni iş kabul edilmez
+    assert not finished.is_set()
+    assert pool.inflight == 1
+    with pytest.raises(PoolSaturated):
+        asyncio.run(pool.run("test", _echo, SNAP, 1))
+    assert finished.wait(2)
+    _wait_idle(pool)
+    assert pool.inflight == 0
+
+
+def test_broken_pool_on_submit_is_unavailable():
+    pool = CpuPool(workers=1, max_queue=1)
+    pool._executor = _BrokenExecutor()
+    with pytest.raises(PoolUnavailable) as exc:
+        asyncio.run(pool.run("test", _echo, SNAP, 1))
+    assert exc.value.retry_after >= 1
+    assert pool.inflight == 0
+
+
+def test_broken_pool_while_running_is_unavailable():
+    pool = CpuPool(workers=1, max_queue=1)
+    pool._executor = _FailingExecutor(BrokenProcessPool("test"))
+    with pytest.raises(PoolUnavailable):
+        asyncio.run(pool.run("test", _echo, SNAP, 1))
+    _wait_idle(pool)
+    assert pool.inflight == 0
+
+
+def test_pool_start_oserror_releases_slot_and_falls_back(monkeypatch):
+    def no_semaphores(*args, **kwargs):
+        raise OSError(38, "Function not implemented")
+
+    monkeypatch.setattr(workers, "ProcessPoolExecutor", no_semaphores)
+    pool = CpuPool(workers=2, max_queue=1)
+    with pytest.raises(PoolUnavailable) as exc:
+        asyncio.run(pool.run("test", _echo, SNAP, 1))
+    assert exc.value.retry_after >= 1
+    assert pool.inflight == 0
+    # Sonraki işler slot sızdırmadan aynı süreçte çalışır (kalıcı 429 yok)
+    assert pool.workers == 0
+    assert [asyncio.run(pool.run("test", _echo, SNAP, i)) for i in range(3)] == [0, 1, 2]
+    assert pool.inflight == 0